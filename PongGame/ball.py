@@ -7,6 +7,16 @@ Hereda de Turtle para aprovechar sus capacidades gráficas y de movimiento.
 
 from turtle import Turtle
 
+# =============================================================================
+# CONSTANTES DE LA PELOTA
+# =============================================================================
+VELOCIDAD_INICIAL = 200  # Píxeles por segundo en cada eje
+AUMENTO_VELOCIDAD = 1.1  # Multiplicador de velocidad en cada golpe de paleta
+# Tope de move_speed: con fotogramas de hasta 50 ms (MAX_DT en main.py) la pelota
+# avanza como mucho 30 px, la mitad de la zona de la paleta (x de 320 a 380),
+# así que nunca la atraviesa de un solo salto
+VELOCIDAD_MAXIMA = 3.0
+
 
 class Ball(Turtle):
     """
@@ -16,9 +26,9 @@ class Ball(Turtle):
     y paletas. La velocidad aumenta cada vez que golpea una paleta.
     
     Atributos:
-        x_move (int): Velocidad de movimiento horizontal (positivo = derecha)
-        y_move (int): Velocidad de movimiento vertical (positivo = arriba)
-        move_speed (float): Factor de velocidad del juego (menor = más rápido)
+        x_move (int): Velocidad horizontal en píxeles/segundo (positivo = derecha)
+        y_move (int): Velocidad vertical en píxeles/segundo (positivo = arriba)
+        move_speed (float): Multiplicador de la velocidad (mayor = más rápido)
     """
 
     def __init__(self):
@@ -27,19 +37,22 @@ class Ball(Turtle):
         self.color("white")  # Color blanco para contrastar con fondo negro
         self.shape("circle")  # Forma circular
         self.penup()  # No dibujar líneas al moverse
-        self.x_move = 3  # Velocidad horizontal inicial
-        self.y_move = 3  # Velocidad vertical inicial
-        self.move_speed = 0.1  # Velocidad base del juego
+        self.x_move = VELOCIDAD_INICIAL  # Velocidad horizontal inicial
+        self.y_move = VELOCIDAD_INICIAL  # Velocidad vertical inicial
+        self.move_speed = 1.0  # Multiplicador de velocidad base
 
-    def move(self):
+    def move(self, dt):
         """
         Mueve la pelota según su velocidad actual.
         
-        Calcula la nueva posición sumando x_move e y_move
-        a las coordenadas actuales.
+        El desplazamiento es proporcional al tiempo transcurrido, así que
+        la pelota va a la misma velocidad en cualquier ordenador.
+        
+        Args:
+            dt (float): Segundos desde el fotograma anterior
         """
-        new_x = self.xcor() + self.x_move
-        new_y = self.ycor() + self.y_move
+        new_x = self.xcor() + self.x_move * self.move_speed * dt
+        new_y = self.ycor() + self.y_move * self.move_speed * dt
         self.goto(new_x, new_y)
 
     def bounce_y(self):
@@ -55,12 +68,12 @@ class Ball(Turtle):
         """
         Hace que la pelota rebote horizontalmente y aumenta la velocidad.
         
-        Invierte la dirección horizontal y reduce move_speed en un 10%
-        para hacer el juego más difícil progresivamente.
+        Invierte la dirección horizontal y aumenta move_speed en un 10%
+        (hasta VELOCIDAD_MAXIMA) para hacer el juego más difícil progresivamente.
         Se llama cuando la pelota golpea una paleta.
         """
         self.x_move *= -1
-        self.move_speed *= 0.9  # Aumenta la velocidad (menor delay)
+        self.move_speed = min(self.move_speed * AUMENTO_VELOCIDAD, VELOCIDAD_MAXIMA)
 
     def reset_position(self):
         """
@@ -71,5 +84,5 @@ class Ball(Turtle):
         para que la pelota vaya hacia el jugador que anotó.
         """
         self.goto(0, 0)  # Volver al centro
-        self.move_speed = 0.1  # Reiniciar velocidad
         self.bounce_x()  # Cambiar dirección hacia el otro lado
+        self.move_speed = 1.0  # Reiniciar velocidad
@@ -15,6 +15,13 @@ from ball import Ball
 from scoreboard import Scoreboard
 import time
 
+# =============================================================================
+# CONSTANTES DEL BUCLE
+# =============================================================================
+FPS = 60  # Fotogramas por segundo
+DURACION_FOTOGRAMA = 1 / FPS  # Segundos entre fotogramas
+MAX_DT = 0.05  # Un parón (p. ej. al mover la ventana) no teletransporta la pelota
+
 # =============================================================================
 # CONFIGURACIÓN DE LA PANTALLA
 # =============================================================================
@@ -40,31 +47,50 @@ scoreboard = Scoreboard()
 # =============================================================================
 screen.listen()  # Activa la escucha de eventos del teclado
 
-# Controles para la paleta derecha (flechas)
-screen.onkey(r_paddle.go_up, "Up")
-screen.onkey(r_paddle.go_down, "Down")
+# Controles para la paleta derecha (flechas): se mueve mientras la tecla está pulsada
+screen.onkeypress(r_paddle.go_up, "Up")
+screen.onkeyrelease(r_paddle.stop_up, "Up")
+screen.onkeypress(r_paddle.go_down, "Down")
+screen.onkeyrelease(r_paddle.stop_down, "Down")
 
 # Controles para la paleta izquierda (W y S)
-screen.onkey(l_paddle.go_up, "w")
-screen.onkey(l_paddle.go_down, "s")
+screen.onkeypress(l_paddle.go_up, "w")
+screen.onkeyrelease(l_paddle.stop_up, "w")
+screen.onkeypress(l_paddle.go_down, "s")
+screen.onkeyrelease(l_paddle.stop_down, "s")
 
 # =============================================================================
 # BUCLE PRINCIPAL DEL JUEGO
 # =============================================================================
-game_is_on = True
-while game_is_on:
-    screen.update()  # Actualiza la pantalla manualmente
-    ball.move()  # Mueve la pelota en cada iteración
+# Cada fotograma lo lanza screen.ontimer, así que entre fotogramas el programa
+# espera en el bucle de eventos de Tk sin gastar CPU. El movimiento se escala
+# con el tiempo real transcurrido (reloj monotónico).
+ultimo = time.monotonic()  # Instante del fotograma anterior
+siguiente = ultimo  # Instante en que toca el próximo fotograma
+
+
+def fotograma():
+    """Avanza el juego según el tiempo transcurrido y programa el siguiente fotograma."""
+    global ultimo, siguiente
+    ahora = time.monotonic()
+    dt = min(ahora - ultimo, MAX_DT)
+    ultimo = ahora
+
+    r_paddle.move(dt)
+    l_paddle.move(dt)
+    ball.move(dt)  # Mueve la pelota según el tiempo transcurrido
 
     # Detectar colisión con las paredes superior e inferior
-    # Si la pelota toca el borde (±280 píxeles), rebota en Y
-    if ball.ycor() > 280 or ball.ycor() < -280:
+    # Si la pelota toca el borde (±280 píxeles) yendo hacia él, rebota en Y
+    if ball.ycor() > 280 and ball.y_move > 0 or ball.ycor() < -280 and ball.y_move < 0:
         ball.bounce_y()
 
     # Detectar colisión con las paletas
-    # Comprueba si la pelota está cerca de alguna paleta (distancia < 50)
-    # y si está en la zona de la paleta (x > 320 para derecha, x < -320 para izquierda)
-    if ball.distance(r_paddle) < 50 and ball.xcor() > 320 or ball.distance(l_paddle) < 50 and ball.xcor() < -320:
+    # Comprueba si la pelota está cerca de alguna paleta (distancia < 50),
+    # si está en la zona de la paleta (x > 320 para derecha, x < -320 para izquierda)
+    # y si va hacia ella (así no rebota dos veces seguidas en la misma paleta)
+    if (ball.distance(r_paddle) < 50 and ball.xcor() > 320 and ball.x_move > 0
+            or ball.distance(l_paddle) < 50 and ball.xcor() < -320 and ball.x_move < 0):
         ball.bounce_x()
 
     # Detectar cuando la paleta derecha falla
@@ -79,5 +105,16 @@ while game_is_on:
         ball.reset_position()
         scoreboard.r_point()
 
-# Mantiene la ventana abierta hasta que se haga clic
-screen.exitonclick()
\ No newline at end of file
+    screen.update()  # Actualiza la pantalla manualmente
+
+    # Ritmo estable: se apunta al instante previsto, no a "ahora + duración",
+    # para que los retrasos no se acumulen. Si vamos muy retrasados, se resincroniza.
+    siguiente = max(siguiente + DURACION_FOTOGRAMA, ahora)
+    espera = siguiente - time.monotonic()
+    screen.ontimer(fotograma, max(1, round(espera * 1000)))
+
+
+fotograma()
+
+# Mantiene la ventana abierta hasta que se haga clic (y atiende los fotogramas)
+screen.exitonclick()
@@ -7,13 +7,24 @@ Hereda de Turtle para aprovechar sus capacidades gráficas.
 
 from turtle import Turtle
 
+# =============================================================================
+# CONSTANTES DE LA PALETA
+# =============================================================================
+VELOCIDAD_PALETA = 400  # Píxeles por segundo mientras se mantiene la tecla
+LIMITE_Y = 250  # La paleta (100px de alto) no sale de la pantalla
+
 
 class Paddle(Turtle):
     """
     Clase que representa una paleta del juego Pong.
     
     Cada paleta puede moverse verticalmente (arriba/abajo) para
-    intentar golpear la pelota y evitar que pase.
+    intentar golpear la pelota y evitar que pase. Se mueve mientras
+    su tecla está pulsada, a velocidad constante.
+    
+    Atributos:
+        up_pressed (bool): Tecla de subir pulsada
+        down_pressed (bool): Tecla de bajar pulsada
     
     Atributos heredados de Turtle:
         - Posición (x, y)
@@ -35,23 +46,37 @@ class Paddle(Turtle):
         self.shapesize(stretch_wid=5, stretch_len=1)
         self.penup()  # No dibujar líneas al moverse
         self.goto(position)  # Colocar en la posición inicial
+        self.up_pressed = False
+        self.down_pressed = False
 
     def go_up(self):
-        """
-        Mueve la paleta hacia arriba.
-        
-        Aumenta la coordenada Y en 20 píxeles, manteniendo
-        la misma coordenada X.
-        """
-        new_y = self.ycor() + 20
-        self.goto(self.xcor(), new_y)
+        """Empieza a subir (al pulsar la tecla de subir)."""
+        self.up_pressed = True
 
     def go_down(self):
+        """Empieza a bajar (al pulsar la tecla de bajar)."""
+        self.down_pressed = True
+
+    def stop_up(self):
+        """Deja de subir (al soltar la tecla de subir)."""
+        self.up_pressed = False
+
+    def stop_down(self):
+        """Deja de bajar (al soltar la tecla de bajar)."""
+        self.down_pressed = False
+
+    def move(self, dt):
         """
-        Mueve la paleta hacia abajo.
+        Mueve la paleta según las teclas pulsadas.
         
-        Disminuye la coordenada Y en 20 píxeles, manteniendo
-        la misma coordenada X.
+        El desplazamiento es proporcional al tiempo transcurrido y
+        no depende de la repetición de teclas del sistema.
+        
+        Args:
+            dt (float): Segundos desde el fotograma anterior
         """
-        new_y = self.ycor() - 20
-        self.goto(self.xcor(), new_y)
+        direction = self.up_pressed - self.down_pressed
+        if direction:
+            new_y = self.ycor() + direction * VELOCIDAD_PALETA * dt
+            new_y = max(-LIMITE_Y, min(LIMITE_Y, new_y))
+            self.goto(self.xcor(), new_y)
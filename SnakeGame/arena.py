@@ -0,0 +1,111 @@
+# Arena mode: hundreds of AI snakes and up to three players on one big board.
+# Run it from the SnakeGame folder: python arena.py --ais 200 --humans 2
+# Player 1 uses the arrow keys, player 2 WASD and player 3 IJKL.
+import argparse
+import random
+import time
+from collections import deque
+from turtle import Screen, Turtle
+from arena_core import Arena, ARENA_HALF
+from snake_core import UP, DOWN, LEFT, RIGHT
+
+ARENA_CELL = 10
+TICK_SECONDS = 0.1
+HUMAN_KEYS = [("Up", "Down", "Left", "Right"), ("w", "s", "a", "d"), ("i", "k", "j", "l")]
+HUMAN_COLORS = ["white", "yellow", "cyan"]
+AI_COLORS = ["red", "orange", "green", "magenta", "purple", "pink", "salmon", "lime green", "gold", "sky blue"]
+
+
+def to_position(cell):
+    return cell[0] * ARENA_CELL, cell[1] * ARENA_CELL
+
+
+def new_stamper(shape, color):
+    # Hidden turtle whose stamps are the drawing; see Snake
+    stamper = Turtle(shape)
+    stamper.hideturtle()
+    stamper.penup()
+    stamper.shapesize(ARENA_CELL / 20)
+    stamper.color(color)
+    stamper.setundobuffer(1)
+    return stamper
+
+
+class ArenaView:
+    # Draws only what changed in the last tick: a stamp for each new head, one
+    # deleted for each tail that moved, and whole snakes only when they die or
+    # respawn. The caller then does a single screen.update() per tick.
+
+    def __init__(self, arena):
+        self.arena = arena
+        colors = iter(HUMAN_COLORS)
+        self.stampers = [new_stamper("square", next(colors) if snake.human else random.choice(AI_COLORS))
+                         for snake in arena.snakes]
+        self.segments = [deque() for _ in arena.snakes]
+        self.food_stamper = new_stamper("circle", "blue")
+        self.food_stamps = {}
+        for cell in arena.food.cells:
+            self.add_food(cell)
+        for snake in arena.snakes:
+            if snake.alive:
+                self.draw_snake(snake)
+
+    def add_food(self, cell):
+        self.food_stamper.goto(to_position(cell))
+        self.food_stamps[cell] = self.food_stamper.stamp()
+
+    def draw_snake(self, snake):
+        stamper = self.stampers[snake.number]
+        # Oldest stamp (the tail) first
+        segments = self.segments[snake.number] = deque()
+        for cell in reversed(snake.body):
+            stamper.goto(to_position(cell))
+            segments.append(stamper.stamp())
+
+    def draw(self):
+        arena = self.arena
+        for cell in arena.food_eaten:
+            self.food_stamper.clearstamp(self.food_stamps.pop(cell))
+        for snake in arena.died:
+            self.stampers[snake.number].clearstamps()
+            self.segments[snake.number].clear()
+        for snake, head, tail in arena.moved:
+            stamper = self.stampers[snake.number]
+            segments = self.segments[snake.number]
+            if tail is not None:
+                stamper.clearstamp(segments.popleft())
+            stamper.goto(to_position(head))
+            segments.append(stamper.stamp())
+        for snake in arena.spawned:
+            self.draw_snake(snake)
+        for cell in arena.food_added:
+            self.add_food(cell)
+
+
+parser = argparse.ArgumentParser(description="Snake arena")
+parser.add_argument("--ais", type=int, default=200)
+parser.add_argument("--humans", type=int, default=1, choices=range(len(HUMAN_KEYS) + 1))
+parser.add_argument("--half-size", type=int, default=ARENA_HALF, help="cells from the centre to the wall")
+args = parser.parse_args()
+
+screen = Screen()
+side = (2 * args.half_size + 1) * ARENA_CELL
+screen.setup(width=side + 40, height=side + 40)
+screen.bgcolor("black")
+screen.title("Snake Arena")
+screen.tracer(0)
+
+arena = Arena(args.ais, args.humans, args.half_size)
+view = ArenaView(arena)
+
+screen.listen()
+for snake, keys in zip(arena.snakes[:args.humans], HUMAN_KEYS):
+    for key, heading in zip(keys, (UP, DOWN, LEFT, RIGHT)):
+        screen.onkey(lambda snake=snake, heading=heading: snake.turn(heading), key)
+
+while True:
+    start = time.perf_counter()
+    arena.tick()
+    view.draw()
+    screen.update()
+    time.sleep(max(0.0, TICK_SECONDS - (time.perf_counter() - start)))
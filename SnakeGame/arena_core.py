@@ -0,0 +1,196 @@
+import random
+import time
+from collections import deque
+from free_cells import FreeCells
+from snake_core import STEPS, OPPOSITE, UP, DOWN, LEFT, RIGHT
+
+ARENA_HALF = 40
+FOOD_PER_SNAKE = 0.5
+RESPAWN_TICKS = 20
+SPAWN_TRIES = 20
+START_LENGTH = 3
+
+
+class ArenaSnake:
+
+    def __init__(self, number, human=False):
+        self.number = number
+        self.human = human
+        self.body = deque()
+        self.heading = RIGHT
+        self.growth = 0
+        self.score = 0
+        self.alive = False
+        self.target = None
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    def turn(self, heading):
+        if self.heading != OPPOSITE[heading]:
+            self.heading = heading
+
+
+class Arena:
+    # Many snakes on one board. A single dict maps every body cell to the
+    # snake on it, so a collision check is one lookup whatever the number or
+    # length of the snakes. Bodies only change at both ends on each tick, and
+    # the AI looks at the cells next to its head only, so a tick costs O(1) per
+    # moving head; a whole body is walked only when its snake dies.
+    # After each tick, moved / died / spawned / food_added / food_eaten list
+    # what changed, for the renderer.
+
+    def __init__(self, ais, humans=0, half_size=ARENA_HALF, seed=None):
+        self.half_size = half_size
+        self.rng = random.Random(seed)
+        self.owner = {}
+        self.free = FreeCells(half_size)
+        self.food = FreeCells(half_size, full=False)
+        self.snakes = [ArenaSnake(i, human=i < humans) for i in range(humans + ais)]
+        self.food_target = max(1, int(len(self.snakes) * FOOD_PER_SNAKE))
+        self.respawns = deque()
+        self.ticks = 0
+        self.clear_changes()
+        for snake in self.snakes:
+            self.spawn(snake)
+        for _ in range(self.food_target):
+            self.add_food()
+
+    def clear_changes(self):
+        self.moved = []
+        self.died = []
+        self.spawned = []
+        self.food_added = []
+        self.food_eaten = []
+
+    def inside(self, cell):
+        return abs(cell[0]) <= self.half_size and abs(cell[1]) <= self.half_size
+
+    def spawn(self, snake):
+        # A straight snake on free cells, heading away from its body
+        for _ in range(SPAWN_TRIES):
+            head = self.free.random_cell(self.rng)
+            if head is None:
+                continue
+            heading = self.rng.choice((UP, DOWN, LEFT, RIGHT))
+            dx, dy = STEPS[heading]
+            cells = [(head[0] - dx * i, head[1] - dy * i) for i in range(START_LENGTH)]
+            if all(self.inside(cell) and cell not in self.owner and cell not in self.food for cell in cells):
+                break
+        else:
+            self.respawns.append((self.ticks + RESPAWN_TICKS, snake))
+            return
+        snake.body.extend(cells)
+        for cell in cells:
+            self.owner[cell] = snake
+            self.free.discard(cell)
+        snake.heading = heading
+        snake.growth = 0
+        snake.score = 0
+        snake.target = None
+        snake.alive = True
+        self.spawned.append(snake)
+
+    def add_food(self):
+        cell = self.free.random_cell(self.rng)
+        if cell is not None:
+            self.free.discard(cell)
+            self.food.add(cell)
+            self.food_added.append(cell)
+
+    def kill(self, snake):
+        snake.alive = False
+        for cell in snake.body:
+            if self.owner.get(cell) is snake:
+                del self.owner[cell]
+                self.free.add(cell)
+        snake.body.clear()
+        self.died.append(snake)
+        self.respawns.append((self.ticks + RESPAWN_TICKS, snake))
+
+    def choose(self, snake):
+        # Greedy towards its own piece of food, avoiding occupied cells and,
+        # if it can, cells with no way out
+        if snake.target not in self.food:
+            snake.target = self.food.random_cell(self.rng)
+        x, y = snake.head
+        tx, ty = snake.target if snake.target else (x, y)
+        best, best_key = snake.heading, None
+        for heading, (dx, dy) in STEPS.items():
+            if heading == OPPOSITE[snake.heading]:
+                continue
+            cell = (x + dx, y + dy)
+            if cell in self.owner or not self.inside(cell):
+                continue
+            exits = sum((cell[0] + ex, cell[1] + ey) not in self.owner and self.inside((cell[0] + ex, cell[1] + ey))
+                        for ex, ey in STEPS.values())
+            key = (exits <= 1, abs(cell[0] - tx) + abs(cell[1] - ty))
+            if best_key is None or key < best_key:
+                best, best_key = heading, key
+        return best
+
+    def tick(self):
+        self.clear_changes()
+        self.ticks += 1
+        alive = [snake for snake in self.snakes if snake.alive]
+        for snake in alive:
+            if not snake.human:
+                snake.turn(self.choose(snake))
+        # Tails leave first, so a head may move into a cell freed this tick
+        tails = {}
+        for snake in alive:
+            if snake.growth:
+                snake.growth -= 1
+            else:
+                tail = snake.body.pop()
+                del self.owner[tail]
+                self.free.add(tail)
+                tails[snake] = tail
+        heads = {}
+        crashed = set()
+        for snake in alive:
+            dx, dy = STEPS[snake.heading]
+            x, y = snake.body[0]
+            head = (x + dx, y + dy)
+            if head in self.owner or not self.inside(head):
+                crashed.add(snake)
+            elif head in heads:
+                # Head to head: both lose
+                crashed.add(snake)
+                crashed.add(heads[head])
+            else:
+                heads[head] = snake
+        for head, snake in heads.items():
+            if snake in crashed:
+                continue
+            snake.body.appendleft(head)
+            self.owner[head] = snake
+            self.free.discard(head)
+            if head in self.food:
+                self.food.discard(head)
+                self.food_eaten.append(head)
+                snake.growth += 1
+                snake.score += 1
+            self.moved.append((snake, head, tails.get(snake)))
+        for snake in crashed:
+            self.kill(snake)
+        while len(self.food) < self.food_target and self.free:
+            self.add_food()
+        while self.respawns and self.respawns[0][0] <= self.ticks:
+            self.spawn(self.respawns.popleft()[1])
+
+
+if __name__ == "__main__":
+    # Headless scaling check: the cost of a tick per moving head should stay flat
+    for ais in (50, 100, 200, 400, 800):
+        arena = Arena(ais, half_size=ARENA_HALF * 2, seed=0)
+        heads = 0
+        start = time.perf_counter()
+        for _ in range(500):
+            arena.tick()
+            heads += len(arena.moved)
+        seconds = time.perf_counter() - start
+        longest = max(len(snake.body) for snake in arena.snakes)
+        print(f"{ais:4d} snakes: {seconds / 500 * 1e3:6.2f} ms/tick, "
+              f"{seconds / heads * 1e6:5.2f} us per moving head, longest snake {longest}")
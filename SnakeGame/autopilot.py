@@ -0,0 +1,253 @@
+import heapq
+from collections import deque
+from snake_core import STEPS, STARTING_CELLS
+
+# Hamiltonian pilot: no shortcuts once the snake fills this much of the board,
+# and always leave this many free cells between the head and the tail
+SHORTCUT_MAX_FILL = 0.5
+SHORTCUT_MARGIN = 3
+# A* pilot: ticks spent following the tail before looking for a safe path again
+RETRY_TICKS = 16
+
+
+def neighbours(cell):
+    x, y = cell
+    for heading, (dx, dy) in STEPS.items():
+        yield heading, (x + dx, y + dy)
+
+
+def safe_moves(core):
+    # Headings that do not hit a wall or the body on the next step. The tail
+    # cell is safe unless the snake is growing, as it moves out of the way first.
+    tail = core.body[-1]
+    moves = []
+    for heading, cell in neighbours(core.head):
+        if core.free.inside(cell) and (cell not in core.occupied or (cell == tail and not core.growth)):
+            moves.append((heading, cell))
+    return moves
+
+
+def obstacles(core):
+    # Cells a path may not cross: the body, except the tail when it is about to move
+    return core.occupied if core.growth else core.occupied - {core.body[-1]}
+
+
+def bfs(inside, blocked, start, goal):
+    # Shortest path from start to goal as a list of headings, or None
+    came_from = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            return rebuild(came_from, goal)
+        for heading, nxt in neighbours(cell):
+            if nxt not in came_from and (nxt == goal or (nxt not in blocked and inside(nxt))):
+                came_from[nxt] = (cell, heading)
+                queue.append(nxt)
+    return None
+
+
+def astar(inside, blocked, start, goal):
+    gx, gy = goal
+    came_from = {start: None}
+    cost = {start: 0}
+    heap = [(abs(start[0] - gx) + abs(start[1] - gy), 0, start)]
+    while heap:
+        _, g, cell = heapq.heappop(heap)
+        if cell == goal:
+            return rebuild(came_from, goal)
+        if g > cost[cell]:
+            continue
+        for heading, nxt in neighbours(cell):
+            if nxt != goal and (nxt in blocked or not inside(nxt)):
+                continue
+            if g + 1 < cost.get(nxt, g + 2):
+                cost[nxt] = g + 1
+                came_from[nxt] = (cell, heading)
+                x, y = nxt
+                heapq.heappush(heap, (g + 1 + abs(x - gx) + abs(y - gy), g + 1, nxt))
+    return None
+
+
+def rebuild(came_from, goal):
+    path = []
+    step = came_from[goal]
+    while step is not None:
+        cell, heading = step
+        path.append(heading)
+        step = came_from[cell]
+    path.reverse()
+    return path
+
+
+def walk(start, path):
+    cells = []
+    x, y = start
+    for heading in path:
+        dx, dy = STEPS[heading]
+        x, y = x + dx, y + dy
+        cells.append((x, y))
+    return cells
+
+
+class BfsPilot:
+    # Greedy: shortest path to the food, ignoring what happens after eating it.
+    # The path is searched once per food and followed while its next cell is
+    # safe (the body only leaves cells ahead of the head, it never enters them).
+
+    def __init__(self, half_size):
+        self.path = deque()
+        self.target = None
+
+    def plan(self, core, food):
+        return bfs(core.free.inside, obstacles(core), core.head, food)
+
+    def choose(self, core, food):
+        safe = dict(safe_moves(core))
+        if not safe:
+            return core.heading
+        if self.target != food or not self.path or self.path[0] not in safe:
+            self.target = food
+            self.path = deque(self.plan(core, food) or ())
+        if self.path and self.path[0] in safe:
+            return self.path.popleft()
+        self.path.clear()
+        return self.fallback(core, safe)
+
+    def fallback(self, core, safe):
+        # No way to the food: keep going straight if possible
+        return core.heading if core.heading in safe else next(iter(safe))
+
+
+class AStarPilot(BfsPilot):
+    # A* to the food, taken only if the tail can still be reached from the food
+    # once the snake has eaten it. Otherwise it follows its own tail, taking
+    # the longest way round, and looks for a safe path again every few ticks.
+
+    def __init__(self, half_size):
+        super().__init__(half_size)
+        self.wait = 0
+
+    def plan(self, core, food):
+        path = astar(core.free.inside, obstacles(core), core.head, food)
+        if path is None:
+            return None
+        cells = walk(core.head, path)
+        # The body after following the path: the new cells plus what is left of the old one
+        length = len(core.body) + min(len(path), core.growth)
+        body = (cells[::-1] + list(core.body))[:length]
+        if self.tail_reachable(core, body):
+            return path
+        return None
+
+    def tail_reachable(self, core, body):
+        return bfs(core.free.inside, set(body[:-1]), body[0], body[-1]) is not None
+
+    def choose(self, core, food):
+        safe = dict(safe_moves(core))
+        if not safe:
+            return core.heading
+        if self.target == food and self.path and self.path[0] in safe:
+            return self.path.popleft()
+        self.wait -= 1
+        if self.target != food or self.wait <= 0:
+            self.target = food
+            self.path = deque(self.plan(core, food) or ())
+            if self.path and self.path[0] in safe:
+                return self.path.popleft()
+            self.path.clear()
+            self.wait = RETRY_TICKS
+        # Away from the tail, but only onto cells from which it can be reached
+        distance = self.tail_distances(core)
+        best, best_length = next(iter(safe)), -1
+        for heading, cell in safe.items():
+            if distance.get(cell, -1) > best_length:
+                best, best_length = heading, distance[cell]
+        return best
+
+    def tail_distances(self, core):
+        tail = core.body[-1]
+        distance = {tail: 0}
+        queue = deque([tail])
+        while queue:
+            cell = queue.popleft()
+            for _, nxt in neighbours(cell):
+                if nxt not in distance and nxt not in core.occupied and core.free.inside(nxt):
+                    distance[nxt] = distance[cell] + 1
+                    queue.append(nxt)
+        return distance
+
+
+def hamiltonian_cycle(half_size):
+    # Cells of a cycle that visits every cell once. A grid of (2 * half_size + 1)^2
+    # cells has an odd number of them, so no such cycle exists: this one leaves out
+    # the top right corner and passes (next to it) through a, d, b, where a and b
+    # are the corner's neighbours and d the cell diagonal to it.
+    n = 2 * half_size + 1
+    local = [(c, 0) for c in range(n)]
+    for r in range(1, n - 2):
+        cols = range(n - 1, 0, -1) if r % 2 else range(1, n)
+        local.extend((c, r) for c in cols)
+    local.append((n - 1, n - 2))
+    for c in range(n - 2, 0, -1):
+        rows = (n - 2, n - 1) if (n - 2 - c) % 2 == 0 else (n - 1, n - 2)
+        local.extend((c, r) for r in rows)
+    local.extend((0, r) for r in range(n - 1, 0, -1))
+    return [(c - half_size, r - half_size) for c, r in local]
+
+
+class HamiltonPilot:
+    # Follows a Hamiltonian cycle and takes shortcuts towards the food while the
+    # snake is short. The body always lies in cycle order from tail to head, so
+    # a shortcut is safe as long as it lands ahead of the head and well before
+    # the tail, and the snake always fills the board up to the last food.
+    # That last food is another matter: the snake only grows on the tick after
+    # eating, so the final cell can only be taken right after eating the food
+    # before it, and only if that food spawned next to it. On these odd-sized
+    # boards that is up to chance, and no pilot can win every game. This one
+    # wins about 1 game in 5 and always dies on the last food otherwise.
+
+    def __init__(self, half_size):
+        if half_size < 3:
+            raise ValueError("the Hamiltonian pilot needs a half_size of at least 3")
+        cycle = hamiltonian_cycle(half_size)
+        start = [cycle.index(cell) for cell in reversed(STARTING_CELLS)]
+        if start[1] != start[0] + 1:
+            # The starting row runs the other way: go round the cycle backwards
+            cycle.reverse()
+        self.size = len(cycle)
+        self.order = {cell: i for i, cell in enumerate(cycle)}
+        # The corner left out of the cycle stands in for the diagonal cell d. It is
+        # only entered to eat, from the neighbour that comes just before d.
+        self.corner = (half_size, half_size)
+        diagonal = self.order[(half_size - 1, half_size - 1)]
+        self.order[self.corner] = diagonal
+        self.entry = cycle[diagonal - 1]
+
+    def distance(self, a, b):
+        return (self.order[b] - self.order[a]) % self.size
+
+    def choose(self, core, food):
+        moves = safe_moves(core)
+        if not moves:
+            return core.heading
+        head, tail = core.head, core.body[-1]
+        room = self.distance(head, tail)
+        shortcuts = len(core.body) < SHORTCUT_MAX_FILL * self.size
+        goal = self.entry if food == self.corner else food
+        best, best_distance = None, None
+        for heading, cell in moves:
+            step = self.distance(head, cell)
+            if cell == food and step == 1:
+                return heading
+            if cell == self.corner:
+                continue
+            if step > 1 and (not shortcuts or step >= room - core.growth - SHORTCUT_MARGIN):
+                continue
+            left = self.distance(cell, goal)
+            if best is None or left < best_distance:
+                best, best_distance = heading, left
+        return best if best is not None else moves[0][0]
+
+
+PILOTS = {"bfs": BfsPilot, "astar": AStarPilot, "hamilton": HamiltonPilot}
@@ -1,19 +1,25 @@
 from turtle import Turtle
-import random
+from snake_core import to_position
 
 
 class Food(Turtle):
 
-    def __init__(self):
+    def __init__(self, free_cells):
         super().__init__()
         self.shape("circle")
         self.penup()
         self.shapesize(stretch_len=0.5, stretch_wid=0.5)
         self.color("blue")
         self.speed("fastest")
+        self.free_cells = free_cells
+        self.cell = None
         self.refresh()
 
     def refresh(self):
-        random_x = random.randint(-280, 280)
-        random_y = random.randint(-280, 280)
-        self.goto(random_x, random_y)
+        # Always an empty cell of the grid, in O(1) however full the board is
+        self.cell = self.free_cells.random_cell()
+        if self.cell is None:
+            self.hideturtle()
+        else:
+            self.goto(to_position(self.cell))
+            self.showturtle()
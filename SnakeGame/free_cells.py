@@ -0,0 +1,42 @@
+import random
+
+
+class FreeCells:
+    # Set of the empty cells of the grid that can also pick a random one in
+    # O(1): the cells are kept in a list, and a dict gives the position of each
+    # one in the list. Removing a cell moves the last one into its place.
+
+    def __init__(self, half_size, full=True):
+        self.half_size = half_size
+        self.cells = [(x, y)
+                      for y in range(-half_size, half_size + 1)
+                      for x in range(-half_size, half_size + 1)] if full else []
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def inside(self, cell):
+        return abs(cell[0]) <= self.half_size and abs(cell[1]) <= self.half_size
+
+    def add(self, cell):
+        # Cells outside the grid (a head on the wall) are never free
+        if cell not in self.index and self.inside(cell):
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        i = self.index.pop(cell, None)
+        if i is not None:
+            last = self.cells.pop()
+            if last != cell:
+                self.cells[i] = last
+                self.index[last] = i
+
+    def random_cell(self, rng=random):
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def __len__(self):
+        return len(self.cells)
@@ -11,7 +11,7 @@ screen.title("My Snake Game")
 screen.tracer(0)
 
 snake = Snake()
-food = Food()
+food = Food(snake.core.free)
 scoreboard = Scoreboard()
 
 screen.listen()
@@ -27,23 +27,26 @@ while game_is_on:
     snake.move()
 
     #Detect collision with food.
-    if snake.head.distance(food) < 15:
+    if snake.core.head == food.cell:
         food.refresh()
         snake.extend()
         scoreboard.increase_score()
 
     #Detect collision with wall.
-    if snake.head.xcor() > 280 or snake.head.xcor() < -280 or snake.head.ycor() > 280 or snake.head.ycor() < -280:
+    if snake.hit_wall():
         scoreboard.reset()
         snake.reset()
+        # The new body may cover the food
+        if food.cell not in snake.core.free:
+            food.refresh()
 
-    #Detect collision with tail.
-    for segment in snake.segments:
-        if segment == snake.head:
-            pass
-        elif snake.head.distance(segment) < 10:
-            scoreboard.reset()
-            snake.reset()
+    #Detect collision with tail (a set lookup, not a loop over the segments).
+    if snake.hit_tail():
+        scoreboard.reset()
+        snake.reset()
+        # The new body may cover the food
+        if food.cell not in snake.core.free:
+            food.refresh()
 
 
 
@@ -0,0 +1,103 @@
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+
+DATABASE = "scores.db"
+LEGACY_FILE = "data.txt"    # Single high score kept by older versions of the game
+LEGACY_PLAYER = "player"
+TOP_N = 10
+
+
+class ScoreStore:
+    # High scores of every player in a SQLite database. The game thread only
+    # touches in-memory leaderboards (the top TOP_N scores of each player), so
+    # saving or querying a score never waits for the disk. Saved scores go
+    # through a queue to a writer thread, which commits them in batches; each
+    # commit is an atomic SQLite transaction, so a crash loses at most the last
+    # batch and never leaves a half-written file behind.
+
+    def __init__(self, path=DATABASE, top_n=TOP_N):
+        self.path = path
+        self.top_n = top_n
+        self.tops = {}
+        self.pending = queue.Queue()
+        connection = self.connect()
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS scores (player TEXT NOT NULL, score INTEGER NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, score DESC)")
+            self.import_legacy(connection)
+        rows = connection.execute(
+            "SELECT player, score FROM (SELECT player, score, ROW_NUMBER() OVER "
+            "(PARTITION BY player ORDER BY score DESC) AS position FROM scores) "
+            "WHERE position <= ? ORDER BY score DESC", (top_n,))
+        for player, score in rows:
+            self.tops.setdefault(player, []).append(score)
+        connection.close()
+        self.writer = threading.Thread(target=self.write_scores, name="score-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def import_legacy(self, connection):
+        # The first run after the upgrade keeps the old high score
+        if connection.execute("SELECT 1 FROM scores LIMIT 1").fetchone() or not os.path.exists(LEGACY_FILE):
+            return
+        try:
+            with open(LEGACY_FILE) as data:
+                score = int(data.read())
+        except (OSError, ValueError):
+            return
+        connection.execute("INSERT INTO scores VALUES (?, ?)", (LEGACY_PLAYER, score))
+
+    def save(self, player, score):
+        top = self.tops.setdefault(player, [])
+        if len(top) < self.top_n or score > top[-1]:
+            position = len(top)
+            while position and top[position - 1] < score:
+                position -= 1
+            top.insert(position, score)
+            del top[self.top_n:]
+        self.pending.put((player, score))
+
+    def top(self, player, n=None):
+        return self.tops.get(player, [])[:n or self.top_n]
+
+    def best(self, player):
+        top = self.tops.get(player)
+        return top[0] if top else 0
+
+    def leaderboard(self, n=None):
+        # (score, player) pairs of the best scores of all players
+        scores = [(score, player) for player, top in self.tops.items() for score in top]
+        scores.sort(reverse=True)
+        return scores[:n or self.top_n]
+
+    def write_scores(self):
+        connection = self.connect()
+        running = True
+        while running:
+            batch = [self.pending.get()]
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            # None asks the thread to stop once everything before it is written
+            running = None not in batch
+            rows = [row for row in batch if row is not None]
+            if rows:
+                with connection:
+                    connection.executemany("INSERT INTO scores VALUES (?, ?)", rows)
+        connection.close()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
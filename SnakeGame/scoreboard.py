@@ -1,15 +1,18 @@
 from turtle import Turtle
+from score_store import ScoreStore
+PLAYER = "player"
 ALIGNMENT = "center"
 FONT = ("Courier", 24, "normal")
 
 
 class Scoreboard(Turtle):
 
-    def __init__(self):
+    def __init__(self, store=None, player=PLAYER):
         super().__init__()
         self.score = 0
-        with open("data.txt") as data:
-            self.high_score = int(data.read())
+        self.store = store or ScoreStore()
+        self.player = player
+        self.high_score = self.store.best(player)
         self.color("white")
         self.penup()
         self.goto(0, 270)
@@ -21,10 +24,10 @@ class Scoreboard(Turtle):
         self.write(f"Score: {self.score} High score: {self.high_score}", align=ALIGNMENT, font=FONT)
 
     def reset(self):
-        if self.score > self.high_score:
-            self.high_score = self.score
-            with open("data.txt",mode="w") as data:
-                data.write(f"{self.high_score}")
+        # Saved in the background: no file access inside the game loop
+        if self.score:
+            self.store.save(self.player, self.score)
+            self.high_score = self.store.best(self.player)
         self.score = 0
         self.update_scoreboard()
 
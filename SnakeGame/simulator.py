@@ -0,0 +1,137 @@
+# Headless Snake: the rules of main.py (walls at +-280, 20 px steps, no
+# reversing, one segment per food) on a SnakeCore without turtles, driven by
+# an autopilot from autopilot.py. Games run in parallel on a process pool.
+# Run it from the SnakeGame folder:
+#   python simulator.py games --pilot hamilton --games 2000
+#   python simulator.py bench --sizes 14 30 60
+import argparse
+import random
+import time
+from multiprocessing import Pool, cpu_count
+from autopilot import PILOTS
+from snake_core import SnakeCore, GRID_HALF
+
+# A game also ends if the snake goes this many board sizes without eating
+STALL_BOARDS = 2
+
+
+class Simulation:
+
+    def __init__(self, half_size=GRID_HALF, seed=None):
+        self.rng = random.Random(seed)
+        self.core = SnakeCore(half_size)
+        self.food = self.core.free.random_cell(self.rng)
+        self.score = 0
+        self.ticks = 0
+        self.hungry = 0
+        self.stall_limit = STALL_BOARDS * (2 * half_size + 1) ** 2
+        self.game_over = False
+
+    def tick(self, heading=None):
+        if heading is not None:
+            self.core.turn(heading)
+        head, _ = self.core.step()
+        self.ticks += 1
+        self.hungry += 1
+        if head == self.food:
+            self.score += 1
+            self.hungry = 0
+            self.food = self.core.free.random_cell(self.rng)
+            self.core.grow()
+        if self.core.hit_wall() or self.core.hit_tail():
+            self.game_over = True
+        # A full board (no cell left for the food) is a win
+        elif self.food is None or self.hungry > self.stall_limit:
+            self.game_over = True
+
+    @property
+    def won(self):
+        return self.food is None and not (self.core.hit_wall() or self.core.hit_tail())
+
+
+def play_game(task):
+    pilot_name, half_size, seed, max_ticks = task
+    sim = Simulation(half_size, seed)
+    pilot = PILOTS[pilot_name](half_size)
+    thinking = 0.0
+    while not sim.game_over and sim.ticks < max_ticks:
+        start = time.perf_counter()
+        heading = pilot.choose(sim.core, sim.food)
+        thinking += time.perf_counter() - start
+        sim.tick(heading)
+    return {
+        "seed": seed,
+        "score": sim.score,
+        "ticks": sim.ticks,
+        "won": sim.won,
+        "thinking": thinking,
+    }
+
+
+def run_games(pilot_name, games, half_size=GRID_HALF, processes=None, seed=0, max_ticks=100_000):
+    tasks = [(pilot_name, half_size, seed + i, max_ticks) for i in range(games)]
+    processes = processes or cpu_count()
+    start = time.perf_counter()
+    if processes == 1:
+        results = [play_game(task) for task in tasks]
+    else:
+        with Pool(processes) as pool:
+            chunk = max(1, games // (processes * 8))
+            results = list(pool.imap_unordered(play_game, tasks, chunksize=chunk))
+    return results, time.perf_counter() - start
+
+
+def summary(pilot_name, results, seconds):
+    games = len(results)
+    ticks = sum(result["ticks"] for result in results)
+    scores = sorted(result["score"] for result in results)
+    thinking = sum(result["thinking"] for result in results)
+    wins = sum(result["won"] for result in results)
+    return (f"{pilot_name:>8}: {games} games in {seconds:.2f} s ({games / seconds:,.0f} games/s, "
+            f"{ticks / seconds:,.0f} ticks/s), score mean {sum(scores) / games:.1f} "
+            f"median {scores[games // 2]} max {scores[-1]}, {wins} wins, "
+            f"{thinking / ticks * 1e6:.1f} us/tick thinking")
+
+
+def games_command(args):
+    pilots = [args.pilot] if args.pilot else list(PILOTS)
+    for name in pilots:
+        results, seconds = run_games(name, args.games, args.half_size, args.processes, args.seed, args.max_ticks)
+        print(summary(name, results, seconds))
+
+
+def bench_command(args):
+    # Path-finding cost per tick on growing boards, one process
+    pilots = [args.pilot] if args.pilot else list(PILOTS)
+    for half_size in args.sizes:
+        side = 2 * half_size + 1
+        print(f"{side}x{side} board, {args.ticks} ticks per pilot:")
+        for name in pilots:
+            ticks = 0
+            thinking = 0.0
+            seed = args.seed
+            while ticks < args.ticks:
+                result = play_game((name, half_size, seed, args.ticks - ticks))
+                ticks += result["ticks"]
+                thinking += result["thinking"]
+                seed += 1
+            print(f"  {name:>8}: {thinking / ticks * 1e6:9.1f} us/tick")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Snake with autopilots")
+    parser.add_argument("--pilot", choices=list(PILOTS), help="only this pilot (default: all of them)")
+    parser.add_argument("--seed", type=int, default=0)
+    commands = parser.add_subparsers(dest="command", required=True)
+    games = commands.add_parser("games", help="play many games on a process pool")
+    games.add_argument("--games", type=int, default=1000)
+    games.add_argument("--half-size", type=int, default=GRID_HALF, help="cells from the centre to the wall")
+    games.add_argument("--processes", type=int, default=None, help="default: one per core")
+    games.add_argument("--max-ticks", type=int, default=100_000, help="cut off longer games")
+    games.set_defaults(run=games_command)
+    bench = commands.add_parser("bench", help="path-finding cost per tick on large boards")
+    bench.add_argument("--sizes", type=int, nargs="+", default=[14, 30, 60], help="half sizes to try")
+    bench.add_argument("--ticks", type=int, default=5000)
+    bench.set_defaults(run=bench_command)
+    args = parser.parse_args()
+    args.run(args)
@@ -1,60 +1,63 @@
+from collections import deque
 from turtle import Turtle
-STARTING_POSITIONS = [(0, 0), (-20, 0), (-40, 0)]
-MOVE_DISTANCE = 20
-UP = 90
-DOWN = 270
-LEFT = 180
-RIGHT = 0
+from snake_core import SnakeCore, to_position, CELL_SIZE, UP, DOWN, LEFT, RIGHT
+MOVE_DISTANCE = CELL_SIZE
 
 
 class Snake:
+    # Turtle view of a SnakeCore. The body is drawn with stamps of a single
+    # hidden turtle (the head): a move stamps the new head and deletes the
+    # tail stamp. Stamps are plain canvas items that screen.update() does not
+    # redraw, and reset() deletes them, so the number of canvas items and the
+    # Tk work per tick do not grow with the length of the snake or with resets.
 
     def __init__(self):
-        self.segments = []
+        self.core = SnakeCore()
+        self.head = Turtle("square")
+        self.head.color("white")
+        self.head.penup()
+        self.head.hideturtle()
+        # clearstamp() looks the stamp up in the undo buffer; keep it tiny
+        self.head.setundobuffer(1)
+        self.segments = deque()
         self.create_snake()
-        self.head = self.segments[0]
 
     def create_snake(self):
-        for position in STARTING_POSITIONS:
-            self.add_segment(position)
+        # From the tail, so the oldest stamp is always the tail
+        for cell in reversed(self.core.body):
+            self.head.goto(to_position(cell))
+            self.segments.appendleft(self.head.stamp())
 
     def reset(self):
-        for seg in self.segments:
-            seg.goto(1000,1000)
+        self.head.clearstamps()
         self.segments.clear()
+        self.core.reset()
         self.create_snake()
-        self.head = self.segments[0]
-
-    def add_segment(self, position):
-        new_segment = Turtle("square")
-        new_segment.color("white")
-        new_segment.penup()
-        new_segment.goto(position)
-        self.segments.append(new_segment)
 
     def extend(self):
-        self.add_segment(self.segments[-1].position())
+        self.core.grow()
 
     def move(self):
-        for seg_num in range(len(self.segments) - 1, 0, -1):
-            new_x = self.segments[seg_num - 1].xcor()
-            new_y = self.segments[seg_num - 1].ycor()
-            self.segments[seg_num].goto(new_x, new_y)
-        self.head.forward(MOVE_DISTANCE)
+        head, tail = self.core.step()
+        if tail is not None:
+            self.head.clearstamp(self.segments.pop())
+        self.head.goto(to_position(head))
+        self.segments.appendleft(self.head.stamp())
+
+    def hit_wall(self):
+        return self.core.hit_wall()
+
+    def hit_tail(self):
+        return self.core.hit_tail()
 
     def up(self):
-        if self.head.heading() != DOWN:
-            self.head.setheading(UP)
+        self.core.turn(UP)
 
     def down(self):
-        if self.head.heading() != UP:
-            self.head.setheading(DOWN)
+        self.core.turn(DOWN)
 
     def left(self):
-        if self.head.heading() != RIGHT:
-            self.head.setheading(LEFT)
+        self.core.turn(LEFT)
 
     def right(self):
-        if self.head.heading() != LEFT:
-            self.head.setheading(RIGHT)
-
+        self.core.turn(RIGHT)
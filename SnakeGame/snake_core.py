@@ -0,0 +1,84 @@
+from collections import deque
+from free_cells import FreeCells
+
+# The board is a grid of cells; cell (x, y) is drawn at pixel (x * CELL_SIZE, y * CELL_SIZE)
+CELL_SIZE = 20
+GRID_HALF = 14
+STARTING_CELLS = [(0, 0), (-1, 0), (-2, 0)]
+UP = 90
+DOWN = 270
+LEFT = 180
+RIGHT = 0
+STEPS = {UP: (0, 1), DOWN: (0, -1), LEFT: (-1, 0), RIGHT: (1, 0)}
+OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+
+def to_position(cell):
+    return cell[0] * CELL_SIZE, cell[1] * CELL_SIZE
+
+
+class SnakeCore:
+    # Snake logic without turtles: the body is a deque of cells (head first)
+    # plus a set of the same cells, so a move and a collision check are O(1)
+    # whatever the length of the snake. The empty cells are kept in sync in
+    # free (see FreeCells), to place the food on one of them in O(1).
+
+    def __init__(self, half_size=GRID_HALF):
+        self.half_size = half_size
+        self.body = deque()
+        self.occupied = set()
+        self.free = FreeCells(half_size)
+        self.reset()
+
+    def reset(self):
+        for cell in self.body:
+            self.free.add(cell)
+        self.body.clear()
+        self.body.extend(STARTING_CELLS)
+        self.occupied.clear()
+        self.occupied.update(STARTING_CELLS)
+        for cell in STARTING_CELLS:
+            self.free.discard(cell)
+        self.heading = RIGHT
+        self.growth = 0
+        self.hit_itself = False
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    def turn(self, heading):
+        if self.heading != OPPOSITE[heading]:
+            self.heading = heading
+
+    def grow(self, amount=1):
+        self.growth += amount
+
+    def step(self):
+        # Moves one cell and returns (new head, freed tail cell or None if the snake grew)
+        dx, dy = STEPS[self.heading]
+        x, y = self.body[0]
+        head = (x + dx, y + dy)
+        tail = None
+        if self.growth:
+            self.growth -= 1
+        else:
+            tail = self.body.pop()
+            self.occupied.discard(tail)
+            self.free.add(tail)
+        # The head may move into the cell the tail has just left
+        self.hit_itself = head in self.occupied
+        self.body.appendleft(head)
+        self.occupied.add(head)
+        self.free.discard(head)
+        return head, tail
+
+    def hit_wall(self):
+        x, y = self.body[0]
+        return abs(x) > self.half_size or abs(y) > self.half_size
+
+    def hit_tail(self):
+        return self.hit_itself
+
+    def __len__(self):
+        return len(self.body)
@@ -0,0 +1,82 @@
+# Soak test for the snake rendering: plays RESETS short games with the real
+# turtle screen and checks that canvas items, memory and frame time stay flat.
+# Run it from the SnakeGame folder: python soak.py
+import sys
+import time
+import tracemalloc
+from turtle import Screen
+from snake import Snake
+from snake_core import GRID_HALF, UP, LEFT, RIGHT
+
+RESETS = 1000
+REPORT_EVERY = 100
+GROWTH_PER_GAME = 40
+MAX_SLOWDOWN = 1.5          # Last block may be at most this much slower than the first
+MAX_MEMORY_GROWTH = 256     # KiB
+
+
+def play_game(snake, screen):
+    # Zig-zags up the board row by row until it runs into the top wall
+    for _ in range(GROWTH_PER_GAME):
+        snake.extend()
+    frames = []
+    while True:
+        x, y = snake.core.head
+        heading = snake.core.heading
+        if (heading == RIGHT and x == GRID_HALF - 1) or (heading == LEFT and x == 1 - GRID_HALF):
+            snake.up()
+        elif heading == UP:
+            if x > 0:
+                snake.left()
+            else:
+                snake.right()
+        start = time.perf_counter()
+        snake.move()
+        screen.update()
+        frames.append(time.perf_counter() - start)
+        if snake.hit_wall() or snake.hit_tail():
+            break
+    snake.reset()
+    return frames
+
+
+screen = Screen()
+screen.setup(width=600, height=600)
+screen.bgcolor("black")
+screen.title("Snake soak test")
+screen.tracer(0)
+canvas = screen.getcanvas()
+
+snake = Snake()
+tracemalloc.start()
+blocks = []
+frames = []
+for game in range(1, RESETS + 1):
+    frames.extend(play_game(snake, screen))
+    if game % REPORT_EVERY == 0:
+        screen.update()
+        block = {
+            "frame_ms": sum(frames) / len(frames) * 1000,
+            "items": len(canvas.find_all()),
+            "memory_kib": tracemalloc.get_traced_memory()[0] / 1024,
+        }
+        blocks.append(block)
+        frames = []
+        print(f"{game:5d} resets: {block['frame_ms']:.3f} ms/frame, "
+              f"{block['items']} canvas items, {block['memory_kib']:.0f} KiB")
+tracemalloc.stop()
+screen.bye()
+
+first, last = blocks[0], blocks[-1]
+problems = []
+if last["items"] > first["items"]:
+    problems.append(f"canvas items grew from {first['items']} to {last['items']}")
+if last["memory_kib"] - first["memory_kib"] > MAX_MEMORY_GROWTH:
+    problems.append(f"memory grew by {last['memory_kib'] - first['memory_kib']:.0f} KiB")
+if last["frame_ms"] > first["frame_ms"] * MAX_SLOWDOWN:
+    problems.append(f"frame time went from {first['frame_ms']:.3f} to {last['frame_ms']:.3f} ms")
+for problem in problems:
+    print("FAIL:", problem)
+if problems:
+    sys.exit(1)
+print("OK: canvas items, memory and frame time stayed flat")
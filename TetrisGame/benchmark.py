@@ -0,0 +1,1074 @@
+"""
+benchmark.py - Micro-benchmarks del motor del Tetris
+
+Este módulo mide el coste de las partes del juego que más se usan en las
+simulaciones sin ventana. Se ejecuta desde la carpeta TetrisGame:
+
+    python benchmark.py                       # Todos los benchmarks
+    python benchmark.py nucleo motor          # Solo algunos
+    python benchmark.py nucleo --guardar base.json
+    python benchmark.py --comparar base.json  # Falla si algo empeora
+
+Todas las pruebas usan una semilla fija para que los resultados sean
+comparables entre ejecuciones. Con --guardar se escriben los resultados
+en un JSON que sirve de referencia; con --comparar se vuelven a medir
+los mismos benchmarks y el programa termina con código 1 si alguna
+métrica empeora más que el umbral (--umbral, 25 % por defecto).
+"""
+
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from board import Board, FILAS
+from engine import Engine, IZQUIERDA, DERECHA, ABAJO, ROTAR, CAIDA
+from tetromino import Tetromino, FORMAS, GEOMETRIAS, TIPOS
+
+# =============================================================================
+# CONSTANTES DEL BENCHMARK
+# =============================================================================
+SEMILLA = 1234           # Semilla fija para generar los tableros y piezas
+REPETICIONES = 5         # Se toma el mejor tiempo de varias repeticiones
+UMBRAL = 0.25            # Empeoramiento máximo admitido al comparar (25 %)
+
+# Unidades de las métricas en las que más es mejor (en el resto, menos)
+UNIDADES_MAYOR_MEJOR = ("/s)", "(veces)")
+
+
+def _medir(funcion, repeticiones=REPETICIONES):
+    """
+    Mide el mejor tiempo de ejecución de una función.
+
+    Args:
+        funcion: Función sin argumentos a medir
+        repeticiones (int): Número de veces que se ejecuta
+
+    Returns:
+        float: Mejor tiempo en segundos
+    """
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def _bloques_por_llamada(funcion, llamadas):
+    """
+    Cuenta los objetos que crea una función en cada llamada.
+
+    Se guardan todos los resultados para que nada se libere durante la
+    medición, y se compara el número de bloques de memoria reservados
+    por el intérprete antes y después.
+
+    Args:
+        funcion: Función sin argumentos a medir
+        llamadas (int): Número de llamadas
+
+    Returns:
+        float: Bloques de memoria nuevos por llamada
+    """
+    resultados = [None] * llamadas
+    gc.collect()
+    antes = sys.getallocatedblocks()
+    for i in range(llamadas):
+        resultados[i] = funcion()
+    despues = sys.getallocatedblocks()
+    del resultados
+    return (despues - antes) / llamadas
+
+
+def _pieza(tipo, rotacion, x, y):
+    """Crea un tetrominó en una posición y rotación concretas."""
+    pieza = Tetromino(tipo)
+    pieza.rotacion_actual = rotacion % len(FORMAS[tipo])
+    pieza.x = x
+    pieza.y = y
+    return pieza
+
+
+def tablero_a_medias(rng, piezas=25):
+    """
+    Genera un tablero de mitad de partida dejando caer piezas al azar.
+
+    Args:
+        rng (random.Random): Generador de números aleatorios
+        piezas (int): Número de piezas a dejar caer
+
+    Returns:
+        Board: Tablero con bloques fijados
+    """
+    tablero = Board()
+    for _ in range(piezas):
+        pieza = _pieza(rng.choice(list(FORMAS)), rng.randrange(4),
+                       rng.randrange(tablero.columnas - 3), 0)
+        if not tablero.es_posicion_valida(pieza):
+            break
+        while tablero.es_posicion_valida(pieza):
+            pieza.y += 1
+        pieza.y -= 1
+        tablero.fijar_pieza(pieza)
+        tablero.limpiar_lineas()
+    return tablero
+
+
+def tablero_con_lineas(parejas=2):
+    """
+    Genera un tablero con parejas de líneas completas en el fondo.
+
+    Cada pareja se rellena con dos piezas I horizontales por fila y una
+    pieza O en las dos últimas columnas.
+
+    Args:
+        parejas (int): Número de parejas de líneas completas
+
+    Returns:
+        Board: Tablero con 2 * parejas líneas listas para limpiar
+    """
+    tablero = Board()
+    for p in range(parejas):
+        fila = tablero.filas - 2 * (p + 1)
+        for dy in (0, 1):
+            tablero.fijar_pieza(_pieza('I', 0, 0, fila + dy))
+            tablero.fijar_pieza(_pieza('I', 0, 4, fila + dy))
+        tablero.fijar_pieza(_pieza('O', 0, 8, fila))
+    # Un bloque suelto encima para que haya filas que bajar
+    tablero.fijar_pieza(_pieza('T', 0, 3, fila - 2))
+    return tablero
+
+
+def _dejar_caer(tablero, rng, tipos=TIPOS):
+    """
+    Deja caer una pieza al azar en una columna al azar del tablero.
+
+    Returns:
+        bool: False si la pieza no cabía arriba del todo
+    """
+    pieza = _pieza(rng.choice(tipos), rng.randrange(4),
+                   rng.randrange(-1, tablero.columnas - 1), 0)
+    if not tablero.es_posicion_valida(pieza):
+        return False
+    pieza.y = tablero.fila_caida(pieza)
+    tablero.fijar_pieza(pieza)
+    tablero.limpiar_lineas()
+    return True
+
+
+def tablero_vacio(rng):
+    """Fixture: tablero vacío."""
+    return Board()
+
+
+def tablero_hasta_altura(rng, altura, tipos=TIPOS):
+    """
+    Genera un tablero dejando caer piezas hasta que la pila llega a una altura.
+
+    Args:
+        rng (random.Random): Generador de números aleatorios
+        altura (int): Altura de la columna más alta
+        tipos (tuple): Tipos de pieza que pueden caer
+
+    Returns:
+        Board: Tablero con la pila
+    """
+    tablero = Board()
+    while max(tablero.alturas) < altura:
+        _dejar_caer(tablero, rng, tipos)
+    return tablero
+
+
+def tablero_mitad(rng):
+    """Fixture: partida a medias (pila de 10 filas)."""
+    return tablero_hasta_altura(rng, 10)
+
+
+def tablero_casi_lleno(rng):
+    """Fixture: la pila está a 4 filas del techo."""
+    return tablero_hasta_altura(rng, FILAS - 4)
+
+
+def tablero_con_huecos(rng):
+    """
+    Fixture: tablero con muchos huecos tapados.
+
+    Solo caen piezas S, Z y T, que al caer en vertical dejan huecos debajo.
+    """
+    return tablero_hasta_altura(rng, 12, ('S', 'Z', 'T'))
+
+
+# Tableros representativos para los benchmarks del núcleo
+FIXTURES = {
+    "vacio": tablero_vacio,
+    "a medias": tablero_mitad,
+    "casi lleno": tablero_casi_lleno,
+    "huecos": tablero_con_huecos,
+}
+
+
+def tablero_escalado(columnas, filas, lineas=4):
+    """
+    Genera un tablero grande con líneas completas y una pila encima.
+
+    Las líneas del fondo se rellenan con piezas O y encima se apila una
+    columna de piezas O hasta la mitad del tablero (filas incompletas que
+    hay que bajar al limpiar). Las líneas se completan al final, como al
+    fijar la última pieza en una partida.
+
+    Args:
+        columnas (int): Número de columnas (par)
+        filas (int): Número de filas
+        lineas (int): Número de líneas completas (par)
+
+    Returns:
+        Board: Tablero con las líneas listas para limpiar
+    """
+    tablero = Board(columnas, filas)
+    for fila in range(filas // 2, filas, 2):
+        tablero.fijar_pieza(_pieza('O', 0, 0, fila))
+    tablero.limpiar_lineas()
+    for fila in range(filas - lineas, filas, 2):
+        for col in range(2, columnas, 2):
+            tablero.fijar_pieza(_pieza('O', 0, col, fila))
+    return tablero
+
+
+def _bloques_recorriendo_forma(pieza):
+    """Bloques de referencia: recorre la matriz 0/1 de la rotación, como al principio."""
+    bloques = []
+    for fila_idx, fila in enumerate(pieza.forma):
+        for col_idx, celda in enumerate(fila):
+            if celda == 1:
+                bloques.append((pieza.x + col_idx, pieza.y + fila_idx))
+    return bloques
+
+
+def _valida_en_matriz(grid, pieza):
+    """
+    Colisión de referencia: el algoritmo original sobre una matriz de colores.
+
+    Comprueba celda a celda cada bloque de la pieza, que se calcula
+    recorriendo su forma (_bloques_recorriendo_forma).
+    """
+    columnas = len(grid[0])
+    filas = len(grid)
+    for x, y in _bloques_recorriendo_forma(pieza):
+        if x < 0 or x >= columnas:
+            return False
+        if y >= filas:
+            return False
+        if y >= 0 and grid[y][x] is not None:
+            return False
+    return True
+
+
+def _limpiar_copiando(grid):
+    """
+    Limpieza de referencia: copia todas las filas de encima por cada línea.
+
+    Es el algoritmo original (sobre una matriz de colores), que cuesta
+    O(filas² x columnas) cuando se eliminan varias líneas.
+    """
+    lineas = 0
+    fila = len(grid) - 1
+    while fila >= 0:
+        if all(celda is not None for celda in grid[fila]):
+            lineas += 1
+            for f in range(fila, 0, -1):
+                grid[f] = grid[f - 1].copy()
+            grid[0] = [None] * len(grid[0])
+        else:
+            fila -= 1
+    return lineas
+
+
+def bench_escalado(tamanos=((10, 20), (100, 200), (1000, 2000), (2000, 4000)),
+                   max_referencia=200):
+    """
+    Mide el tiempo de una limpieza de 4 líneas según el tamaño del tablero.
+
+    La pila ocupa la mitad del tablero, así que hay que bajar filas/2
+    filas. Para los tableros pequeños también se mide la limpieza de
+    referencia que copia filas (_limpiar_copiando).
+
+    Args:
+        tamanos (tuple): Pares (columnas, filas) a medir
+        max_referencia (int): Filas máximas para medir la referencia
+
+    Returns:
+        dict: Tiempo por limpieza en microsegundos para cada tamaño
+    """
+    resultados = {}
+    for columnas, filas in tamanos:
+        nombre = f"{columnas}x{filas}"
+        n = max(3, 20000 // (columnas * filas // 100 + 1) // 10)
+        n = min(n, 200)
+        mejor = float("inf")
+        for _ in range(3):
+            tableros = [tablero_escalado(columnas, filas) for _ in range(n)]
+            inicio = time.perf_counter()
+            for tablero in tableros:
+                tablero.limpiar_lineas()
+            mejor = min(mejor, (time.perf_counter() - inicio) / n)
+        resultados[f"limpiar 4 lineas {nombre} (us)"] = mejor * 1e6
+
+        if filas <= max_referencia:
+            grids = [[list(fila) for fila in tablero_escalado(columnas, filas).grid]
+                     for _ in range(n)]
+            inicio = time.perf_counter()
+            for grid in grids:
+                _limpiar_copiando(grid)
+            tiempo = (time.perf_counter() - inicio) / n
+            resultados[f"copiando filas {nombre} (us)"] = tiempo * 1e6
+    return resultados
+
+
+def bench_colision_y_limpieza(consultas=20000, limpiezas=2000):
+    """
+    Mide es_posicion_valida y limpiar_lineas sobre tableros fijos.
+
+    Cada caso se mide también con el algoritmo original sobre una matriz
+    de colores (_valida_en_matriz y _limpiar_copiando), que sirve de
+    referencia: las métricas "(veces)" dicen cuántas veces más rápido es
+    el bitboard. Para limpiar_lineas sin líneas se marcan todas las filas
+    como tocadas antes de cada llamada, así que se mide la comprobación
+    de filas completas y no la salida rápida cuando no se ha fijado nada.
+
+    Args:
+        consultas (int): Número de comprobaciones de colisión
+        limpiezas (int): Número de llamadas a limpiar_lineas por caso
+
+    Returns:
+        dict: Tiempos por operación en microsegundos y mejoras
+    """
+    rng = random.Random(SEMILLA)
+    tablero = tablero_a_medias(rng)
+    grid = [list(fila) for fila in tablero.grid]
+    piezas = [
+        _pieza(rng.choice(list(FORMAS)), rng.randrange(4),
+               rng.randrange(-1, tablero.columnas), rng.randrange(-1, tablero.filas))
+        for _ in range(consultas)
+    ]
+
+    def colisiones():
+        valida = tablero.es_posicion_valida
+        for pieza in piezas:
+            valida(pieza)
+
+    def colisiones_matriz():
+        for pieza in piezas:
+            _valida_en_matriz(grid, pieza)
+
+    def limpiar():
+        for t in tableros:
+            t.limpiar_lineas()
+
+    def limpiar_matriz():
+        for g in grids:
+            _limpiar_copiando(g)
+
+    def limpiar_sin_lineas():
+        limpiar_lineas = tablero.limpiar_lineas
+        todas = (0, tablero.filas)
+        for _ in range(limpiezas):
+            tablero._tocadas = todas
+            limpiar_lineas()
+
+    def limpiar_sin_lineas_matriz():
+        for _ in range(limpiezas):
+            _limpiar_copiando(grid)
+
+    t_colision = _medir(colisiones)
+    t_colision_matriz = _medir(colisiones_matriz)
+    t_sin_lineas = _medir(limpiar_sin_lineas)
+    t_sin_lineas_matriz = _medir(limpiar_sin_lineas_matriz)
+
+    t_limpieza = t_limpieza_matriz = float("inf")
+    for _ in range(REPETICIONES):
+        tableros = [tablero_con_lineas() for _ in range(limpiezas)]
+        grids = [[list(fila) for fila in t.grid] for t in tableros]
+        t_limpieza = min(t_limpieza, _medir(limpiar, 1))
+        t_limpieza_matriz = min(t_limpieza_matriz, _medir(limpiar_matriz, 1))
+
+    return {
+        "es_posicion_valida (us)": t_colision / consultas * 1e6,
+        "es_posicion_valida, matriz (us)": t_colision_matriz / consultas * 1e6,
+        "es_posicion_valida, mejora (veces)": t_colision_matriz / t_colision,
+        "limpiar_lineas sin lineas (us)": t_sin_lineas / limpiezas * 1e6,
+        "limpiar_lineas sin lineas, matriz (us)": t_sin_lineas_matriz / limpiezas * 1e6,
+        "limpiar_lineas sin lineas, mejora (veces)": t_sin_lineas_matriz / t_sin_lineas,
+        "limpiar_lineas 4 lineas (us)": t_limpieza / limpiezas * 1e6,
+        "limpiar_lineas 4 lineas, matriz (us)": t_limpieza_matriz / limpiezas * 1e6,
+        "limpiar_lineas 4 lineas, mejora (veces)": t_limpieza_matriz / t_limpieza,
+    }
+
+
+def bench_geometria(llamadas=20000):
+    """
+    Compara obtener_bloques() con la geometría precalculada de la pieza.
+
+    Args:
+        llamadas (int): Número de llamadas por caso
+
+    Returns:
+        dict: Objetos creados por llamada y tiempos en microsegundos
+    """
+    tablero = Board()
+    pieza = _pieza('T', 1, 4, 10)
+
+    def obtener_bloques():
+        return pieza.obtener_bloques()
+
+    def geometria():
+        return pieza.geometria.bloques
+
+    def colision():
+        return tablero.es_posicion_valida(pieza)
+
+    def repetir(funcion):
+        return lambda: [funcion() for _ in range(llamadas)]
+
+    return {
+        "obtener_bloques (objetos/llamada)": _bloques_por_llamada(obtener_bloques, llamadas),
+        "geometria.bloques (objetos/llamada)": _bloques_por_llamada(geometria, llamadas),
+        "es_posicion_valida (objetos/llamada)": _bloques_por_llamada(colision, llamadas),
+        "clonar (objetos/llamada)": _bloques_por_llamada(pieza.clonar, llamadas),
+        "obtener_bloques (us)": _medir(repetir(obtener_bloques)) / llamadas * 1e6,
+        "geometria.bloques (us)": _medir(repetir(geometria)) / llamadas * 1e6,
+        "clonar (us)": _medir(repetir(pieza.clonar)) / llamadas * 1e6,
+    }
+
+
+def bench_caida(consultas=20000):
+    """
+    Compara la fila de aterrizaje con alturas de columna y bajando fila a fila.
+
+    Args:
+        consultas (int): Número de piezas por caso
+
+    Returns:
+        dict: Tiempos por caída en microsegundos
+    """
+    rng = random.Random(SEMILLA)
+    resultados = {}
+    for nombre, tablero in (("vacio", Board()), ("a medias", tablero_a_medias(rng))):
+        piezas = []
+        while len(piezas) < consultas:
+            pieza = _pieza(rng.choice(list(FORMAS)), rng.randrange(4),
+                           rng.randrange(-1, tablero.columnas), 0)
+            if tablero.es_posicion_valida(pieza):
+                piezas.append(pieza)
+
+        def rapida():
+            fila_caida = tablero.fila_caida
+            for pieza in piezas:
+                fila_caida(pieza)
+
+        def lenta():
+            fila_caida = tablero._fila_caida_lenta
+            for pieza in piezas:
+                fila_caida(pieza)
+
+        resultados[f"caida {nombre}, alturas (us)"] = _medir(rapida) / consultas * 1e6
+        resultados[f"caida {nombre}, fila a fila (us)"] = _medir(lenta) / consultas * 1e6
+    return resultados
+
+
+def bench_busqueda(piezas=20):
+    """
+    Mide la búsqueda de posiciones alcanzables (busqueda.py) en los tableros
+    de ejemplo, con cada tipo de pieza en su posición de salida.
+
+    Args:
+        piezas (int): Búsquedas por tipo de pieza y tablero
+
+    Returns:
+        dict: Tiempo por búsqueda y posiciones encontradas
+    """
+    from busqueda import colocaciones_alcanzables
+
+    resultados = {}
+    for nombre, fixture in FIXTURES.items():
+        tablero = fixture(random.Random(SEMILLA))
+        salida = []
+        for tipo in TIPOS:
+            pieza = Tetromino(tipo)
+            pieza.x = (tablero.columnas - 4) // 2
+            salida.append(pieza)
+
+        def buscar():
+            for _ in range(piezas):
+                for pieza in salida:
+                    colocaciones_alcanzables(tablero, pieza)
+
+        encontradas = sum(len(colocaciones_alcanzables(tablero, p)) for p in salida)
+        bajando = sum(ABAJO in acciones for p in salida
+                      for acciones in colocaciones_alcanzables(tablero, p).values())
+        resultados[f"busqueda {nombre} (us)"] = _medir(buscar) / (piezas * len(salida)) * 1e6
+        resultados[f"busqueda {nombre}, posiciones por pieza"] = encontradas / len(salida)
+        resultados[f"busqueda {nombre}, con bajada suave"] = bajando / len(salida)
+    return resultados
+
+
+def bench_instantanea(llamadas=5000):
+    """
+    Mide el tamaño de una instantánea y lo que se tarda en crearla y cargarla.
+
+    Args:
+        llamadas (int): Número de instantáneas por caso
+
+    Returns:
+        dict: Bytes por instantánea y tiempos en microsegundos
+    """
+    import instantanea
+
+    resultados = {}
+    for nombre, fixture in FIXTURES.items():
+        rng = random.Random(SEMILLA)
+        motor = Engine(semilla=SEMILLA)
+        motor.tablero = fixture(rng)
+        datos = instantanea.capturar(motor)
+        destino = Engine(semilla=SEMILLA)
+
+        def capturar():
+            for _ in range(llamadas):
+                instantanea.capturar(motor)
+
+        def restaurar():
+            for _ in range(llamadas):
+                instantanea.restaurar(destino, datos)
+
+        resultados[f"instantanea {nombre} (bytes)"] = len(datos)
+        resultados[f"instantanea {nombre}, capturar (us)"] = _medir(capturar) / llamadas * 1e6
+        resultados[f"instantanea {nombre}, restaurar (us)"] = _medir(restaurar) / llamadas * 1e6
+    return resultados
+
+
+def bench_nucleo(consultas=5000, fijadas=500, partidas=20):
+    """
+    Mide las operaciones críticas del motor sobre cada fixture (FIXTURES).
+
+    Para cada tablero se mide es_posicion_valida, fila_caida, fijar_pieza
+    + limpiar_lineas y los giros con wall kick de Engine.rotar. Además se
+    mide obtener_bloques y una partida completa con entradas al azar.
+
+    Args:
+        consultas (int): Piezas por fixture para las consultas
+        fijadas (int): Piezas fijadas por fixture
+        partidas (int): Partidas completas simuladas
+
+    Returns:
+        dict: Tiempos por operación en microsegundos
+    """
+    resultados = {}
+    for nombre, fixture in FIXTURES.items():
+        rng = random.Random(SEMILLA)
+        tablero = fixture(rng)
+        tipos = list(FORMAS)
+
+        # Consultas: piezas en posiciones al azar (válidas o no)
+        piezas = [
+            _pieza(rng.choice(tipos), rng.randrange(4),
+                   rng.randrange(-1, tablero.columnas), rng.randrange(-1, tablero.filas))
+            for _ in range(consultas)
+        ]
+        # Caídas y fijadas: piezas que caben arriba, ya en su fila final
+        arriba = [
+            _pieza(rng.choice(tipos), rng.randrange(4), rng.randrange(-1, tablero.columnas), 0)
+            for _ in range(consultas)
+        ]
+        arriba = [p for p in arriba if tablero.es_posicion_valida(p)]
+        aterrizadas = []
+        for pieza in arriba[:fijadas]:
+            pieza = pieza.clonar()
+            pieza.y = tablero.fila_caida(pieza)
+            aterrizadas.append(pieza)
+
+        def colisiones():
+            valida = tablero.es_posicion_valida
+            for pieza in piezas:
+                valida(pieza)
+
+        def caidas():
+            fila_caida = tablero.fila_caida
+            for pieza in arriba:
+                fila_caida(pieza)
+
+        def fijar():
+            for copia, pieza in zip(copias, aterrizadas):
+                copia.fijar_pieza(pieza)
+                copia.limpiar_lineas()
+
+        # Giros junto a las paredes y sobre la pila para forzar wall kicks
+        motor = Engine(semilla=SEMILLA)
+        motor.tablero = tablero
+        giros = []
+        for pieza in arriba:
+            pieza = pieza.clonar()
+            pieza.x = rng.choice((-1, 0, tablero.columnas - 3, tablero.columnas - 2))
+            pieza.y = tablero.fila_caida(pieza) if tablero.es_posicion_valida(pieza) else 0
+            giros.append((pieza, pieza.x, pieza.rotacion_actual))
+
+        def rotar():
+            for pieza, x, rotacion in giros:
+                pieza.x = x
+                pieza.rotacion_actual = rotacion
+                motor.pieza_actual = pieza
+                motor.rotar()
+
+        t_fijar = float("inf")
+        for _ in range(REPETICIONES):
+            copias = [copy.deepcopy(tablero) for _ in aterrizadas]
+            t_fijar = min(t_fijar, _medir(fijar, 1))
+
+        resultados[f"es_posicion_valida [{nombre}] (us)"] = _medir(colisiones) / len(piezas) * 1e6
+        resultados[f"fila_caida [{nombre}] (us)"] = _medir(caidas) / len(arriba) * 1e6
+        resultados[f"fijar + limpiar [{nombre}] (us)"] = t_fijar / len(aterrizadas) * 1e6
+        resultados[f"rotar con kicks [{nombre}] (us)"] = _medir(rotar) / len(giros) * 1e6
+
+    pieza = _pieza('T', 1, 4, 10)
+
+    def bloques():
+        obtener = pieza.obtener_bloques
+        for _ in range(consultas):
+            obtener()
+
+    resultados["obtener_bloques (us)"] = _medir(bloques) / consultas * 1e6
+
+    # Partida completa: frames de 16 ms con una entrada al azar en el 10 %
+    # de ellos (semilla fija) hasta el game over
+    def jugar_partidas():
+        acciones = (IZQUIERDA, DERECHA, ROTAR, CAIDA)
+        for semilla in range(partidas):
+            rng = random.Random(semilla)
+            motor = Engine(semilla=semilla)
+            while not motor.game_over:
+                entrada = (rng.choice(acciones),) if rng.random() < 0.1 else ()
+                motor.step(entrada, 16)
+
+    resultados["partida completa (ms)"] = _medir(jugar_partidas, 3) / partidas * 1e3
+    return resultados
+
+
+def bench_motor(ticks=200000, dt=16):
+    """
+    Mide cuántos pasos por segundo simula el motor sin ventana.
+
+    Se juegan partidas con entradas aleatorias (semilla fija) y se
+    reinicia la partida cada vez que termina.
+
+    Args:
+        ticks (int): Número de llamadas a step()
+        dt (int): Milisegundos simulados por paso
+
+    Returns:
+        dict: Pasos por segundo con y sin entradas
+    """
+    rng = random.Random(SEMILLA)
+    acciones = (IZQUIERDA, DERECHA, ROTAR, CAIDA)
+    entradas = [
+        (rng.choice(acciones),) if rng.random() < 0.1 else ()
+        for _ in range(ticks)
+    ]
+
+    def jugar(con_entradas):
+        motor = Engine(semilla=SEMILLA)
+        vacio = ()
+        for tick in entradas:
+            motor.step(tick if con_entradas else vacio, dt)
+            if motor.game_over:
+                motor.reiniciar()
+
+    return {
+        "step sin entradas (pasos/s)": ticks / _medir(lambda: jugar(False)),
+        "step con entradas (pasos/s)": ticks / _medir(lambda: jugar(True)),
+    }
+
+
+def bench_lote(partidas=1024, pasos=200, dt=16):
+    """
+    Compara K objetos Game avanzados uno a uno con un EntornoLote de K
+    partidas avanzado con una llamada a step() por paso.
+
+    Las dos versiones reciben las mismas acciones al azar (una por
+    partida y paso, la mitad de las veces ninguna) y reinician cada
+    partida al terminar.
+
+    Args:
+        partidas (int): Número de partidas simultáneas (K)
+        pasos (int): Pasos simulados
+        dt (int): Milisegundos simulados por paso
+
+    Returns:
+        dict: Pasos de partida por segundo de cada versión
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import numpy as np
+    from entorno import EntornoLote, NINGUNA
+    from game import Game
+
+    rng = random.Random(SEMILLA)
+    opciones = (NINGUNA, NINGUNA, NINGUNA, NINGUNA, IZQUIERDA, DERECHA, ROTAR, CAIDA)
+    acciones = np.array([[rng.choice(opciones) for _ in range(partidas)]
+                         for _ in range(pasos)])
+    entradas = [[() if a == NINGUNA else (a,) for a in fila.tolist()] for fila in acciones]
+    semillas = range(SEMILLA, SEMILLA + partidas)
+
+    def jugar_objetos():
+        for entradas_paso in entradas:
+            for juego, entrada in zip(juegos, entradas_paso):
+                juego.step(entrada, dt)
+                if juego.game_over:
+                    juego.reiniciar()
+
+    def jugar_lote():
+        for acciones_paso in acciones:
+            entorno.step(acciones_paso, dt)
+            if entorno.game_over.any():
+                entorno.reiniciar(entorno.game_over)
+
+    t_objetos = t_lote = float("inf")
+    for _ in range(3):
+        juegos = [Game(semilla=s) for s in semillas]
+        t_objetos = min(t_objetos, _medir(jugar_objetos, 1))
+        entorno = EntornoLote(partidas, semilla=SEMILLA)
+        t_lote = min(t_lote, _medir(jugar_lote, 1))
+
+    return {
+        f"{partidas} objetos Game (pasos/s)": partidas * pasos / t_objetos,
+        f"lote NumPy de {partidas} (pasos/s)": partidas * pasos / t_lote,
+    }
+
+
+def bench_render(frames=600):
+    """
+    Compara el tiempo por frame del dibujo completo y del incremental.
+
+    Usa el driver de vídeo "dummy" de SDL si no hay otro configurado,
+    así que funciona también sin pantalla. Ambas versiones dibujan la
+    misma partida con las mismas entradas.
+
+    Args:
+        frames (int): Número de frames a dibujar
+
+    Returns:
+        dict: Tiempo medio por frame en milisegundos
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from game import Game
+    from main import ANCHO_VENTANA, ALTO_VENTANA, COLOR_FONDO
+    from renderer import Renderer
+
+    pygame.init()
+    pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
+
+    def jugar(dibujar_frame):
+        juego = Game(semilla=SEMILLA)
+        rng = random.Random(SEMILLA)
+        acciones = (juego.mover_izquierda, juego.mover_derecha, juego.rotar)
+        for _ in range(frames):
+            if rng.random() < 0.1:
+                rng.choice(acciones)()
+            if juego.game_over:
+                juego.reiniciar()
+            juego.step((), 16)
+            dibujar_frame(juego)
+
+    def completo(juego):
+        pantalla.fill(COLOR_FONDO)
+        juego.dibujar(pantalla)
+        pygame.display.flip()
+
+    def incremental(juego):
+        rects = renderer.dibujar(pantalla, juego)
+        if rects:
+            pygame.display.update(rects)
+
+    t_completo = _medir(lambda: jugar(completo), 3)
+    t_incremental = float("inf")
+    for _ in range(3):
+        renderer = Renderer(COLOR_FONDO)
+        t_incremental = min(t_incremental, _medir(lambda: jugar(incremental), 1))
+    pygame.quit()
+
+    return {
+        "frame completo + flip (ms)": t_completo / frames * 1e3,
+        "frame incremental + update (ms)": t_incremental / frames * 1e3,
+    }
+
+
+def bench_hud(frames=2000):
+    """
+    Mide el coste por frame de dibujar el panel lateral y los mensajes.
+
+    Se dibuja el HUD durante la partida y con el juego en pausa, que es
+    cuando además se pinta la capa semitransparente.
+
+    Args:
+        frames (int): Número de frames de cada caso
+
+    Returns:
+        dict: Tiempo medio por frame en microsegundos
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from game import Game
+    from main import ANCHO_VENTANA, ALTO_VENTANA
+
+    pygame.init()
+    pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
+    juego = Game(semilla=SEMILLA)
+
+    def dibujar_hud():
+        for _ in range(frames):
+            juego.dibujar_panel(pantalla)
+            juego.dibujar_mensajes(pantalla)
+
+    t_jugando = _medir(dibujar_hud)
+    juego.pausar()
+    t_pausa = _medir(dibujar_hud)
+    pygame.quit()
+
+    return {
+        "HUD jugando (us/frame)": t_jugando / frames * 1e6,
+        "HUD en pausa (us/frame)": t_pausa / frames * 1e6,
+    }
+
+
+def _copiar_filas(tablero):
+    """Copia de referencia: duplica todas las filas (coste O(tablero))."""
+    copia = tablero.copia()
+    copia.colores = [bytes(bytearray(fila)) for fila in tablero.colores]
+    return copia
+
+
+def _arbol_jugadas(tablero, tipos, copiar, nodos):
+    """
+    Recorre todas las colocaciones (rotación, columna, caída) de una
+    secuencia de piezas, como una búsqueda de varias jugadas.
+
+    Args:
+        tablero (Board): Tablero de partida (no se modifica)
+        tipos (tuple): Piezas que se colocan, una por nivel
+        copiar: Función que crea el tablero hijo a partir del padre
+        nodos (list): Se añaden los tableros creados (None = no se guardan)
+
+    Returns:
+        int: Número de nodos del árbol
+    """
+    total = 0
+    resto = tipos[1:]
+    for rotacion, geometria in enumerate(GEOMETRIAS[tipos[0]]):
+        for x in range(-geometria.col_min,
+                       tablero.columnas - geometria.col_min - geometria.ancho + 1):
+            pieza = _pieza(tipos[0], rotacion, x, 0)
+            if not tablero.es_posicion_valida(pieza):
+                continue
+            hijo = copiar(tablero)
+            pieza.y = hijo.fila_caida(pieza)
+            hijo.fijar_pieza(pieza)
+            hijo.limpiar_lineas()
+            if nodos is not None:
+                nodos.append(hijo)
+            total += 1
+            if resto:
+                total += _arbol_jugadas(hijo, resto, copiar, nodos)
+    return total
+
+
+def bench_anticipacion(tipos=("T", "S", "L")):
+    """
+    Compara una búsqueda de 2 y 3 jugadas con copias que comparten las
+    filas (Board.copia) y con copias completas de cada tablero.
+
+    El tiempo se mide sin guardar los nodos; la memoria, guardándolos
+    todos (como haría una búsqueda que conserva el árbol).
+
+    Args:
+        tipos (tuple): Secuencia de piezas de la búsqueda más profunda
+
+    Returns:
+        dict: Nodos, tiempo por búsqueda y memoria por nodo
+    """
+    tablero = tablero_mitad(random.Random(SEMILLA))
+    resultados = {}
+    for profundidad in (2, 3):
+        secuencia = tipos[:profundidad]
+        nombre = f"{profundidad} jugadas"
+        for variante, copiar in (("compartiendo filas", Board.copia),
+                                 ("copiando filas", _copiar_filas)):
+            tiempo = _medir(lambda: _arbol_jugadas(tablero, secuencia, copiar, None),
+                            repeticiones=3)
+            nodos = []
+            gc.collect()
+            tracemalloc.start()
+            antes = tracemalloc.get_traced_memory()[0]
+            total = _arbol_jugadas(tablero, secuencia, copiar, nodos)
+            memoria = tracemalloc.get_traced_memory()[0] - antes
+            tracemalloc.stop()
+            del nodos
+
+            resultados[f"{nombre}, {variante} (ms)"] = tiempo * 1e3
+            resultados[f"{nombre}, {variante} (bytes/nodo)"] = memoria / total
+        resultados[f"{nombre} (nodos)"] = total
+    return resultados
+
+
+def bench_bot(piezas=300):
+    """
+    Mide la velocidad del bot: colocaciones puntuadas y piezas por segundo.
+
+    Args:
+        piezas (int): Número máximo de piezas por partida
+
+    Returns:
+        dict: Rendimiento del bot con y sin anticipar la siguiente pieza
+    """
+    from bot import Bot
+
+    resultados = {}
+    for anticipar in (False, True):
+        nombre = "2 piezas" if anticipar else "1 pieza"
+        mejor = None
+        for _ in range(3):
+            motor = Engine(semilla=SEMILLA)
+            bot = Bot(anticipar=anticipar)
+            inicio = time.perf_counter()
+            jugadas = 0
+            while jugadas < piezas:
+                if motor.game_over:
+                    motor.reiniciar()
+                bot.jugar(motor)
+                jugadas += 1
+            tiempo = time.perf_counter() - inicio
+            if mejor is None or tiempo < mejor[0]:
+                mejor = (tiempo, bot.evaluadas)
+        tiempo, evaluadas = mejor
+        resultados[f"{nombre} (colocaciones/s)"] = evaluadas / tiempo
+        resultados[f"{nombre} (piezas/s)"] = piezas / tiempo
+    return resultados
+
+
+BENCHMARKS = {
+    "nucleo": bench_nucleo,
+    "colision_y_limpieza": bench_colision_y_limpieza,
+    "geometria": bench_geometria,
+    "caida": bench_caida,
+    "busqueda": bench_busqueda,
+    "instantanea": bench_instantanea,
+    "escalado": bench_escalado,
+    "motor": bench_motor,
+    "lote": bench_lote,
+    "render": bench_render,
+    "hud": bench_hud,
+    "anticipacion": bench_anticipacion,
+    "bot": bench_bot,
+}
+
+
+def ejecutar(nombres):
+    """
+    Ejecuta varios benchmarks y muestra sus resultados.
+
+    Args:
+        nombres (iterable): Nombres de BENCHMARKS a ejecutar
+
+    Returns:
+        dict: {benchmark: {métrica: valor}}
+    """
+    resultados = {}
+    for nombre in nombres:
+        print(f"[{nombre}]")
+        resultados[nombre] = BENCHMARKS[nombre]()
+        for metrica, valor in resultados[nombre].items():
+            print(f"  {metrica:<40} {valor:14.3f}")
+    return resultados
+
+
+def comparar(referencia, actuales, umbral=UMBRAL):
+    """
+    Compara unos resultados con los de referencia.
+
+    Una métrica empeora si su valor es peor que el de referencia en más
+    de la fracción umbral (más alto para tiempos, más bajo para las
+    métricas "por segundo" y las mejoras "(veces)").
+
+    Args:
+        referencia (dict): Resultados guardados {benchmark: {métrica: valor}}
+        actuales (dict): Resultados recién medidos, con la misma forma
+        umbral (float): Empeoramiento admitido (0.25 = 25 %)
+
+    Returns:
+        list: Tuplas (benchmark, métrica, referencia, actual, cambio) de
+        las métricas que han empeorado
+    """
+    empeoradas = []
+    for nombre, metricas in referencia.items():
+        for metrica, antes in metricas.items():
+            ahora = actuales.get(nombre, {}).get(metrica)
+            if ahora is None or not antes:
+                continue
+            cambio = ahora / antes - 1
+            if metrica.endswith(UNIDADES_MAYOR_MEJOR):
+                cambio = antes / ahora - 1 if ahora else float("inf")
+            if cambio > umbral:
+                empeoradas.append((nombre, metrica, antes, ahora, cambio))
+    return empeoradas
+
+
+def main():
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmarks del Tetris")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark",
+                        help=f"Benchmarks a ejecutar: {', '.join(BENCHMARKS)} "
+                             "(por defecto, todos)")
+    parser.add_argument("--guardar", metavar="JSON",
+                        help="Guardar los resultados como referencia")
+    parser.add_argument("--comparar", metavar="JSON",
+                        help="Comparar con una referencia y fallar si algo empeora")
+    parser.add_argument("--umbral", type=float, default=UMBRAL,
+                        help="Empeoramiento admitido al comparar (0.25 = 25 %%)")
+    args = parser.parse_args()
+    for nombre in args.benchmarks:
+        if nombre not in BENCHMARKS:
+            parser.error(f"benchmark desconocido: {nombre}")
+
+    referencia = None
+    nombres = args.benchmarks or list(BENCHMARKS)
+    if args.comparar:
+        with open(args.comparar) as fichero:
+            referencia = json.load(fichero)["resultados"]
+        if not args.benchmarks:
+            nombres = [n for n in referencia if n in BENCHMARKS]
+
+    resultados = ejecutar(nombres)
+
+    if args.guardar:
+        with open(args.guardar, "w") as fichero:
+            json.dump({
+                "python": platform.python_version(),
+                "maquina": platform.machine(),
+                "semilla": SEMILLA,
+                "resultados": resultados,
+            }, fichero, indent=2)
+
+    if referencia is not None:
+        empeoradas = comparar(referencia, resultados, args.umbral)
+        for nombre, metrica, antes, ahora, cambio in empeoradas:
+            print(f"EMPEORA [{nombre}] {metrica}: {antes:.3f} -> {ahora:.3f} "
+                  f"({cambio:+.0%})")
+        if empeoradas:
+            sys.exit(1)
+        print(f"Sin empeoramientos de más del {args.umbral:.0%}")
+
+
+if __name__ == "__main__":
+    main()
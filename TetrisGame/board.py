@@ -5,13 +5,16 @@ Este módulo contiene la clase Board que representa el tablero de juego.
 El tablero es una matriz donde se almacenan las piezas que ya han caído.
 """
 
-import pygame
+from tetromino import COLORES
 
 # =============================================================================
 # CONSTANTES DEL TABLERO
 # =============================================================================
-COLUMNAS = 10          # Número de columnas del tablero
-FILAS = 20             # Número de filas del tablero
+COLUMNAS = 10          # Número de columnas del tablero (por defecto)
+FILAS = 20             # Número de filas del tablero (por defecto)
+TAMANO_MINIMO = 4      # Columnas y filas mínimas (lo que mide la pieza I)
+COLUMNAS_VISIBLES = 10 # Columnas que caben en la ventana
+FILAS_VISIBLES = 20    # Filas que caben en la ventana
 TAMANO_CELDA = 30      # Tamaño de cada celda en píxeles
 MARGEN_X = 50          # Margen izquierdo del tablero en la pantalla
 MARGEN_Y = 10          # Margen superior del tablero en la pantalla
@@ -20,27 +23,152 @@ MARGEN_Y = 10          # Margen superior del tablero en la pantalla
 COLOR_BORDE = (100, 100, 100)     # Gris para el borde de las celdas
 COLOR_VACIO = (30, 30, 40)        # Gris oscuro para celdas vacías
 COLOR_LINEA = (50, 50, 60)        # Color de las líneas de la cuadrícula
+COLOR_BASURA = (120, 120, 120)    # Gris para las líneas de basura (versus)
+
+# =============================================================================
+# PALETA DE COLORES DEL PLANO DE DIBUJO
+# =============================================================================
+# El índice 0 es la celda vacía. Los colores de las piezas se registran
+# en un orden fijo; cualquier otro color se añade la primera vez que se usa.
+PALETA = [None] + list(COLORES.values())
+_INDICES_PALETA = {color: i for i, color in enumerate(PALETA)}
+
+
+def indice_color(color):
+    """
+    Obtiene el índice de un color en la PALETA, registrándolo si es nuevo.
+    
+    Args:
+        color (tuple): Color RGB (o None para una celda vacía)
+        
+    Returns:
+        int: Índice del color en la PALETA (0-255)
+    """
+    indice = _INDICES_PALETA.get(color)
+    if indice is None:
+        indice = len(PALETA)
+        if indice > 255:
+            raise ValueError("La paleta del tablero admite 255 colores como máximo")
+        PALETA.append(color)
+        _INDICES_PALETA[color] = indice
+    return indice
 
 
 class Board:
     """
     Clase que representa el tablero del juego Tetris.
     
-    El tablero es una matriz de FILAS x COLUMNAS donde cada celda
-    puede estar vacía (None) o contener un color (tupla RGB).
+    El tablero es una matriz de filas x columnas (por defecto FILAS x
+    COLUMNAS, pero admite miles de filas y columnas). La ocupación se guarda
+    como un entero por fila (bitboard): el bit c de ``filas_bits[f]``
+    vale 1 si la celda (c, f) tiene un bloque. Así una colisión se
+    comprueba con unos pocos AND y una fila completa con una sola
+    comparación.
+    
+    Los colores se guardan aparte, en un plano compacto de índices de
+    paleta (un ``bytes`` por fila) que solo se usa para dibujar.
+    
+    Las filas nunca se modifican: al cambiar una se sustituye por otra.
+    Así copia() solo copia las listas de filas y la copia comparte con
+    el original todas las filas que ninguno de los dos cambie después
+    (copy-on-write), lo que permite explorar árboles de jugadas sin
+    copiar el tablero entero en cada nodo.
+    
+    Además se mantiene la altura de la superficie de cada columna, que
+    se actualiza al fijar piezas y al limpiar líneas. Con ella la fila
+    donde aterriza una pieza se calcula mirando solo sus columnas.
+    
+    Si el tablero es más grande que la ventana solo se dibuja una vista
+    de COLUMNAS_VISIBLES x FILAS_VISIBLES celdas alrededor de la pieza.
     
     Atributos:
-        grid (list): Matriz 2D que almacena el estado del tablero
+        filas_bits (list): Un entero por fila con las celdas ocupadas
+        colores (list): Un bytes por fila con índices de PALETA
+        fila_vacia (bytes): Fila de colores sin bloques (compartida)
+        alturas (list): Altura de cada columna (0 = vacía, filas = llena
+            hasta arriba)
         columnas (int): Número de columnas
         filas (int): Número de filas
     """
 
-    def __init__(self):
-        """Inicializa un tablero vacío."""
-        self.columnas = COLUMNAS
-        self.filas = FILAS
-        # Crear matriz vacía (None indica celda vacía)
-        self.grid = [[None for _ in range(COLUMNAS)] for _ in range(FILAS)]
+    __slots__ = ('columnas', 'filas', 'fila_llena', 'fila_vacia',
+                 'filas_bits', 'colores', 'alturas', '_tocadas')
+
+    def __init__(self, columnas=COLUMNAS, filas=FILAS):
+        """
+        Inicializa un tablero vacío.
+        
+        Args:
+            columnas (int): Número de columnas
+            filas (int): Número de filas
+            
+        Raises:
+            ValueError: Si el tablero es demasiado pequeño para las piezas
+        """
+        if columnas < TAMANO_MINIMO or filas < TAMANO_MINIMO:
+            raise ValueError(
+                f"El tablero debe tener al menos {TAMANO_MINIMO} columnas y filas"
+            )
+        self.columnas = columnas
+        self.filas = filas
+        # Máscara de una fila completa (todos los bits a 1)
+        self.fila_llena = (1 << columnas) - 1
+        # Fila de colores vacía, compartida por todas las filas vacías
+        self.fila_vacia = bytes(columnas)
+        self.reiniciar()
+
+    @property
+    def grid(self):
+        """
+        Vista del tablero como matriz de colores, solo de lectura.
+        
+        Se construye bajo demanda a partir del plano de colores; cada
+        celda es None (vacía) o una tupla RGB. Es una tupla de tuplas, así
+        que escribir en ella (``grid[f][c] = color``) lanza TypeError en
+        lugar de cambiar una copia sin avisar: para escribir una celda se
+        usa poner_celda().
+        
+        Returns:
+            tuple: Matriz filas x columnas con los colores de las celdas
+        """
+        return tuple(tuple(PALETA[i] for i in fila) for fila in self.colores)
+
+    def poner_celda(self, columna, fila, color):
+        """
+        Escribe una celda del tablero (lo que antes era ``grid[fila][columna] = color``).
+        
+        Mantiene al día el bitboard, el plano de colores y la altura de la
+        columna, y anota la fila como tocada para que limpiar_lineas la
+        compruebe.
+        
+        Args:
+            columna (int): Columna de la celda
+            fila (int): Fila de la celda
+            color (tuple): Color RGB, o None para vaciarla
+            
+        Raises:
+            IndexError: Si la celda está fuera del tablero
+        """
+        if not (0 <= columna < self.columnas and 0 <= fila < self.filas):
+            raise IndexError(f"Celda fuera del tablero: ({columna}, {fila})")
+        bit = 1 << columna
+        # La fila de colores se sustituye, no se modifica (ver copia())
+        colores = bytearray(self.colores[fila])
+        if color is None:
+            self.filas_bits[fila] &= ~bit
+            colores[columna] = 0
+            if self.alturas[columna] == self.filas - fila:
+                self._recalcular_alturas(bit, fila)
+        else:
+            self.filas_bits[fila] |= bit
+            colores[columna] = indice_color(color)
+            if self.filas - fila > self.alturas[columna]:
+                self.alturas[columna] = self.filas - fila
+        self.colores[fila] = bytes(colores)
+        if self._tocadas is None:
+            self._tocadas = (fila, fila + 1)
+        else:
+            self._tocadas = (min(fila, self._tocadas[0]), max(fila + 1, self._tocadas[1]))
 
     def es_posicion_valida(self, tetromino):
         """
@@ -56,61 +184,240 @@ class Board:
         Returns:
             bool: True si la posición es válida, False en caso contrario
         """
-        for x, y in tetromino.obtener_bloques():
-            # Verificar límites horizontales
-            if x < 0 or x >= self.columnas:
-                return False
-            # Verificar límite inferior
-            if y >= self.filas:
-                return False
-            # Verificar colisión con bloques existentes (solo si y >= 0)
-            if y >= 0 and self.grid[y][x] is not None:
+        col_min, ancho, fila_min, mascaras = tetromino.geometria.mascara
+        x = tetromino.x + col_min
+        y = tetromino.y + fila_min
+        # Verificar límites horizontales e inferior
+        if x < 0 or x + ancho > self.columnas:
+            return False
+        if y + len(mascaras) > self.filas:
+            return False
+        # Verificar colisión con bloques existentes (solo si y >= 0)
+        filas_bits = self.filas_bits
+        for mascara in mascaras:
+            if y >= 0 and filas_bits[y] & (mascara << x):
                 return False
+            y += 1
         return True
 
+    def fila_caida(self, tetromino):
+        """
+        Calcula la fila en la que aterrizaría el tetrominó al caer en vertical.
+        
+        Si la pieza está por encima de la superficie en todas sus columnas,
+        basta con comparar el perfil inferior de la pieza con la altura de
+        cada columna (coste proporcional al ancho de la pieza). Si está
+        debajo de un saliente se recurre a bajarla fila a fila.
+        
+        Args:
+            tetromino: La pieza que cae (no se modifica)
+            
+        Returns:
+            int: Valor de ``tetromino.y`` en la última posición válida
+        """
+        geometria = tetromino.geometria
+        x = tetromino.x + geometria.col_min
+        if x < 0 or x + geometria.ancho > self.columnas:
+            return self._fila_caida_lenta(tetromino)
+
+        y = tetromino.y
+        filas = self.filas
+        alturas = self.alturas
+        destino = filas
+        for i, dy in enumerate(geometria.perfil_inferior):
+            cima = filas - alturas[x + i]
+            if y + dy >= cima:
+                # La pieza está a la altura de la superficie o por debajo
+                return self._fila_caida_lenta(tetromino)
+            if cima - dy - 1 < destino:
+                destino = cima - dy - 1
+        return destino
+
+    def _fila_caida_lenta(self, tetromino):
+        """Busca la fila de aterrizaje bajando la pieza de una en una."""
+        inicial = tetromino.y
+        while self.es_posicion_valida(tetromino):
+            tetromino.y += 1
+        destino = tetromino.y - 1
+        tetromino.y = inicial
+        return destino
+
     def fijar_pieza(self, tetromino):
         """
         Fija un tetrominó en el tablero.
         
-        Coloca los bloques de la pieza en la matriz del tablero,
-        guardando su color en las posiciones correspondientes.
+        Marca los bloques de la pieza en el bitboard, guarda el índice
+        de su color en el plano de colores y sube la altura de las
+        columnas que toca. También anota qué filas ha tocado, que son
+        las únicas que limpiar_lineas tiene que comprobar.
         
         Args:
             tetromino: La pieza a fijar en el tablero
         """
-        for x, y in tetromino.obtener_bloques():
-            if 0 <= y < self.filas and 0 <= x < self.columnas:
-                self.grid[y][x] = tetromino.color
+        indice = indice_color(tetromino.color)
+        px = tetromino.x
+        py = tetromino.y
+        filas = self.filas
+        columnas = self.columnas
+        alturas = self.alturas
+        filas_bits = self.filas_bits
+        colores = self.colores
+        for dy, dxs in tetromino.geometria.filas_bloques:
+            y = py + dy
+            if 0 <= y < filas:
+                # La fila de colores se sustituye, no se modifica (ver copia())
+                bits = filas_bits[y]
+                fila = bytearray(colores[y])
+                for dx in dxs:
+                    x = px + dx
+                    if 0 <= x < columnas:
+                        bits |= 1 << x
+                        fila[x] = indice
+                        if filas - y > alturas[x]:
+                            alturas[x] = filas - y
+                filas_bits[y] = bits
+                colores[y] = bytes(fila)
+
+        geometria = tetromino.geometria
+        inicio = max(0, py + geometria.fila_min)
+        fin = min(filas, py + geometria.fila_min + geometria.alto)
+        if inicio < fin:
+            if self._tocadas is not None:
+                inicio = min(inicio, self._tocadas[0])
+                fin = max(fin, self._tocadas[1])
+            self._tocadas = (inicio, fin)
 
     def limpiar_lineas(self):
         """
         Elimina las líneas completas del tablero.
         
-        Una línea está completa cuando todas sus celdas tienen un bloque.
-        Las líneas superiores caen para ocupar el espacio vacío.
+        Solo se comprueban las filas tocadas al fijar piezas desde la
+        última limpieza. Si hay líneas completas, el tablero se compacta
+        en una sola pasada de abajo arriba: cada fila incompleta se mueve
+        directamente a su sitio final, y el recorrido termina en la fila
+        más alta con bloques. El coste depende de la altura de la pila,
+        no del tamaño del tablero ni del número de líneas.
+        
+        Una fila llena ocupa todas las columnas, así que ninguna columna
+        tiene bloques por encima de la fila llena más alta: cada columna
+        baja tantas filas como líneas se eliminan, salvo las que tenían
+        su bloque más alto en una línea eliminada, que se recalculan.
         
         Returns:
             int: Número de líneas eliminadas
         """
-        lineas_eliminadas = 0
-        fila = self.filas - 1  # Empezar desde abajo
-        
-        while fila >= 0:
-            # Verificar si la fila está completa
-            if all(celda is not None for celda in self.grid[fila]):
-                lineas_eliminadas += 1
-                # Mover todas las filas superiores hacia abajo
-                for f in range(fila, 0, -1):
-                    self.grid[f] = self.grid[f - 1].copy()
-                # Crear nueva fila vacía arriba
-                self.grid[0] = [None for _ in range(self.columnas)]
-                # No decrementar fila para verificar la misma posición
-                # (podría haber otra línea completa que bajó)
+        if self._tocadas is None:
+            return 0
+        inicio, fin = self._tocadas
+        self._tocadas = None
+
+        llena = self.fila_llena
+        filas_bits = self.filas_bits
+        completas = [f for f in range(inicio, fin) if filas_bits[f] == llena]
+        if not completas:
+            return 0
+        lineas_eliminadas = len(completas)
+
+        filas = self.filas
+        alturas = self.alturas
+        cima = filas - max(alturas)
+        # Columnas cuyo bloque más alto está en una línea eliminada
+        recalcular = 0
+        for col in range(self.columnas):
+            if filas_bits[filas - alturas[col]] == llena:
+                recalcular |= 1 << col
             else:
-                fila -= 1
-        
+                alturas[col] -= lineas_eliminadas
+
+        # Compactar de abajo arriba desde la línea completa más baja
+        colores = self.colores
+        destino = completas[-1]
+        for origen in range(destino, cima - 1, -1):
+            bits = filas_bits[origen]
+            if bits != llena:
+                filas_bits[destino] = bits
+                colores[destino] = colores[origen]
+                destino -= 1
+        for fila in range(cima, destino + 1):
+            filas_bits[fila] = 0
+            colores[fila] = self.fila_vacia
+
+        if recalcular:
+            self._recalcular_alturas(recalcular, cima)
         return lineas_eliminadas
 
+    def _recalcular_alturas(self, columnas, desde):
+        """
+        Recalcula la altura de varias columnas en una pasada de arriba abajo.
+        
+        Args:
+            columnas (int): Máscara de bits de las columnas a recalcular
+            desde (int): Primera fila que puede tener bloques
+        """
+        alturas = self.alturas
+        filas_bits = self.filas_bits
+        for fila in range(desde, self.filas):
+            encontradas = filas_bits[fila] & columnas
+            if encontradas:
+                columnas ^= encontradas
+                while encontradas:
+                    bit = encontradas & -encontradas
+                    alturas[bit.bit_length() - 1] = self.filas - fila
+                    encontradas ^= bit
+                if not columnas:
+                    return
+        # Las columnas que quedan están vacías
+        while columnas:
+            bit = columnas & -columnas
+            alturas[bit.bit_length() - 1] = 0
+            columnas ^= bit
+
+    def agregar_basura(self, lineas, hueco):
+        """
+        Sube todo el tablero y añade líneas de basura abajo (modo versus).
+        
+        Cada línea de basura está llena salvo en la columna del hueco, así
+        que se puede eliminar metiendo una pieza por él.
+        
+        Args:
+            lineas (int): Número de líneas de basura
+            hueco (int): Columna que queda vacía en todas ellas
+            
+        Returns:
+            bool: True si algún bloque se ha salido por arriba
+        """
+        if lineas <= 0:
+            return False
+        lineas = min(lineas, self.filas)
+        filas = self.filas
+        desbordado = any(self.filas_bits[:lineas])
+
+        bits = self.fila_llena & ~(1 << hueco)
+        plantilla = bytearray([indice_color(COLOR_BASURA)]) * self.columnas
+        plantilla[hueco] = 0
+        self.filas_bits = self.filas_bits[lineas:] + [bits] * lineas
+        self.colores = self.colores[lineas:] + [bytes(plantilla)] * lineas
+
+        # Cada columna sube tantas filas como líneas; las que se salen por
+        # arriba se recalculan
+        alturas = self.alturas
+        recalcular = 0
+        for col in range(self.columnas):
+            if alturas[col] == 0:
+                alturas[col] = 0 if col == hueco else lineas
+            elif alturas[col] + lineas > filas:
+                recalcular |= 1 << col
+            else:
+                alturas[col] += lineas
+        if recalcular:
+            self._recalcular_alturas(recalcular, 0)
+
+        if self._tocadas is not None:
+            inicio, fin = self._tocadas
+            inicio, fin = max(0, inicio - lineas), max(0, fin - lineas)
+            self._tocadas = (inicio, fin) if inicio < fin else None
+        return desbordado
+
     def esta_lleno(self):
         """
         Verifica si el tablero está lleno (game over).
@@ -120,46 +427,138 @@ class Board:
         Returns:
             bool: True si hay bloques en la fila 0, False en caso contrario
         """
-        return any(celda is not None for celda in self.grid[0])
+        return self.filas_bits[0] != 0
 
     def reiniciar(self):
         """Limpia el tablero para empezar una nueva partida."""
-        self.grid = [[None for _ in range(self.columnas)] for _ in range(self.filas)]
+        self.filas_bits = [0] * self.filas
+        self.colores = [self.fila_vacia] * self.filas
+        self.alturas = [0] * self.columnas
+        # Filas tocadas desde la última limpieza (inicio, fin) o None
+        self._tocadas = None
+
+    def copia(self):
+        """
+        Crea una copia del tablero que comparte las filas con este.
+        
+        Solo se copian las listas (una referencia por fila y la altura de
+        cada columna), no el contenido de las filas. Como las filas nunca
+        se modifican, la copia y el original pueden seguir jugando por
+        separado.
+        
+        Returns:
+            Board: Tablero con el mismo contenido
+        """
+        copia = Board.__new__(Board)
+        copia.columnas = self.columnas
+        copia.filas = self.filas
+        copia.fila_llena = self.fila_llena
+        copia.fila_vacia = self.fila_vacia
+        copia.filas_bits = self.filas_bits[:]
+        copia.colores = self.colores[:]
+        copia.alturas = self.alturas[:]
+        copia._tocadas = self._tocadas
+        return copia
+
+    def restaurar(self, otro):
+        """
+        Pone este tablero en el estado de otro del mismo tamaño (por
+        ejemplo, una copia guardada antes), compartiendo sus filas.
+        
+        Args:
+            otro (Board): Tablero del que se copia el estado
+        """
+        self.filas_bits = otro.filas_bits[:]
+        self.colores = otro.colores[:]
+        self.alturas = otro.alturas[:]
+        self._tocadas = otro._tocadas
 
-    def dibujar(self, pantalla, pieza_actual=None):
+    def vista(self, pieza=None):
+        """
+        Calcula la parte del tablero que se ve en la ventana.
+        
+        Si el tablero cabe entero se ve entero. Si no, la vista se centra
+        en la pieza (sin salirse del tablero).
+        
+        Args:
+            pieza: Tetrominó en el que centrar la vista (opcional)
+            
+        Returns:
+            tuple: (columna inicial, fila inicial, columnas, filas)
+        """
+        ancho = min(self.columnas, COLUMNAS_VISIBLES)
+        alto = min(self.filas, FILAS_VISIBLES)
+        col0 = fila0 = 0
+        if pieza is not None:
+            if ancho < self.columnas:
+                col0 = pieza.x + TAMANO_MINIMO // 2 - ancho // 2
+                col0 = max(0, min(col0, self.columnas - ancho))
+            if alto < self.filas:
+                fila0 = pieza.y + TAMANO_MINIMO // 2 - alto // 2
+                fila0 = max(0, min(fila0, self.filas - alto))
+        return col0, fila0, ancho, alto
+
+    def dibujar(self, pantalla, pieza_actual=None, fantasma=True):
         """
         Dibuja el tablero y la pieza actual en la pantalla.
         
+        Si se indica la pieza actual, también se dibuja su sombra
+        (fantasma): el contorno de la posición donde aterrizaría. Solo
+        se dibujan las celdas de la vista (ver vista()).
+        
         Args:
             pantalla: Superficie de Pygame donde dibujar
             pieza_actual: Tetrominó actual en juego (opcional)
+            fantasma (bool): Dibujar la sombra de la pieza actual
         """
-        # Dibujar cada celda del tablero
-        for fila in range(self.filas):
-            for col in range(self.columnas):
-                # Calcular posición en píxeles
-                x = MARGEN_X + col * TAMANO_CELDA
-                y = MARGEN_Y + fila * TAMANO_CELDA
-                
+        # Pygame solo se importa al dibujar: la lógica del tablero
+        # funciona sin pantalla (ver engine.py)
+        import pygame
+
+        col0, fila0, ancho, alto = self.vista(pieza_actual)
+
+        def rect_celda(col, fila):
+            """Rectángulo en pantalla de una celda, o None si no se ve."""
+            col -= col0
+            fila -= fila0
+            if 0 <= col < ancho and 0 <= fila < alto:
+                return pygame.Rect(
+                    MARGEN_X + col * TAMANO_CELDA,
+                    MARGEN_Y + fila * TAMANO_CELDA,
+                    TAMANO_CELDA, TAMANO_CELDA
+                )
+            return None
+
+        # Dibujar cada celda visible del tablero
+        for fila in range(fila0, fila0 + alto):
+            colores = self.colores[fila]
+            for col in range(col0, col0 + ancho):
                 # Obtener color de la celda
-                color = self.grid[fila][col]
+                color = PALETA[colores[col]]
                 if color is None:
                     color = COLOR_VACIO
                 
                 # Dibujar celda rellena
-                rect = pygame.Rect(x, y, TAMANO_CELDA, TAMANO_CELDA)
+                rect = rect_celda(col, fila)
                 pygame.draw.rect(pantalla, color, rect)
                 
                 # Dibujar borde de la celda
                 pygame.draw.rect(pantalla, COLOR_LINEA, rect, 1)
         
+        # Dibujar la sombra donde aterrizaría la pieza actual
+        if pieza_actual and fantasma:
+            fila = self.fila_caida(pieza_actual)
+            for dx, dy in pieza_actual.geometria.bloques:
+                rect = rect_celda(pieza_actual.x + dx, fila + dy)
+                if rect is not None:
+                    pygame.draw.rect(pantalla, pieza_actual.color, rect, 2)
+
         # Dibujar la pieza actual si existe
         if pieza_actual:
-            for bx, by in pieza_actual.obtener_bloques():
-                if by >= 0:  # Solo dibujar si está dentro del área visible
-                    x = MARGEN_X + bx * TAMANO_CELDA
-                    y = MARGEN_Y + by * TAMANO_CELDA
-                    rect = pygame.Rect(x, y, TAMANO_CELDA, TAMANO_CELDA)
+            for dx, dy in pieza_actual.geometria.bloques:
+                # Solo dibujar si está dentro del área visible
+                rect = rect_celda(pieza_actual.x + dx, pieza_actual.y + dy)
+                if rect is not None:
                     pygame.draw.rect(pantalla, pieza_actual.color, rect)
                     pygame.draw.rect(pantalla, COLOR_BORDE, rect, 2)
 
@@ -167,7 +566,7 @@ class Board:
         borde = pygame.Rect(
             MARGEN_X - 2,
             MARGEN_Y - 2,
-            self.columnas * TAMANO_CELDA + 4,
-            self.filas * TAMANO_CELDA + 4
+            ancho * TAMANO_CELDA + 4,
+            alto * TAMANO_CELDA + 4
         )
         pygame.draw.rect(pantalla, (200, 200, 200), borde, 3)
@@ -0,0 +1,270 @@
+"""
+bot.py - Jugador automático del Tetris
+
+Este módulo contiene la clase Bot, que juega solo probando todas las
+colocaciones posibles de la pieza actual: cada rotación en cada columna,
+dejándola caer hasta el fondo (hard drop). Opcionalmente también prueba
+todas las colocaciones de la siguiente pieza sobre cada resultado.
+
+Para que sea rápido, todos los tableros candidatos se construyen y se
+puntúan a la vez con NumPy. Las características que se puntúan son las
+clásicas:
+- lineas: líneas completas que se eliminan
+- altura: suma de las alturas de las columnas
+- huecos: celdas vacías con algún bloque encima
+- irregularidad: suma de las diferencias de altura entre columnas vecinas
+"""
+
+import numpy as np
+
+from engine import IZQUIERDA, DERECHA, ROTAR, CAIDA
+from tetromino import GEOMETRIAS
+
+# =============================================================================
+# PESOS DE LA HEURÍSTICA
+# =============================================================================
+# Pesos de cada característica (positivo = bueno, negativo = malo)
+PESOS_DEFECTO = {
+    'lineas': 0.760666,
+    'altura': -0.510066,
+    'huecos': -0.35663,
+    'irregularidad': -0.184483,
+}
+
+# Puntuación de una colocación que deja a la siguiente pieza sin sitio
+PUNTUACION_PERDIDA = -1e9
+
+# Tablas de colocaciones ya calculadas, por (tipo, columnas)
+_TABLAS = {}
+
+
+def tablero_a_array(tablero):
+    """
+    Convierte un Board en una matriz booleana de NumPy.
+
+    Args:
+        tablero (Board): Tablero a convertir
+
+    Returns:
+        np.ndarray: Matriz (filas, columnas) con True en las celdas ocupadas
+    """
+    plano = np.frombuffer(b"".join(tablero.colores), dtype=np.uint8)
+    return plano.reshape(tablero.filas, tablero.columnas) != 0
+
+
+def tabla_colocaciones(tipo, columnas):
+    """
+    Obtiene todas las colocaciones (rotación, x) de un tipo de pieza.
+
+    Args:
+        tipo (str): Tipo de pieza
+        columnas (int): Número de columnas del tablero
+
+    Returns:
+        tuple: (rotaciones, xs, cols, dys). rotaciones y xs tienen una
+        entrada por colocación; cols y dys son matrices (M, 4) con la
+        columna absoluta y la fila relativa de cada bloque
+    """
+    clave = (tipo, columnas)
+    tabla = _TABLAS.get(clave)
+    if tabla is None:
+        rotaciones, xs, cols, dys = [], [], [], []
+        for rotacion, geometria in enumerate(GEOMETRIAS[tipo]):
+            inicio = -geometria.col_min
+            fin = columnas - geometria.col_min - geometria.ancho
+            for x in range(inicio, fin + 1):
+                rotaciones.append(rotacion)
+                xs.append(x)
+                cols.append([x + dx for dx, _ in geometria.bloques])
+                dys.append([dy for _, dy in geometria.bloques])
+        tabla = (np.array(rotaciones), np.array(xs),
+                 np.array(cols), np.array(dys))
+        _TABLAS[clave] = tabla
+    return tabla
+
+
+def colocar(tableros, tipo, y_inicial=0):
+    """
+    Deja caer un tipo de pieza en todas sus colocaciones sobre cada tablero.
+
+    La pieza cae desde y_inicial en línea recta. Una colocación es
+    válida si la pieza cabe en y_inicial, igual que exige el juego al
+    hacer una caída instantánea.
+
+    Args:
+        tableros (np.ndarray): Matriz (B, filas, columnas) de booleanos
+        tipo (str): Tipo de pieza
+        y_inicial (int): Fila desde la que cae la pieza
+
+    Returns:
+        tuple: (nuevos, validas) con nuevos de forma (B, M, filas,
+        columnas) y validas de forma (B, M)
+    """
+    num, filas, columnas = tableros.shape
+    _, _, cols, dys = tabla_colocaciones(tipo, columnas)
+
+    # Fila del bloque más alto de cada columna (filas si está vacía)
+    ocupada = tableros.any(axis=1)
+    cima = np.where(ocupada, tableros.argmax(axis=1), filas)
+
+    # Cada bloque puede bajar hasta justo encima de la cima de su columna
+    limites = cima[:, cols] - dys - 1            # (B, M, 4)
+    destino = limites.min(axis=2)                # (B, M)
+    validas = destino >= y_inicial
+    destino = np.where(validas, destino, 0)
+
+    nuevos = np.repeat(tableros[:, None], len(cols), axis=1)
+    b = np.arange(num)[:, None, None]
+    m = np.arange(len(cols))[None, :, None]
+    nuevos[b, m, destino[:, :, None] + dys, cols] = True
+    return nuevos, validas
+
+
+def evaluar(tableros):
+    """
+    Elimina las líneas completas y calcula las características de cada tablero.
+
+    Args:
+        tableros (np.ndarray): Matriz (N, filas, columnas) de booleanos
+
+    Returns:
+        tuple: (limpios, lineas, altura, huecos, irregularidad), donde
+        limpios son los tableros sin las líneas completas y el resto son
+        vectores de longitud N
+    """
+    num, filas, _ = tableros.shape
+
+    # Líneas completas: se mueven arriba (orden estable) y se vacían
+    llenas = tableros.all(axis=2)
+    lineas = llenas.sum(axis=1)
+    if lineas.any():
+        orden = np.argsort(~llenas, axis=1, kind='stable')
+        tableros = np.take_along_axis(tableros, orden[:, :, None], axis=1)
+        tableros[np.arange(filas)[None, :] < lineas[:, None]] = False
+
+    ocupada = tableros.any(axis=1)
+    alturas = np.where(ocupada, filas - tableros.argmax(axis=1), 0)
+    altura = alturas.sum(axis=1)
+    irregularidad = np.abs(np.diff(alturas, axis=1)).sum(axis=1)
+
+    # Un hueco es una celda vacía con algún bloque por encima
+    tapadas = np.logical_or.accumulate(tableros, axis=1)
+    huecos = (tapadas & ~tableros).sum(axis=(1, 2))
+
+    return tableros, lineas, altura, huecos, irregularidad
+
+
+class Bot:
+    """
+    Clase que elige y ejecuta la mejor colocación de cada pieza.
+
+    Atributos:
+        pesos (dict): Peso de cada característica de la heurística
+        anticipar (bool): Si es True también prueba la siguiente pieza
+        evaluadas (int): Número total de colocaciones puntuadas
+    """
+
+    def __init__(self, pesos=None, anticipar=False):
+        """
+        Inicializa el bot.
+
+        Args:
+            pesos (dict, opcional): Pesos de la heurística. Por defecto
+                PESOS_DEFECTO
+            anticipar (bool): Probar también la siguiente pieza
+        """
+        self.pesos = dict(PESOS_DEFECTO if pesos is None else pesos)
+        self.anticipar = anticipar
+        self.evaluadas = 0
+
+    def _puntuar(self, lineas, altura, huecos, irregularidad):
+        """Combina las características con los pesos del bot."""
+        pesos = self.pesos
+        return (pesos['lineas'] * lineas
+                + pesos['altura'] * altura
+                + pesos['huecos'] * huecos
+                + pesos['irregularidad'] * irregularidad)
+
+    def elegir(self, juego):
+        """
+        Elige la mejor colocación para la pieza actual.
+
+        Args:
+            juego (Engine): Partida en curso
+
+        Returns:
+            tuple: (rotacion, x) de la mejor colocación, o None si la
+            pieza no cabe en ninguna columna
+        """
+        pieza = juego.pieza_actual
+        tablero = tablero_a_array(juego.tablero)[None]
+        rotaciones, xs, _, _ = tabla_colocaciones(pieza.tipo, juego.tablero.columnas)
+
+        nuevos, validas = colocar(tablero, pieza.tipo, pieza.y)
+        nuevos, validas = nuevos[0], validas[0]
+        limpios, lineas, altura, huecos, irregularidad = evaluar(nuevos)
+        puntos = self._puntuar(lineas, altura, huecos, irregularidad)
+        self.evaluadas += len(puntos)
+
+        if self.anticipar:
+            siguiente = juego.siguiente_pieza
+            nuevos2, validas2 = colocar(limpios, siguiente.tipo, siguiente.y)
+            filas, columnas = limpios.shape[1:]
+            _, lineas2, altura2, huecos2, irregularidad2 = evaluar(
+                nuevos2.reshape(-1, filas, columnas)
+            )
+            puntos2 = self._puntuar(
+                lineas2.reshape(validas2.shape) + lineas[:, None],
+                altura2.reshape(validas2.shape),
+                huecos2.reshape(validas2.shape),
+                irregularidad2.reshape(validas2.shape),
+            )
+            self.evaluadas += puntos2.size
+            puntos2 = np.where(validas2, puntos2, PUNTUACION_PERDIDA)
+            puntos = puntos2.max(axis=1)
+
+        puntos = np.where(validas, puntos, -np.inf)
+        mejor = int(puntos.argmax())
+        if not validas[mejor]:
+            return None
+        return int(rotaciones[mejor]), int(xs[mejor])
+
+    def jugar(self, juego):
+        """
+        Coloca la pieza actual usando las mismas acciones que un jugador.
+
+        Rota la pieza, la desplaza hasta la columna elegida y hace una
+        caída instantánea, todo a través de step() (así queda grabado si
+        la partida se está grabando). Los giros pueden desplazar la pieza
+        (wall kick), así que el desplazamiento se calcula después de rotar.
+
+        Args:
+            juego (Engine): Partida en curso
+
+        Returns:
+            list: Códigos de acción aplicados (ROTAR, IZQUIERDA, ...)
+        """
+        eleccion = self.elegir(juego)
+        if eleccion is None:
+            juego.step((CAIDA,))
+            return [CAIDA]
+
+        rotacion, x = eleccion
+        pieza = juego.pieza_actual
+        acciones = []
+        giros = (rotacion - pieza.rotacion_actual) % len(pieza.geometrias)
+        for _ in range(giros):
+            juego.step((ROTAR,))
+            acciones.append(ROTAR)
+
+        while juego.pieza_actual.x != x:
+            anterior = juego.pieza_actual.x
+            accion = DERECHA if anterior < x else IZQUIERDA
+            juego.step((accion,))
+            acciones.append(accion)
+            if juego.pieza_actual.x == anterior:
+                break  # Bloqueada por el camino
+
+        juego.step((CAIDA,))
+        acciones.append(CAIDA)
+        return acciones
@@ -0,0 +1,63 @@
+"""
+bucle.py - Paso fijo de la lógica del juego
+
+El bucle principal dibuja a la velocidad que puede (como máximo FPS),
+pero la lógica avanza siempre en pasos de la misma duración. Este módulo
+contiene la clase PasoFijo, que acumula el tiempo real transcurrido y
+dice cuántos pasos de lógica hay que ejecutar en cada frame.
+
+Si un frame llega muy tarde (equipo sobrecargado) no se ejecutan cientos
+de pasos seguidos: a partir de max_pasos el tiempo restante se agrupa en
+un último paso más largo. El motor aplica en ese paso todas las caídas
+automáticas que tocaban, así que la gravedad no se ralentiza aunque
+bajen los FPS.
+"""
+
+# =============================================================================
+# CONSTANTES DEL PASO FIJO
+# =============================================================================
+PASO_LOGICA = 10     # Milisegundos por paso de lógica (100 pasos por segundo)
+MAX_PASOS = 25       # Pasos por frame antes de agrupar el resto en uno
+
+
+class PasoFijo:
+    """
+    Clase que reparte el tiempo real en pasos de lógica de duración fija.
+
+    Atributos:
+        paso (int): Milisegundos por paso
+        max_pasos (int): Pasos como máximo por frame
+        acumulado (int): Milisegundos que aún no se han simulado
+        agrupados (int): Frames en los que hubo que agrupar pasos
+    """
+
+    def __init__(self, paso=PASO_LOGICA, max_pasos=MAX_PASOS):
+        """
+        Inicializa el paso fijo sin tiempo acumulado.
+
+        Args:
+            paso (int): Milisegundos por paso
+            max_pasos (int): Pasos como máximo por frame
+        """
+        self.paso = paso
+        self.max_pasos = max_pasos
+        self.acumulado = 0
+        self.agrupados = 0
+
+    def pasos(self, transcurrido):
+        """
+        Calcula los pasos de lógica que tocan tras un intervalo real.
+
+        Args:
+            transcurrido (int): Milisegundos reales desde la llamada anterior
+
+        Returns:
+            list: Duración en ms de cada paso a ejecutar (puede estar vacía)
+        """
+        self.acumulado += transcurrido
+        n, self.acumulado = divmod(self.acumulado, self.paso)
+        if n <= self.max_pasos:
+            return [self.paso] * n
+
+        self.agrupados += 1
+        return [self.paso] * (self.max_pasos - 1) + [self.paso * (n - self.max_pasos + 1)]
@@ -0,0 +1,233 @@
+"""
+busqueda.py - Posiciones alcanzables por una pieza del Tetris
+
+Además de girar y dejar caer, una pieza puede bajar poco a poco,
+deslizarse bajo un saliente o girar con un "wall kick" contra otros
+bloques. Este módulo busca todas las posiciones (x, y, rotación) a las
+que puede llegar la pieza actual con las reglas reales del motor
+(engine.py) y, para cada posición donde puede quedar fijada, la
+secuencia de acciones más corta que la lleva hasta allí.
+
+La búsqueda es en anchura sobre los estados (x, y, rotación). Cada
+estado se guarda como un entero que indexa tablas planas: una con la
+validez de cada estado, calculada antes de empezar fila a fila con
+operaciones de bits sobre el bitboard, y otras con los estados ya
+visitados y el camino hasta ellos.
+
+No se tiene en cuenta la caída automática: se supone que las acciones
+llegan antes de que la pieza baje sola.
+"""
+
+from engine import IZQUIERDA, DERECHA, ABAJO, ROTAR, CAIDA
+
+# =============================================================================
+# CONSTANTES DE LA BÚSQUEDA
+# =============================================================================
+# Las piezas tienen como mucho 4 columnas, así que x está entre -3 y
+# columnas - 1; se reserva algo de margen a cada lado
+MARGEN_X = 4
+
+# Valor de la tabla de validez cuando la pieza cabe ("1" de format())
+LIBRE = ord("1")
+
+
+def _fila_libre(mascara, filas_bits, columnas, filas, y, ancho):
+    """
+    Calcula en qué columnas cabe una rotación de la pieza a una altura.
+
+    Args:
+        mascara (tuple): Mascara de la geometría (ver tetromino.Geometria)
+        filas_bits (list): Bitboard del tablero
+        columnas (int): Columnas del tablero
+        filas (int): Filas del tablero
+        y (int): Fila de la pieza
+        ancho (int): Estados por fila (columnas + 2 * MARGEN_X)
+
+    Returns:
+        bytes: Un byte por x + MARGEN_X, LIBRE si la pieza cabe ahí
+    """
+    col_min, ancho_pieza, fila_min, filas_mascara = mascara
+    y += fila_min
+    if y + len(filas_mascara) > filas:
+        return bytes(ancho)
+    # Bit p de "ocupadas": la pieza choca si su columna izquierda es p
+    ocupadas = 0
+    for mascara_fila in filas_mascara:
+        if y >= 0 and filas_bits[y]:
+            bits = filas_bits[y]
+            k = 0
+            while mascara_fila:
+                if mascara_fila & 1:
+                    ocupadas |= bits >> k
+                mascara_fila >>= 1
+                k += 1
+        y += 1
+    libres = ((1 << (columnas - ancho_pieza + 1)) - 1) & ~ocupadas
+    libres <<= MARGEN_X - col_min
+    return format(libres, "b").zfill(ancho)[::-1].encode()
+
+
+def colocaciones_alcanzables(tablero, pieza):
+    """
+    Busca todas las posiciones donde puede quedar fijada una pieza.
+
+    Args:
+        tablero (Board): Tablero de la partida
+        pieza (Tetromino): Pieza en su posición actual (no se modifica)
+
+    Returns:
+        dict: {(x, y, rotación): acciones}, donde acciones es la tupla más
+            corta de códigos de acción (IZQUIERDA, DERECHA, ABAJO, ROTAR)
+            que acaba en CAIDA y fija la pieza en esa posición. Vacío si
+            la pieza no está en una posición válida.
+    """
+    columnas = tablero.columnas
+    filas = tablero.filas
+    filas_bits = tablero.filas_bits
+    mascaras = [g.mascara for g in pieza.geometrias]
+    rotaciones = len(mascaras)
+    x0, y0, r0 = pieza.x, pieza.y, pieza.rotacion_actual
+
+    # Estado = ((y - y0) * rotaciones + r) * ancho + x + MARGEN_X, así un
+    # paso en x suma 1, un giro suma ancho y bajar una fila suma paso_y
+    ancho = columnas + 2 * MARGEN_X
+    paso_y = rotaciones * ancho
+    # Hasta la fila filas - y0, que nunca es válida (la pieza se sale)
+    total = (filas - y0 + 1) * paso_y
+
+    # Por encima de la pila la pieza solo choca con las paredes, así que
+    # da igual a qué altura se mueva o gire: basta buscar en la fila de
+    # salida y bajar después de golpe hasta la primera fila donde
+    # alguna rotación ya puede tocar un bloque (dy_aire)
+    cima = filas - max(tablero.alturas)
+    dy_aire = min(cima - fila_min - len(filas_mascara)
+                  for _, _, fila_min, filas_mascara in mascaras) - y0
+
+    # Tabla de validez (LIBRE o no) de las filas que se van a recorrer
+    validez = bytearray(total)
+    for dy in [0] + list(range(max(dy_aire, 1), filas - y0 + 1)):
+        for r, mascara in enumerate(mascaras):
+            inicio_fila = dy * paso_y + r * ancho
+            validez[inicio_fila:inicio_fila + ancho] = _fila_libre(
+                mascara, filas_bits, columnas, filas, y0 + dy, ancho)
+
+    inicio = r0 * ancho + x0 + MARGEN_X
+    if validez[inicio] != LIBRE:
+        return {}
+
+    def vecinos(estado):
+        """
+        Estados válidos a un paso sin bajar y su acción. El giro prueba
+        los mismos desplazamientos que el "wall kick" del motor: 0, -1, +1.
+        """
+        salida = []
+        if validez[estado - 1] == LIBRE:
+            salida.append((estado - 1, IZQUIERDA))
+        if validez[estado + 1] == LIBRE:
+            salida.append((estado + 1, DERECHA))
+        if rotaciones > 1:
+            r = estado // ancho % rotaciones
+            girado = estado + (ancho if r + 1 < rotaciones else ancho - paso_y)
+            for vecino in (girado, girado - 1, girado + 1):
+                if validez[vecino] == LIBRE:
+                    salida.append((vecino, ROTAR))
+                    break
+        return salida
+
+    caminos = {inicio: ()}
+    en_aire = [inicio]
+    if dy_aire > 0:
+        for estado in en_aire:
+            for vecino, codigo in vecinos(estado):
+                if vecino not in caminos:
+                    caminos[vecino] = caminos[estado] + (codigo,)
+                    en_aire.append(vecino)
+        bajada = (ABAJO,) * dy_aire
+        semillas = [(len(caminos[e]) + dy_aire, e + dy_aire * paso_y,
+                     caminos[e] + bajada) for e in en_aire]
+    else:
+        en_aire = []
+        semillas = [(0, inicio, ())]
+
+    # Búsqueda en anchura desde las semillas (ya ordenadas por distancia):
+    # cada semilla entra en la cola cuando le toca por su distancia
+    distancia = [-1] * total
+    previo = [-1] * total
+    accion = bytearray(total)
+    prefijo = {}
+    orden = []
+    siguiente = 0
+    i = 0
+    while True:
+        if i < len(orden):
+            limite = distancia[orden[i]] + 1
+        elif siguiente < len(semillas):
+            limite = semillas[siguiente][0]
+        else:
+            break
+        while siguiente < len(semillas) and semillas[siguiente][0] <= limite:
+            d, semilla, camino = semillas[siguiente]
+            siguiente += 1
+            if distancia[semilla] < 0:
+                distancia[semilla] = d
+                prefijo[semilla] = camino
+                orden.append(semilla)
+        estado = orden[i]
+        i += 1
+        d = distancia[estado] + 1
+        # Las filas de fuera del tablero no son válidas, así que abajo
+        # nunca se sale de las tablas
+        for vecino, codigo in ((estado - 1, IZQUIERDA), (estado + 1, DERECHA),
+                               (estado + paso_y, ABAJO)):
+            if validez[vecino] == LIBRE and distancia[vecino] < 0:
+                distancia[vecino] = d
+                previo[vecino] = estado
+                accion[vecino] = codigo
+                orden.append(vecino)
+        if rotaciones > 1:
+            girado = estado + (ancho if estado // ancho % rotaciones + 1 < rotaciones
+                               else ancho - paso_y)
+            for vecino in (girado, girado - 1, girado + 1):
+                if validez[vecino] == LIBRE:
+                    if distancia[vecino] < 0:
+                        distancia[vecino] = d
+                        previo[vecino] = estado
+                        accion[vecino] = ROTAR
+                        orden.append(vecino)
+                    break
+
+    # Fila donde acaba cada estado al dejarlo caer, de abajo arriba (los
+    # estados más bajos tienen el número más alto)
+    fondo = {}
+    for estado in sorted(orden, reverse=True):
+        abajo = estado + paso_y
+        fondo[estado] = fondo[abajo] if validez[abajo] == LIBRE else estado
+
+    # Mejor forma de llegar a cada posición final: dejando caer la pieza
+    # desde la fila de salida o desde cualquier estado de la búsqueda.
+    # Con el mismo número de acciones se queda la primera opción
+    mejores = {}
+    for estado in en_aire:
+        final = fondo[estado + dy_aire * paso_y]
+        if final not in mejores:
+            mejores[final] = (len(caminos[estado]), caminos[estado])
+    for estado in orden:
+        final = fondo[estado]
+        if final not in mejores or distancia[estado] < mejores[final][0]:
+            mejores[final] = (distancia[estado], estado)
+
+    resultado = {}
+    for final, (_, origen) in mejores.items():
+        if isinstance(origen, tuple):
+            acciones = origen + (CAIDA,)
+        else:
+            cola = []
+            while origen not in prefijo:
+                cola.append(accion[origen])
+                origen = previo[origen]
+            cola.reverse()
+            acciones = prefijo[origen] + tuple(cola) + (CAIDA,)
+        fila, x = divmod(final, ancho)
+        dy, r = divmod(fila, rotaciones)
+        resultado[(x - MARGEN_X, y0 + dy, r)] = acciones
+    return resultado
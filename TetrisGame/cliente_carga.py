@@ -0,0 +1,184 @@
+"""
+cliente_carga.py - Generador de carga para el servidor versus
+
+Este módulo abre muchas conexiones contra servidor.py (dos por partida),
+envía acciones aleatorias como si fueran jugadores y reconstruye el
+estado de cada partida con los DIFF recibidos. Al terminar muestra
+cuántos mensajes y bytes se han recibido por segundo y cuántas partidas
+han terminado. Cuando una partida termina, el cliente vuelve a buscar
+otra, así que la carga se mantiene durante toda la prueba.
+
+Uso desde la carpeta TetrisGame (con el servidor ya arrancado):
+
+    python cliente_carga.py --partidas 300 --segundos 30 --tasa 4
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from engine import IZQUIERDA, DERECHA, ABAJO, ROTAR, CAIDA
+from protocolo import (
+    empaquetar, leer_mensaje, Espejo,
+    leer_inicio, UNIRSE, ENTRADA, INICIO, DIFF, FIN,
+)
+
+# =============================================================================
+# CONSTANTES DEL GENERADOR DE CARGA
+# =============================================================================
+PARTIDAS = 200       # Partidas simultáneas (dos clientes por partida)
+SEGUNDOS = 20        # Duración de la prueba
+TASA = 4             # Acciones por segundo de cada cliente
+
+# Peso de cada acción al elegir una al azar (la caída, menos a menudo)
+ACCIONES = (IZQUIERDA, DERECHA, ABAJO, ROTAR, CAIDA)
+PESOS = (3, 3, 2, 3, 1)
+
+MENSAJE_UNIRSE = empaquetar(UNIRSE)
+MENSAJES_ENTRADA = {accion: empaquetar(ENTRADA + bytes((accion,))) for accion in ACCIONES}
+
+
+class Estadisticas:
+    """
+    Clase con los contadores que comparten todos los clientes.
+
+    Atributos:
+        conexiones (int): Clientes conectados
+        partidas (int): Partidas empezadas (contadas una vez por cliente)
+        terminadas (int): Mensajes FIN recibidos
+        mensajes (int): Mensajes DIFF recibidos
+        bytes (int): Bytes recibidos (con las longitudes)
+        enviados (int): Acciones enviadas
+        errores (int): Conexiones cerradas por el servidor
+    """
+
+    def __init__(self):
+        """Inicializa todos los contadores a cero."""
+        self.conexiones = 0
+        self.partidas = 0
+        self.terminadas = 0
+        self.mensajes = 0
+        self.bytes = 0
+        self.enviados = 0
+        self.errores = 0
+
+
+async def _recibir(lector, escritor, estado, estadisticas):
+    """
+    Lee los mensajes del servidor y actualiza el espejo de la partida.
+
+    Al terminar una partida vuelve a buscar otra.
+
+    Args:
+        lector (asyncio.StreamReader): Datos del servidor
+        escritor (asyncio.StreamWriter): Datos hacia el servidor
+        estado (dict): Estado del cliente ('espejo' es None sin partida)
+        estadisticas (Estadisticas): Contadores compartidos
+    """
+    while True:
+        mensaje = await leer_mensaje(lector)
+        estadisticas.bytes += len(mensaje) + 4
+        tipo = mensaje[:1]
+        if tipo == DIFF:
+            estadisticas.mensajes += 1
+            if estado['espejo'] is not None:
+                estado['espejo'].aplicar(mensaje)
+        elif tipo == INICIO:
+            _, _, _, columnas, filas, paleta = leer_inicio(mensaje)
+            estado['espejo'] = Espejo(2, columnas, filas, paleta)
+            estadisticas.partidas += 1
+        elif tipo == FIN:
+            estadisticas.terminadas += 1
+            estado['espejo'] = None
+            escritor.write(MENSAJE_UNIRSE)
+
+
+async def cliente(host, puerto, tasa, hasta, estadisticas, rng):
+    """
+    Un jugador simulado: busca partida y envía acciones aleatorias.
+
+    Args:
+        host (str): Dirección del servidor
+        puerto (int): Puerto del servidor
+        tasa (float): Acciones por segundo
+        hasta (float): Instante (time.monotonic) en el que parar
+        estadisticas (Estadisticas): Contadores compartidos
+        rng (random.Random): Generador de las acciones
+    """
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    estadisticas.conexiones += 1
+    estado = {'espejo': None}
+    receptor = asyncio.ensure_future(_recibir(lector, escritor, estado, estadisticas))
+    try:
+        escritor.write(MENSAJE_UNIRSE)
+        # Reparte los envíos en el tiempo para no mandar todos a la vez
+        await asyncio.sleep(rng.random() / tasa)
+        while time.monotonic() < hasta and not receptor.done():
+            if estado['espejo'] is not None:
+                accion = rng.choices(ACCIONES, PESOS)[0]
+                escritor.write(MENSAJES_ENTRADA[accion])
+                estadisticas.enviados += 1
+            await asyncio.sleep(rng.expovariate(tasa))
+    finally:
+        if receptor.done() and not receptor.cancelled() and receptor.exception():
+            estadisticas.errores += 1
+        receptor.cancel()
+        escritor.close()
+
+
+async def generar_carga(host, puerto, partidas, segundos, tasa, semilla=None):
+    """
+    Lanza dos clientes por partida y devuelve los contadores al terminar.
+
+    Args:
+        host (str): Dirección del servidor
+        puerto (int): Puerto del servidor
+        partidas (int): Partidas simultáneas
+        segundos (float): Duración de la prueba
+        tasa (float): Acciones por segundo de cada cliente
+        semilla (int, opcional): Semilla de las acciones
+
+    Returns:
+        Estadisticas: Contadores de la prueba
+    """
+    estadisticas = Estadisticas()
+    rng = random.Random(semilla)
+    hasta = time.monotonic() + segundos
+    clientes = [cliente(host, puerto, tasa, hasta, estadisticas,
+                        random.Random(rng.randrange(2 ** 32)))
+                for _ in range(2 * partidas)]
+    await asyncio.gather(*clientes)
+    return estadisticas
+
+
+def main():
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Generador de carga del servidor versus")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--partidas', type=int, default=PARTIDAS)
+    parser.add_argument('--segundos', type=float, default=SEGUNDOS)
+    parser.add_argument('--tasa', type=float, default=TASA,
+                        help="Acciones por segundo de cada cliente")
+    parser.add_argument('--semilla', type=int, default=None)
+    args = parser.parse_args()
+    if args.partidas < 1 or args.segundos <= 0 or args.tasa <= 0:
+        parser.error("--partidas, --segundos y --tasa deben ser positivos")
+
+    inicio = time.perf_counter()
+    e = asyncio.run(generar_carga(args.host, args.puerto, args.partidas,
+                                  args.segundos, args.tasa, args.semilla))
+    duracion = time.perf_counter() - inicio
+
+    print(f"{e.conexiones} clientes, {e.partidas // 2} partidas empezadas, "
+          f"{e.terminadas // 2} terminadas, {e.errores} desconexiones")
+    print(f"{e.enviados / duracion:.0f} acciones/s enviadas, "
+          f"{e.mensajes / duracion:.0f} mensajes/s y "
+          f"{e.bytes / duracion / 1024:.1f} KiB/s recibidos")
+    if e.mensajes:
+        print(f"{e.bytes / e.mensajes:.1f} bytes por mensaje de media")
+
+
+if __name__ == "__main__":
+    main()
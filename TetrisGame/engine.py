@@ -0,0 +1,326 @@
+"""
+engine.py - Motor del Tetris sin ventana
+
+Este módulo contiene la clase Engine con todas las reglas del juego:
+movimiento de las piezas, caída automática, líneas, puntuación y niveles.
+No usa Pygame, así que puede ejecutarse sin pantalla y tan rápido como
+permita el procesador (tests, simulaciones, bots).
+
+El tiempo no se lee de ningún reloj: avanza con el dt que se pasa a
+step(). El generador de números aleatorios también se puede inyectar
+para que las partidas sean reproducibles.
+"""
+
+import random
+
+from board import Board, COLUMNAS, FILAS, TAMANO_MINIMO
+from tetromino import Tetromino, TIPOS
+
+# =============================================================================
+# CONSTANTES DEL MOTOR
+# =============================================================================
+# Velocidad inicial de caída (milisegundos entre movimientos)
+VELOCIDAD_INICIAL = 500
+VELOCIDAD_MINIMA = 100        # Intervalo más corto, por muy alto que sea el nivel
+ACELERACION_POR_NIVEL = 50    # Milisegundos que se restan al subir de nivel
+LINEAS_POR_NIVEL = 10
+
+# Puntos por líneas eliminadas
+PUNTOS_POR_LINEA = {
+    1: 100,    # 1 línea = 100 puntos
+    2: 300,    # 2 líneas = 300 puntos
+    3: 500,    # 3 líneas = 500 puntos
+    4: 800     # Tetris (4 líneas) = 800 puntos
+}
+
+# Acciones que se pueden pasar a step()
+IZQUIERDA = 0
+DERECHA = 1
+ABAJO = 2
+ROTAR = 3
+CAIDA = 4
+PAUSA = 5
+REINICIAR = 6
+
+
+class Engine:
+    """
+    Clase que contiene la lógica del juego Tetris sin dependencias gráficas.
+
+    Coordina el tablero, las piezas, la puntuación y los diferentes
+    estados del juego (jugando, pausado, game over).
+
+    Atributos:
+        tablero (Board): El tablero de juego
+        semilla (int): Semilla del generador (None si no se conoce)
+        rng: Generador de números aleatorios para elegir las piezas
+        piezas_generadas (int): Piezas sacadas del generador desde el inicio
+        grabacion (Grabacion): Grabación de las entradas, o None
+        pieza_actual (Tetromino): La pieza que está cayendo
+        siguiente_pieza (Tetromino): La próxima pieza
+        puntuacion (int): Puntuación del jugador
+        nivel (int): Nivel actual (afecta la velocidad)
+        lineas (int): Total de líneas eliminadas
+        game_over (bool): Indica si el juego terminó
+        pausado (bool): Indica si el juego está pausado
+        tiempo (int): Milisegundos simulados desde el inicio
+        ultimo_movimiento (int): Instante del último movimiento automático
+        velocidad (int): Milisegundos entre caídas automáticas
+    """
+
+    def __init__(self, semilla=None, rng=None, columnas=COLUMNAS, filas=FILAS):
+        """
+        Inicializa una nueva partida de Tetris.
+
+        Args:
+            semilla (int, opcional): Semilla para un generador propio
+            rng (opcional): Generador con un método choice(). Si no se indica
+                ni semilla ni rng se usa el módulo random global.
+            columnas (int): Columnas del tablero
+            filas (int): Filas del tablero
+        """
+        if rng is None:
+            rng = random if semilla is None else random.Random(semilla)
+        self.semilla = semilla
+        self.rng = rng
+        self.piezas_generadas = 0
+        # Grabación de las entradas (ver replay.py); None = no se graba
+        self.grabacion = None
+        self.tablero = Board(columnas, filas)
+        self.pieza_actual = self._nueva_pieza()
+        self.siguiente_pieza = self._nueva_pieza()
+        self.puntuacion = 0
+        self.nivel = 1
+        self.lineas = 0
+        self.game_over = False
+        self.pausado = False
+        self.tiempo = 0
+        self.ultimo_movimiento = 0
+        self.velocidad = VELOCIDAD_INICIAL
+
+        # Métodos indexados por código de acción (ver constantes)
+        self._acciones = (
+            self.mover_izquierda,
+            self.mover_derecha,
+            self.mover_abajo,
+            self.rotar,
+            self.caida_instantanea,
+            self.pausar,
+            self.reiniciar,
+        )
+
+    def _nueva_pieza(self):
+        """Crea una pieza aleatoria, centrada en el tablero, usando el generador."""
+        pieza = Tetromino(self.rng.choice(TIPOS))
+        self.piezas_generadas += 1
+        pieza.x = (self.tablero.columnas - TAMANO_MINIMO) // 2
+        return pieza
+
+    def step(self, entradas=(), dt=0):
+        """
+        Avanza la simulación aplicando unas entradas y un intervalo de tiempo.
+
+        Primero se aplican las acciones en orden y después se avanza el
+        tiempo. Si en ese intervalo tocaban varias caídas automáticas se
+        aplican todas, cada una en su instante exacto, así que el
+        resultado no depende de cómo se reparta el tiempo entre pasos.
+
+        Args:
+            entradas (iterable): Códigos de acción (IZQUIERDA, ROTAR, ...)
+            dt (int): Milisegundos transcurridos desde el paso anterior
+        """
+        if entradas:
+            if self.grabacion is not None:
+                self.grabacion.registrar(self.tiempo, entradas)
+            for accion in entradas:
+                self._acciones[accion]()
+
+        self.tiempo += dt
+
+        # Con el juego parado el reloj de la caída automática tampoco avanza
+        if self.pausado or self.game_over:
+            self.ultimo_movimiento += dt
+            return
+
+        # Verificar si es momento de mover la pieza hacia abajo
+        while self.tiempo - self.ultimo_movimiento > self.velocidad:
+            self.ultimo_movimiento += self.velocidad + 1
+            self._mover_pieza_abajo()
+            if self.game_over:
+                break
+
+    def _mover_pieza_abajo(self):
+        """
+        Mueve la pieza actual una posición hacia abajo.
+
+        Si la pieza no puede moverse, la fija en el tablero y
+        genera una nueva pieza.
+        """
+        self.pieza_actual.y += 1
+
+        # Verificar si el movimiento es válido
+        if not self.tablero.es_posicion_valida(self.pieza_actual):
+            # Revertir el movimiento
+            self.pieza_actual.y -= 1
+            # Fijar la pieza en el tablero
+            self._fijar_pieza()
+
+    def _fijar_pieza(self):
+        """
+        Fija la pieza actual en el tablero y genera una nueva.
+
+        También verifica si hay líneas completas y actualiza
+        la puntuación.
+        """
+        # Fijar la pieza en el tablero
+        self.tablero.fijar_pieza(self.pieza_actual)
+
+        # Limpiar líneas completas y obtener puntos
+        lineas_eliminadas = self.tablero.limpiar_lineas()
+        if lineas_eliminadas > 0:
+            self._sumar_puntos(lineas_eliminadas)
+
+        # Generar nueva pieza
+        self.pieza_actual = self.siguiente_pieza
+        self.siguiente_pieza = self._nueva_pieza()
+
+        # Verificar game over
+        if not self.tablero.es_posicion_valida(self.pieza_actual):
+            self.game_over = True
+
+    def _sumar_puntos(self, lineas):
+        """
+        Suma puntos según las líneas eliminadas.
+
+        Args:
+            lineas (int): Número de líneas eliminadas (1-4)
+        """
+        # Añadir puntos base
+        self.puntuacion += PUNTOS_POR_LINEA.get(lineas, 100 * lineas) * self.nivel
+        self.lineas += lineas
+
+        # Subir de nivel cada LINEAS_POR_NIVEL líneas
+        nuevo_nivel = (self.lineas // LINEAS_POR_NIVEL) + 1
+        if nuevo_nivel > self.nivel:
+            self.nivel = nuevo_nivel
+            # Aumentar velocidad (reducir el intervalo)
+            self.velocidad = max(VELOCIDAD_MINIMA, VELOCIDAD_INICIAL
+                                 - (self.nivel - 1) * ACELERACION_POR_NIVEL)
+
+    def mover_izquierda(self):
+        """Mueve la pieza actual una posición a la izquierda."""
+        if self.pausado or self.game_over:
+            return
+
+        self.pieza_actual.x -= 1
+        if not self.tablero.es_posicion_valida(self.pieza_actual):
+            self.pieza_actual.x += 1  # Revertir si es inválido
+
+    def mover_derecha(self):
+        """Mueve la pieza actual una posición a la derecha."""
+        if self.pausado or self.game_over:
+            return
+
+        self.pieza_actual.x += 1
+        if not self.tablero.es_posicion_valida(self.pieza_actual):
+            self.pieza_actual.x -= 1  # Revertir si es inválido
+
+    def mover_abajo(self):
+        """Acelera la caída de la pieza actual."""
+        if self.pausado or self.game_over:
+            return
+
+        self._mover_pieza_abajo()
+        self.ultimo_movimiento = self.tiempo
+
+    def rotar(self):
+        """Rota la pieza actual 90 grados en sentido horario."""
+        if self.pausado or self.game_over:
+            return
+
+        self.pieza_actual.rotar()
+
+        # Si la rotación resulta en posición inválida, intentar "wall kick"
+        if not self.tablero.es_posicion_valida(self.pieza_actual):
+            # Intentar mover a la izquierda
+            self.pieza_actual.x -= 1
+            if not self.tablero.es_posicion_valida(self.pieza_actual):
+                # Intentar mover a la derecha (2 posiciones desde la original)
+                self.pieza_actual.x += 2
+                if not self.tablero.es_posicion_valida(self.pieza_actual):
+                    # Revertir todo
+                    self.pieza_actual.x -= 1
+                    self.pieza_actual.rotar_inverso()
+
+    def caida_instantanea(self):
+        """
+        Hace que la pieza caiga instantáneamente hasta el fondo.
+
+        También conocido como "hard drop". La fila de aterrizaje se
+        calcula con las alturas de las columnas del tablero.
+        """
+        if self.pausado or self.game_over:
+            return
+
+        self.pieza_actual.y = self.tablero.fila_caida(self.pieza_actual)
+        self._fijar_pieza()
+
+    def pausar(self):
+        """Alterna el estado de pausa del juego."""
+        if not self.game_over:
+            self.pausado = not self.pausado
+
+    def reiniciar(self):
+        """Reinicia el juego para empezar una nueva partida."""
+        self.tablero.reiniciar()
+        self.pieza_actual = self._nueva_pieza()
+        self.siguiente_pieza = self._nueva_pieza()
+        self.puntuacion = 0
+        self.nivel = 1
+        self.lineas = 0
+        self.game_over = False
+        self.pausado = False
+        self.velocidad = VELOCIDAD_INICIAL
+
+    def capturar_estado(self):
+        """
+        Guarda el estado de la partida para volver a él con restaurar_estado().
+
+        El tablero se guarda con Board.copia(), que comparte las filas en
+        lugar de copiarlas, así que guardar un estado por pieza cuesta poco
+        aunque se guarden miles. También se guarda el estado del generador
+        para que, al volver, lleguen las mismas piezas.
+
+        Returns:
+            tuple: Estado opaco de la partida
+        """
+        getstate = getattr(self.rng, "getstate", None)
+        return (
+            self.tablero.copia(),
+            self.pieza_actual.clonar(),
+            self.siguiente_pieza.clonar(),
+            self.puntuacion, self.nivel, self.lineas, self.velocidad,
+            self.game_over, self.tiempo, self.ultimo_movimiento,
+            self.piezas_generadas,
+            getstate() if getstate is not None else None,
+        )
+
+    def restaurar_estado(self, estado):
+        """
+        Vuelve a un estado guardado con capturar_estado().
+
+        El estado se puede restaurar varias veces: no se modifica. La
+        pausa no forma parte del estado y se mantiene como esté.
+
+        Args:
+            estado (tuple): Estado devuelto por capturar_estado()
+        """
+        (tablero, pieza_actual, siguiente_pieza,
+         self.puntuacion, self.nivel, self.lineas, self.velocidad,
+         self.game_over, self.tiempo, self.ultimo_movimiento,
+         self.piezas_generadas, estado_rng) = estado
+        self.tablero.restaurar(tablero)
+        self.pieza_actual = pieza_actual.clonar()
+        self.siguiente_pieza = siguiente_pieza.clonar()
+        if estado_rng is not None:
+            self.rng.setstate(estado_rng)
@@ -0,0 +1,433 @@
+"""
+entorno.py - Muchas partidas del Tetris a la vez con NumPy
+
+Este módulo contiene la clase EntornoLote, pensada para experimentos de
+aprendizaje por refuerzo: guarda K partidas como un único array de
+tableros y avanza todas con una sola llamada a step(), que recibe una
+acción por partida.
+
+Las reglas son las de engine.py (movimientos, wall kick, caída
+automática, caída instantánea, líneas, puntuación y niveles), pero cada
+operación se calcula a la vez para todas las partidas que la necesitan
+con operaciones de arrays. Solo se recorren en Python las partidas que
+sacan una pieza nueva, para pedírsela a su generador.
+
+Los tableros se guardan con un borde de celdas ocupadas a los lados y
+por debajo, todos seguidos en un único array plano. La posición de cada
+pieza es un índice de ese array, así que sus cuatro celdas se leen con
+un solo take() y la posición es válida si las cuatro están vacías, sin
+comprobar los límites aparte.
+
+Las piezas salen por defecto de un generador de NumPy común a todo el
+lote. Con semillas=[...] cada partida usa su propio random.Random, que
+elige las piezas igual que Engine: con la misma semilla y las mismas
+acciones, una partida del lote y un Engine(semilla=...) juegan
+exactamente la misma partida (a cambio, cada pieza nueva cuesta una
+llamada en Python).
+"""
+
+import random
+
+import numpy as np
+
+from board import COLUMNAS, FILAS, TAMANO_MINIMO, indice_color
+from engine import (
+    IZQUIERDA, DERECHA, ABAJO, ROTAR, CAIDA,
+    VELOCIDAD_INICIAL, VELOCIDAD_MINIMA, ACELERACION_POR_NIVEL,
+    LINEAS_POR_NIVEL, PUNTOS_POR_LINEA,
+)
+from tetromino import COLORES, GEOMETRIAS, TIPOS
+
+# =============================================================================
+# CONSTANTES DEL ENTORNO
+# =============================================================================
+# Acción "no hacer nada" en step() (el resto son las del motor)
+NINGUNA = -1
+ACCIONES = (NINGUNA, IZQUIERDA, DERECHA, ABAJO, ROTAR, CAIDA)
+
+BLOQUES_POR_PIEZA = 4
+MAX_ROTACIONES = 4
+
+# Celdas ocupadas que rodean cada tablero: una pieza que se sale como
+# mucho a BORDE celdas (mover o girar con wall kick) toca el borde
+BORDE = 4
+CELDA_BORDE = 255
+
+# Las piezas se eligen por su índice en TIPOS; choice() sobre este rango
+# saca los mismos números que choice(TIPOS) con el mismo generador
+INDICES_TIPOS = tuple(range(len(TIPOS)))
+
+# =============================================================================
+# TABLAS DE LAS PIEZAS
+# =============================================================================
+# Cada pieza (tipo y rotación) se guarda como un solo número,
+# tipo * MAX_ROTACIONES + rotación, que indexa estas tablas. Las piezas
+# con menos de MAX_ROTACIONES rotaciones repiten las que tienen
+_GEOMETRIAS_PIEZA = [GEOMETRIAS[tipo][r % len(GEOMETRIAS[tipo])]
+                     for tipo in TIPOS for r in range(MAX_ROTACIONES)]
+DX = np.array([[dx for dx, _ in g.bloques] for g in _GEOMETRIAS_PIEZA])
+DY = np.array([[dy for _, dy in g.bloques] for g in _GEOMETRIAS_PIEZA])
+ROTADA = np.array([i * MAX_ROTACIONES + (r + 1) % len(GEOMETRIAS[tipo])
+                   for i, tipo in enumerate(TIPOS) for r in range(MAX_ROTACIONES)])
+
+# Índice de PALETA del color de cada pieza (el mismo que usa Board)
+COLOR_PIEZA = np.array([indice_color(COLORES[tipo]) for tipo in TIPOS],
+                       dtype=np.uint8).repeat(MAX_ROTACIONES)
+
+# Puntos base por líneas eliminadas a la vez (una pieza ocupa 4 filas)
+PUNTOS = np.array([0] + [PUNTOS_POR_LINEA.get(n, 100 * n)
+                         for n in range(1, BLOQUES_POR_PIEZA + 1)])
+
+
+class EntornoLote:
+    """
+    Clase que juega K partidas del Tetris a la vez.
+
+    Todo el estado son arrays con una entrada por partida. Las partidas
+    terminadas no cambian hasta que se reinician con reiniciar(). No hay
+    pausa: para parar basta con no llamar a step().
+
+    Atributos:
+        num (int): Número de partidas (K)
+        columnas (int): Columnas de cada tablero
+        filas (int): Filas de cada tablero
+        tableros (np.ndarray): (K, filas, columnas) uint8 con los índices
+            de PALETA de las celdas (0 = vacía), sin la pieza que cae.
+            Es una vista del array con borde
+        tipo, rotacion, x, y (np.ndarray): La pieza actual de cada
+            partida (propiedades de solo lectura; tipo es un índice de TIPOS)
+        siguiente (np.ndarray): Índice en TIPOS de la siguiente pieza
+        puntuacion (np.ndarray): Puntuación de cada partida
+        lineas (np.ndarray): Líneas eliminadas en cada partida
+        nivel (np.ndarray): Nivel de cada partida
+        velocidad (np.ndarray): Milisegundos entre caídas automáticas
+        tiempo (np.ndarray): Milisegundos simulados de cada partida
+        ultimo_movimiento (np.ndarray): Instante de la última caída automática
+        piezas_generadas (np.ndarray): Piezas sacadas para cada partida
+        game_over (np.ndarray): Si cada partida ha terminado
+        rngs (list): random.Random de cada partida, o None si las piezas
+            salen del generador común de NumPy
+    """
+
+    def __init__(self, num, semilla=None, semillas=None,
+                 columnas=COLUMNAS, filas=FILAS):
+        """
+        Crea K partidas nuevas.
+
+        Args:
+            num (int): Número de partidas
+            semilla (int, opcional): Semilla del generador común de NumPy
+            semillas (iterable, opcional): Una semilla por partida, para
+                sacar las mismas piezas que Engine(semilla=...)
+            columnas (int): Columnas de cada tablero
+            filas (int): Filas de cada tablero
+
+        Raises:
+            ValueError: Si no hay partidas, el tablero es demasiado
+                pequeño o las semillas no son válidas
+        """
+        if num < 1:
+            raise ValueError("El lote necesita al menos una partida")
+        if columnas < TAMANO_MINIMO or filas < TAMANO_MINIMO:
+            raise ValueError(
+                f"El tablero debe tener al menos {TAMANO_MINIMO} columnas y filas"
+            )
+        if semillas is None:
+            self.rngs = None
+        elif semilla is not None:
+            raise ValueError("Indica semilla o semillas, no las dos")
+        else:
+            semillas = list(semillas)
+            if len(semillas) != num:
+                raise ValueError(f"Se esperaban {num} semillas y hay {len(semillas)}")
+            self.rngs = [random.Random(s) for s in semillas]
+        self._generador = np.random.default_rng(semilla)
+
+        self.num = num
+        self.columnas = columnas
+        self.filas = filas
+
+        # Tableros con BORDE celdas ocupadas a los lados y por debajo. La
+        # celda (x, y) de la partida k está en el índice
+        # k * _tamano + y * _ancho + x + BORDE del array plano
+        self._ancho = columnas + 2 * BORDE
+        self._tamano = (filas + BORDE) * self._ancho
+        self._celdas = np.full((num, filas + BORDE, self._ancho),
+                               CELDA_BORDE, dtype=np.uint8)
+        self._plano = self._celdas.reshape(-1)
+        self.tableros = self._celdas[:, :filas, BORDE:BORDE + columnas]
+        self.tableros[:] = 0
+
+        # Desplazamiento en el array plano de cada bloque de cada pieza
+        self._bloques = DY * self._ancho + DX
+        # Cuánto se mueve la pieza con cada acción (índice = acción + 1)
+        self._paso_accion = np.zeros(len(ACCIONES), dtype=np.intp)
+        self._paso_accion[IZQUIERDA + 1] = -1
+        self._paso_accion[DERECHA + 1] = 1
+        self._paso_accion[ABAJO + 1] = self._ancho
+        # Índice de la posición de salida de cada partida
+        self._salida = (np.arange(num, dtype=np.intp) * self._tamano
+                        + (columnas - TAMANO_MINIMO) // 2 + BORDE)
+
+        # Pieza actual (tipo * MAX_ROTACIONES + rotación) y su posición
+        self._pieza = np.zeros(num, dtype=np.intp)
+        self._posicion = self._salida.copy()
+        self.siguiente = np.zeros(num, dtype=np.intp)
+        self.puntuacion = np.zeros(num, dtype=np.int64)
+        self.lineas = np.zeros(num, dtype=np.int64)
+        self.nivel = np.ones(num, dtype=np.int64)
+        self.velocidad = np.full(num, VELOCIDAD_INICIAL, dtype=np.int64)
+        self.tiempo = np.zeros(num, dtype=np.int64)
+        self.ultimo_movimiento = np.zeros(num, dtype=np.int64)
+        self.piezas_generadas = np.zeros(num, dtype=np.int64)
+        self.game_over = np.zeros(num, dtype=bool)
+
+        todas = np.arange(num)
+        self._pieza[:] = np.multiply(self._nuevas_piezas(todas), MAX_ROTACIONES)
+        self.siguiente[:] = self._nuevas_piezas(todas)
+
+    @property
+    def tipo(self):
+        """Índice en TIPOS de la pieza actual de cada partida."""
+        return self._pieza // MAX_ROTACIONES
+
+    @property
+    def rotacion(self):
+        """Rotación de la pieza actual de cada partida."""
+        return self._pieza % MAX_ROTACIONES
+
+    @property
+    def x(self):
+        """Columna de la pieza actual de cada partida."""
+        return self._posicion % self._tamano % self._ancho - BORDE
+
+    @property
+    def y(self):
+        """Fila de la pieza actual de cada partida."""
+        return self._posicion % self._tamano // self._ancho
+
+    def _nuevas_piezas(self, indices):
+        """Saca una pieza nueva (índice en TIPOS) para cada partida indicada."""
+        self.piezas_generadas[indices] += 1
+        if self.rngs is None:
+            return self._generador.integers(len(TIPOS), size=indices.size)
+        rngs = self.rngs
+        return [rngs[i].choice(INDICES_TIPOS) for i in indices.tolist()]
+
+    def _celdas_pieza(self, posicion, pieza):
+        """Índices (M, 4) en el array plano de los bloques de M piezas."""
+        return posicion[:, None] + self._bloques.take(pieza, axis=0)
+
+    def _libres(self, posicion, pieza):
+        """
+        Verifica a la vez M posiciones de pieza, como Board.es_posicion_valida.
+
+        Las paredes y el suelo son celdas ocupadas del borde, y las piezas
+        nunca están por encima de la fila 0 (salen en ella y solo bajan),
+        así que basta con mirar si las cuatro celdas están vacías. Las
+        cuatro celdas (uint8) se comparan de una vez como un uint32.
+
+        Args:
+            posicion (np.ndarray): Índice de cada posición en el array plano
+            pieza (np.ndarray): Pieza (tipo y rotación) en cada posición
+
+        Returns:
+            np.ndarray: M booleanos, True si la posición es válida
+        """
+        celdas = self._plano.take(self._celdas_pieza(posicion, pieza))
+        return celdas.view(np.uint32).ravel() == 0
+
+    def step(self, acciones, dt=0):
+        """
+        Avanza todas las partidas aplicando una acción a cada una.
+
+        Igual que Engine.step, primero se aplican las acciones y después
+        se avanza el tiempo con todas las caídas automáticas que toquen.
+
+        Args:
+            acciones (array): K códigos de ACCIONES (NINGUNA, IZQUIERDA, ...)
+            dt (int): Milisegundos transcurridos desde el paso anterior
+
+        Returns:
+            tuple: (recompensas, terminadas): los puntos ganados por cada
+            partida en este paso y qué partidas han terminado en él
+
+        Raises:
+            ValueError: Si no hay una acción válida por partida
+        """
+        acciones = np.asarray(acciones)
+        if acciones.shape != (self.num,):
+            raise ValueError(f"Se esperaban {self.num} acciones, forma {acciones.shape}")
+        if ((acciones < NINGUNA) | (acciones > CAIDA)).any():
+            raise ValueError("Acción no válida (PAUSA y REINICIAR no se admiten; "
+                             "usa reiniciar())")
+        puntuacion_antes = self.puntuacion.copy()
+        terminadas_antes = self.game_over.copy()
+        posicion = self._posicion
+        pieza = self._pieza
+
+        # Cada partida hace una sola acción, así que el orden da igual
+        acciones = np.where(self.game_over, NINGUNA, acciones)
+
+        # Mover a los lados y bajar una fila son el mismo desplazamiento
+        pasos = self._paso_accion.take(acciones + 1)
+        indices = np.flatnonzero(pasos)
+        destino = posicion[indices] + pasos[indices]
+        libres = self._libres(destino, pieza[indices])
+        posicion[indices[libres]] = destino[libres]
+        bajadas = indices[acciones[indices] == ABAJO]
+        self.ultimo_movimiento[bajadas] = self.tiempo[bajadas]
+        # Las que no han podido bajar se fijan junto con las caídas
+        fijar = [indices[~libres & (pasos[indices] == self._ancho)]]
+
+        self._rotar(np.flatnonzero(acciones == ROTAR))
+
+        indices = np.flatnonzero(acciones == CAIDA)
+        if indices.size:
+            self._caer(indices)
+            fijar.append(indices)
+        self._fijar(np.concatenate(fijar))
+
+        self.tiempo += dt
+        # En las partidas terminadas el reloj de la caída tampoco avanza
+        self.ultimo_movimiento[self.game_over] += dt
+        while True:
+            indices = np.flatnonzero(~self.game_over & (
+                self.tiempo - self.ultimo_movimiento > self.velocidad))
+            if not indices.size:
+                break
+            self.ultimo_movimiento[indices] += self.velocidad[indices] + 1
+            destino = posicion[indices] + self._ancho
+            libres = self._libres(destino, pieza[indices])
+            posicion[indices[libres]] = destino[libres]
+            self._fijar(indices[~libres])
+
+        return self.puntuacion - puntuacion_antes, self.game_over & ~terminadas_antes
+
+    def _rotar(self, indices):
+        """Gira la pieza de varias partidas con el mismo wall kick que Engine.rotar."""
+        pieza = ROTADA.take(self._pieza[indices])
+        posicion = self._posicion[indices]
+        # Sin mover, una a la izquierda y una a la derecha
+        for desplazamiento in (0, -1, 1):
+            if not indices.size:
+                return
+            libres = self._libres(posicion + desplazamiento, pieza)
+            giradas = indices[libres]
+            self._pieza[giradas] = pieza[libres]
+            self._posicion[giradas] = posicion[libres] + desplazamiento
+            quedan = ~libres
+            indices, pieza, posicion = indices[quedan], pieza[quedan], posicion[quedan]
+
+    def _caer(self, indices):
+        """
+        Deja caer la pieza de varias partidas hasta el fondo (sin fijarla).
+
+        Para cada bloque se busca la primera celda ocupada de su columna
+        por debajo de él (el suelo del borde cuenta, y nunca está a más de
+        filas celdas); la pieza baja hasta quedar justo encima de la más
+        cercana.
+        """
+        celdas = self._celdas_pieza(self._posicion[indices], self._pieza[indices])
+        # (M, 4, filas): lo que hay debajo de cada bloque, de arriba abajo.
+        # Lo que queda por debajo del suelo no se usa; en el último tablero
+        # se sale del array y mode='clip' lo lee del borde
+        debajo = self._plano.take(
+            celdas[:, :, None] + self._ancho * np.arange(1, self.filas + 1), mode='clip')
+        caida = (debajo != 0).argmax(axis=2).min(axis=1)
+        self._posicion[indices] += caida * self._ancho
+
+    def _fijar(self, indices):
+        """
+        Fija la pieza de varias partidas, elimina sus líneas y saca la siguiente.
+
+        Una línea completa siempre contiene la pieza que la completa, así
+        que solo se miran las 4 filas desde la más alta de la pieza, y
+        solo los tableros con alguna línea completa se compactan.
+        """
+        if not indices.size:
+            return
+        ancho = self._ancho
+        pieza = self._pieza[indices]
+        celdas = self._celdas_pieza(self._posicion[indices], pieza)
+        self._plano[celdas] = COLOR_PIEZA.take(pieza)[:, None]
+
+        # Inicio (columna 0) de la fila más alta de cada pieza
+        inicio = celdas.min(axis=1) // ancho * ancho + BORDE
+        ventana = inicio[:, None, None] + (ancho * np.arange(BLOQUES_POR_PIEZA))[:, None]
+        llenas = self._plano.take(ventana + np.arange(self.columnas)).all(axis=2)
+        # Las filas del borde inferior están llenas pero no cuentan
+        fila = inicio % self._tamano // ancho
+        llenas &= fila[:, None] + np.arange(BLOQUES_POR_PIEZA) < self.filas
+        num_lineas = llenas.sum(axis=1)
+        con_lineas = num_lineas > 0
+        if con_lineas.any():
+            self._limpiar(indices[con_lineas], num_lineas[con_lineas])
+
+        # Sacar la siguiente pieza
+        self._pieza[indices] = self.siguiente[indices] * MAX_ROTACIONES
+        self._posicion[indices] = self._salida[indices]
+        self.siguiente[indices] = self._nuevas_piezas(indices)
+        libres = self._libres(self._posicion[indices], self._pieza[indices])
+        self.game_over[indices[~libres]] = True
+
+    def _limpiar(self, indices, num_lineas):
+        """
+        Elimina las líneas completas de varios tableros y suma los puntos.
+
+        Las filas incompletas se reordenan al fondo sin cambiar su orden
+        (ordenación estable) y las de arriba se vacían.
+        """
+        tableros = self.tableros[indices]
+        llenas = tableros.all(axis=2)
+        orden = np.argsort(~llenas, axis=1, kind='stable')
+        tableros = np.take_along_axis(tableros, orden[:, :, None], axis=1)
+        tableros[np.arange(self.filas)[None, :] < num_lineas[:, None]] = 0
+        self.tableros[indices] = tableros
+
+        # Mismas cuentas que Engine._sumar_puntos
+        nivel = self.nivel[indices]
+        self.puntuacion[indices] += PUNTOS[num_lineas] * nivel
+        self.lineas[indices] += num_lineas
+        nivel = np.maximum(nivel, self.lineas[indices] // LINEAS_POR_NIVEL + 1)
+        self.nivel[indices] = nivel
+        self.velocidad[indices] = np.maximum(
+            VELOCIDAD_MINIMA, VELOCIDAD_INICIAL - (nivel - 1) * ACELERACION_POR_NIVEL)
+
+    def reiniciar(self, mascara=None):
+        """
+        Empieza una partida nueva en algunos tableros (como Engine.reiniciar).
+
+        Args:
+            mascara (array, opcional): K booleanos con las partidas que se
+                reinician. Por defecto, todas.
+        """
+        indices = (np.arange(self.num) if mascara is None
+                   else np.flatnonzero(np.asarray(mascara)))
+        if not indices.size:
+            return
+        self.tableros[indices] = 0
+        self._pieza[indices] = np.multiply(self._nuevas_piezas(indices), MAX_ROTACIONES)
+        self.siguiente[indices] = self._nuevas_piezas(indices)
+        self._posicion[indices] = self._salida[indices]
+        self.puntuacion[indices] = 0
+        self.nivel[indices] = 1
+        self.lineas[indices] = 0
+        self.game_over[indices] = False
+        self.velocidad[indices] = VELOCIDAD_INICIAL
+
+    def observar(self):
+        """
+        Tableros con la pieza actual dibujada, para usarlos como observación.
+
+        Returns:
+            np.ndarray: Copia (K, filas, columnas) uint8 de los tableros con
+            el color de la pieza que cae en sus celdas (salvo en las
+            partidas terminadas)
+        """
+        celdas = self._celdas.copy()
+        indices = np.flatnonzero(~self.game_over)
+        pieza = self._pieza[indices]
+        celdas.reshape(-1)[self._celdas_pieza(self._posicion[indices], pieza)] = \
+            COLOR_PIEZA.take(pieza)[:, None]
+        return np.ascontiguousarray(celdas[:, :self.filas, BORDE:BORDE + self.columnas])
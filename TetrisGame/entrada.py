@@ -0,0 +1,106 @@
+"""
+entrada.py - Repetición automática de teclas mantenidas (DAS / ARR)
+
+En el Tetris, al mantener pulsada una flecha la pieza se mueve una vez,
+espera un momento y después sigue moviéndose a ritmo constante:
+- DAS (Delayed Auto Shift): espera desde la pulsación hasta la primera
+  repetición.
+- ARR (Auto Repeat Rate): tiempo entre repeticiones.
+
+Este módulo contiene la clase AutoRepeticion, que recibe las pulsaciones
+y liberaciones de teclas y, en cada paso de lógica, devuelve las
+acciones que tocan. Cuenta el tiempo con el dt del paso (no con el reloj
+real), así que el resultado es el mismo aunque los frames vayan lentos.
+"""
+
+from engine import IZQUIERDA, DERECHA, ABAJO
+
+# =============================================================================
+# CONSTANTES DE LA REPETICIÓN
+# =============================================================================
+DAS = 170          # Milisegundos hasta la primera repetición lateral
+ARR = 50           # Milisegundos entre repeticiones laterales
+ARR_ABAJO = 50     # Milisegundos entre bajadas con la flecha abajo
+
+# (espera, intervalo) de cada acción que se repite al mantenerla pulsada
+REPETICION = {
+    IZQUIERDA: (DAS, ARR),
+    DERECHA: (DAS, ARR),
+    ABAJO: (ARR_ABAJO, ARR_ABAJO),
+}
+
+# Al pulsar una dirección se deja de repetir la contraria
+OPUESTAS = {IZQUIERDA: DERECHA, DERECHA: IZQUIERDA}
+
+
+class AutoRepeticion:
+    """
+    Clase que convierte el estado de las teclas en acciones del motor.
+
+    Cada pulsación produce su acción una vez en el siguiente paso (aunque
+    la tecla se suelte antes). Las acciones de REPETICION además se
+    repiten mientras la tecla siga pulsada.
+
+    Atributos:
+        repeticion (dict): (espera, intervalo) en ms de cada acción repetible
+        pendientes (list): Acciones pulsadas desde el último paso
+        mantenidas (dict): {acción: [ms pulsada, repeticiones hechas]}
+    """
+
+    def __init__(self, repeticion=None):
+        """
+        Inicializa la repetición sin ninguna tecla pulsada.
+
+        Args:
+            repeticion (dict, opcional): (espera, intervalo) por acción. Por
+                defecto REPETICION. Los intervalos deben ser mayores que 0.
+        """
+        self.repeticion = dict(REPETICION if repeticion is None else repeticion)
+        self.pendientes = []
+        self.mantenidas = {}
+
+    def pulsar(self, accion):
+        """
+        Registra que se ha pulsado la tecla de una acción.
+
+        Args:
+            accion (int): Código de acción del motor
+        """
+        self.pendientes.append(accion)
+        if accion in self.repeticion:
+            self.mantenidas[accion] = [0, 0]
+            self.mantenidas.pop(OPUESTAS.get(accion), None)
+
+    def soltar(self, accion):
+        """
+        Registra que se ha soltado la tecla de una acción.
+
+        Args:
+            accion (int): Código de acción del motor
+        """
+        self.mantenidas.pop(accion, None)
+
+    def soltar_todas(self):
+        """Olvida las teclas mantenidas (por ejemplo, al perder el foco)."""
+        self.mantenidas.clear()
+
+    def acciones(self, dt):
+        """
+        Calcula las acciones de un paso de lógica.
+
+        Args:
+            dt (int): Milisegundos que dura el paso
+
+        Returns:
+            list: Códigos de acción a pasar a Engine.step()
+        """
+        salida = self.pendientes
+        self.pendientes = []
+        for accion, estado in self.mantenidas.items():
+            estado[0] += dt
+            espera, intervalo = self.repeticion[accion]
+            if estado[0] >= espera:
+                total = (estado[0] - espera) // intervalo + 1
+                salida.extend([accion] * (total - estado[1]))
+                estado[1] = total
+        return salida
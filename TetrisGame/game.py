@@ -1,224 +1,136 @@
 """
-game.py - Lógica principal del juego Tetris
+game.py - Juego Tetris con Pygame
 
-Este módulo contiene la clase Game que coordina todos los elementos
-del juego: tablero, piezas, puntuación y estados del juego.
+Este módulo contiene la clase Game, que usa el motor de engine.py para
+las reglas y se encarga de lo que depende de Pygame: las fuentes y el
+dibujo de todos los elementos en pantalla. El tiempo lo pone el bucle
+principal, que llama a step() con pasos fijos (ver bucle.py).
+
+También tiene el modo práctica, en el que se pueden deshacer y rehacer
+las piezas colocadas.
 """
 
+from collections import deque
+
 import pygame
-from board import Board, MARGEN_X, COLUMNAS, TAMANO_CELDA
-from tetromino import Tetromino
+from board import MARGEN_X, COLUMNAS, FILAS, COLUMNAS_VISIBLES, TAMANO_CELDA
+# VELOCIDAD_INICIAL y PUNTOS_POR_LINEA se siguen importando desde aquí
+from engine import Engine, VELOCIDAD_INICIAL, PUNTOS_POR_LINEA
+from hud import Hud
 
 # =============================================================================
 # CONSTANTES DEL JUEGO
 # =============================================================================
-# Velocidad inicial de caída (milisegundos entre movimientos)
-VELOCIDAD_INICIAL = 500
-
-# Puntos por líneas eliminadas
-PUNTOS_POR_LINEA = {
-    1: 100,    # 1 línea = 100 puntos
-    2: 300,    # 2 líneas = 300 puntos
-    3: 500,    # 3 líneas = 500 puntos
-    4: 800     # Tetris (4 líneas) = 800 puntos
-}
-
 # Colores para la interfaz
 COLOR_TEXTO = (255, 255, 255)
 COLOR_GAME_OVER = (255, 50, 50)
 
+# Posición horizontal del panel lateral de información
+X_PANEL = MARGEN_X + COLUMNAS_VISIBLES * TAMANO_CELDA + 30
 
-class Game:
+# Tamaño de la ventana cubierta por los mensajes centrales
+TAMANO_MENSAJE = (500, 620)
+
+# Piezas que se pueden deshacer como máximo en el modo práctica
+MAX_DESHACER = 500
+
+
+class Game(Engine):
     """
-    Clase principal que maneja la lógica del juego Tetris.
+    Clase principal que conecta el motor del Tetris con Pygame.
     
-    Coordina el tablero, las piezas, la puntuación y los diferentes
-    estados del juego (jugando, pausado, game over).
+    Las reglas del juego (tablero, piezas, puntuación y estados) están
+    en Engine. Game solo añade el dibujo en pantalla y el modo práctica;
+    como Engine, no lee ningún reloj: avanza con el dt que se pasa a
+    step(), que en el juego llega del paso fijo de main.py (PasoFijo).
     
-    Atributos:
-        tablero (Board): El tablero de juego
-        pieza_actual (Tetromino): La pieza que está cayendo
-        siguiente_pieza (Tetromino): La próxima pieza
-        puntuacion (int): Puntuación del jugador
-        nivel (int): Nivel actual (afecta la velocidad)
-        lineas (int): Total de líneas eliminadas
-        game_over (bool): Indica si el juego terminó
-        pausado (bool): Indica si el juego está pausado
-        ultimo_movimiento (int): Timestamp del último movimiento automático
-        velocidad (int): Milisegundos entre caídas automáticas
+    Atributos (además de los de Engine):
+        fuente: Fuente para los textos normales
+        fuente_grande: Fuente para los mensajes centrales
+        hud (Hud): Caché de los textos renderizados y de la capa de mensajes
+        practica (bool): Si está activo el modo práctica (deshacer/rehacer)
     """
 
-    def __init__(self):
-        """Inicializa una nueva partida de Tetris."""
-        self.tablero = Board()
-        self.pieza_actual = Tetromino()
-        self.siguiente_pieza = Tetromino()
-        self.puntuacion = 0
-        self.nivel = 1
-        self.lineas = 0
-        self.game_over = False
-        self.pausado = False
-        self.ultimo_movimiento = pygame.time.get_ticks()
-        self.velocidad = VELOCIDAD_INICIAL
+    def __init__(self, semilla=None, rng=None, columnas=COLUMNAS, filas=FILAS):
+        """
+        Inicializa una nueva partida de Tetris.
+        
+        Args:
+            semilla (int, opcional): Semilla para elegir las piezas
+            rng (opcional): Generador de números aleatorios propio
+            columnas (int): Columnas del tablero
+            filas (int): Filas del tablero
+        """
+        super().__init__(semilla=semilla, rng=rng, columnas=columnas, filas=filas)
         
         # Cargar fuente para el texto
         pygame.font.init()
         self.fuente = pygame.font.Font(None, 36)
         self.fuente_grande = pygame.font.Font(None, 48)
+        self.hud = Hud(self.fuente, self.fuente_grande, TAMANO_MENSAJE)
+        
+        # Modo práctica: estados al aparecer cada pieza ya colocada (para
+        # deshacer), estados deshechos (para rehacer) y el de la pieza actual
+        self.practica = False
+        self._deshacer = deque(maxlen=MAX_DESHACER)
+        self._rehacer = []
+        self._estado_salida = None
 
-    def actualizar(self):
+    def alternar_practica(self):
         """
-        Actualiza el estado del juego en cada frame.
+        Activa o desactiva el modo práctica.
         
-        Maneja la caída automática de las piezas según la velocidad
-        del nivel actual.
+        Al activarlo se empieza a guardar un estado por pieza; al
+        desactivarlo se olvidan los estados guardados.
         """
-        # No actualizar si está pausado o game over
-        if self.pausado or self.game_over:
-            return
-        
-        tiempo_actual = pygame.time.get_ticks()
-        
-        # Verificar si es momento de mover la pieza hacia abajo
-        if tiempo_actual - self.ultimo_movimiento > self.velocidad:
-            self._mover_pieza_abajo()
-            self.ultimo_movimiento = tiempo_actual
-
-    def _mover_pieza_abajo(self):
-        """
-        Mueve la pieza actual una posición hacia abajo.
-        
-        Si la pieza no puede moverse, la fija en el tablero y
-        genera una nueva pieza.
-        """
-        self.pieza_actual.y += 1
-        
-        # Verificar si el movimiento es válido
-        if not self.tablero.es_posicion_valida(self.pieza_actual):
-            # Revertir el movimiento
-            self.pieza_actual.y -= 1
-            # Fijar la pieza en el tablero
-            self._fijar_pieza()
+        self.practica = not self.practica
+        self._deshacer.clear()
+        self._rehacer.clear()
+        self._estado_salida = self.capturar_estado() if self.practica else None
 
     def _fijar_pieza(self):
-        """
-        Fija la pieza actual en el tablero y genera una nueva.
-        
-        También verifica si hay líneas completas y actualiza
-        la puntuación.
-        """
-        # Fijar la pieza en el tablero
-        self.tablero.fijar_pieza(self.pieza_actual)
-        
-        # Limpiar líneas completas y obtener puntos
-        lineas_eliminadas = self.tablero.limpiar_lineas()
-        if lineas_eliminadas > 0:
-            self._sumar_puntos(lineas_eliminadas)
-        
-        # Generar nueva pieza
-        self.pieza_actual = self.siguiente_pieza
-        self.siguiente_pieza = Tetromino()
-        
-        # Verificar game over
-        if not self.tablero.es_posicion_valida(self.pieza_actual):
-            self.game_over = True
+        """Fija la pieza y, en el modo práctica, guarda el estado para deshacer."""
+        super()._fijar_pieza()
+        if self.practica:
+            self._deshacer.append(self._estado_salida)
+            self._rehacer.clear()
+            self._estado_salida = self.capturar_estado()
 
-    def _sumar_puntos(self, lineas):
+    def deshacer(self):
         """
-        Suma puntos según las líneas eliminadas.
+        Vuelve al momento en que apareció la pieza anterior (modo práctica).
         
-        Args:
-            lineas (int): Número de líneas eliminadas (1-4)
+        Returns:
+            bool: True si había algo que deshacer
         """
-        # Añadir puntos base
-        self.puntuacion += PUNTOS_POR_LINEA.get(lineas, 100 * lineas) * self.nivel
-        self.lineas += lineas
-        
-        # Subir de nivel cada 10 líneas
-        nuevo_nivel = (self.lineas // 10) + 1
-        if nuevo_nivel > self.nivel:
-            self.nivel = nuevo_nivel
-            # Aumentar velocidad (reducir el intervalo)
-            self.velocidad = max(100, VELOCIDAD_INICIAL - (self.nivel - 1) * 50)
+        if not self.practica or not self._deshacer:
+            return False
+        self._rehacer.append(self._estado_salida)
+        self._estado_salida = self._deshacer.pop()
+        self.restaurar_estado(self._estado_salida)
+        return True
 
-    def mover_izquierda(self):
-        """Mueve la pieza actual una posición a la izquierda."""
-        if self.pausado or self.game_over:
-            return
-        
-        self.pieza_actual.x -= 1
-        if not self.tablero.es_posicion_valida(self.pieza_actual):
-            self.pieza_actual.x += 1  # Revertir si es inválido
-
-    def mover_derecha(self):
-        """Mueve la pieza actual una posición a la derecha."""
-        if self.pausado or self.game_over:
-            return
-        
-        self.pieza_actual.x += 1
-        if not self.tablero.es_posicion_valida(self.pieza_actual):
-            self.pieza_actual.x -= 1  # Revertir si es inválido
-
-    def mover_abajo(self):
-        """Acelera la caída de la pieza actual."""
-        if self.pausado or self.game_over:
-            return
-        
-        self._mover_pieza_abajo()
-        self.ultimo_movimiento = pygame.time.get_ticks()
-
-    def rotar(self):
-        """Rota la pieza actual 90 grados en sentido horario."""
-        if self.pausado or self.game_over:
-            return
-        
-        self.pieza_actual.rotar()
-        
-        # Si la rotación resulta en posición inválida, intentar "wall kick"
-        if not self.tablero.es_posicion_valida(self.pieza_actual):
-            # Intentar mover a la izquierda
-            self.pieza_actual.x -= 1
-            if not self.tablero.es_posicion_valida(self.pieza_actual):
-                # Intentar mover a la derecha (2 posiciones desde la original)
-                self.pieza_actual.x += 2
-                if not self.tablero.es_posicion_valida(self.pieza_actual):
-                    # Revertir todo
-                    self.pieza_actual.x -= 1
-                    self.pieza_actual.rotar_inverso()
-
-    def caida_instantanea(self):
+    def rehacer(self):
         """
-        Hace que la pieza caiga instantáneamente hasta el fondo.
+        Vuelve a colocar la última pieza deshecha (modo práctica).
         
-        También conocido como "hard drop".
+        Returns:
+            bool: True si había algo que rehacer
         """
-        if self.pausado or self.game_over:
-            return
-        
-        # Mover hacia abajo hasta que no sea válido
-        while self.tablero.es_posicion_valida(self.pieza_actual):
-            self.pieza_actual.y += 1
-        
-        # Retroceder un paso (última posición válida)
-        self.pieza_actual.y -= 1
-        self._fijar_pieza()
-
-    def pausar(self):
-        """Alterna el estado de pausa del juego."""
-        if not self.game_over:
-            self.pausado = not self.pausado
+        if not self.practica or not self._rehacer:
+            return False
+        self._deshacer.append(self._estado_salida)
+        self._estado_salida = self._rehacer.pop()
+        self.restaurar_estado(self._estado_salida)
+        return True
 
     def reiniciar(self):
-        """Reinicia el juego para empezar una nueva partida."""
-        self.tablero.reiniciar()
-        self.pieza_actual = Tetromino()
-        self.siguiente_pieza = Tetromino()
-        self.puntuacion = 0
-        self.nivel = 1
-        self.lineas = 0
-        self.game_over = False
-        self.pausado = False
-        self.velocidad = VELOCIDAD_INICIAL
+        """Reinicia la partida; en el modo práctica se olvida lo guardado."""
+        super().reiniciar()
+        if self.practica:
+            self._deshacer.clear()
+            self._rehacer.clear()
+            self._estado_salida = self.capturar_estado()
 
     def dibujar(self, pantalla):
         """
@@ -231,29 +143,54 @@ class Game:
         self.tablero.dibujar(pantalla, self.pieza_actual)
         
         # Dibujar información del juego (lado derecho)
-        x_info = MARGEN_X + COLUMNAS * TAMANO_CELDA + 30
+        self.dibujar_panel(pantalla)
+        
+        # Mostrar mensajes de pausa o game over
+        self.dibujar_mensajes(pantalla)
+
+    def dibujar_panel(self, pantalla):
+        """
+        Dibuja el panel lateral: siguiente pieza, puntos, nivel y líneas.
+        
+        Args:
+            pantalla: Superficie de Pygame donde dibujar
+        """
+        x_info = X_PANEL
+        hud = self.hud
         
         # Título "SIGUIENTE"
-        texto = self.fuente.render("SIGUIENTE:", True, COLOR_TEXTO)
+        texto = hud.texto("siguiente", "SIGUIENTE:", COLOR_TEXTO)
         pantalla.blit(texto, (x_info, 20))
         
         # Dibujar la siguiente pieza
         self._dibujar_siguiente_pieza(pantalla, x_info, 60)
         
         # Puntuación
-        texto = self.fuente.render(f"PUNTOS:", True, COLOR_TEXTO)
+        texto = hud.texto("titulo_puntos", "PUNTOS:", COLOR_TEXTO)
         pantalla.blit(texto, (x_info, 180))
-        texto = self.fuente.render(f"{self.puntuacion}", True, COLOR_TEXTO)
+        texto = hud.texto("puntos", f"{self.puntuacion}", COLOR_TEXTO)
         pantalla.blit(texto, (x_info, 210))
         
         # Nivel
-        texto = self.fuente.render(f"NIVEL: {self.nivel}", True, COLOR_TEXTO)
+        texto = hud.texto("nivel", f"NIVEL: {self.nivel}", COLOR_TEXTO)
         pantalla.blit(texto, (x_info, 270))
         
         # Líneas
-        texto = self.fuente.render(f"LÍNEAS: {self.lineas}", True, COLOR_TEXTO)
+        texto = hud.texto("lineas", f"LÍNEAS: {self.lineas}", COLOR_TEXTO)
         pantalla.blit(texto, (x_info, 310))
         
+        # Modo práctica
+        if self.practica:
+            texto = hud.texto("practica", "PRÁCTICA", COLOR_TEXTO)
+            pantalla.blit(texto, (x_info, 350))
+
+    def dibujar_mensajes(self, pantalla):
+        """
+        Dibuja el mensaje central de pausa o de game over si corresponde.
+        
+        Args:
+            pantalla: Superficie de Pygame donde dibujar
+        """
         # Mostrar mensaje de pausa
         if self.pausado:
             self._dibujar_mensaje_central(pantalla, "PAUSA", "Presiona P para continuar")
@@ -266,24 +203,48 @@ class Game:
         """
         Dibuja la vista previa de la siguiente pieza.
         
+        La imagen de cada forma se dibuja una sola vez y se guarda en el HUD.
+        
         Args:
             pantalla: Superficie de Pygame
             x: Posición X donde dibujar
             y: Posición Y donde dibujar
         """
+        pieza = self.siguiente_pieza
+        imagen = self.hud.imagen(
+            "siguiente_pieza",
+            (pieza.tipo, pieza.rotacion_actual),
+            lambda: self._crear_vista_previa(pieza)
+        )
+        pantalla.blit(imagen, (x, y))
+
+    def _crear_vista_previa(self, pieza):
+        """
+        Dibuja una pieza en pequeño sobre una superficie transparente.
+        
+        Args:
+            pieza (Tetromino): Pieza a dibujar
+            
+        Returns:
+            pygame.Surface: Imagen de la pieza
+        """
         tamano_preview = 20  # Tamaño más pequeño para el preview
         
-        for fila_idx, fila in enumerate(self.siguiente_pieza.forma):
+        forma = pieza.forma
+        ancho = max(len(fila) for fila in forma) * tamano_preview
+        imagen = pygame.Surface((ancho, len(forma) * tamano_preview), pygame.SRCALPHA)
+        for fila_idx, fila in enumerate(forma):
             for col_idx, celda in enumerate(fila):
                 if celda == 1:
                     rect = pygame.Rect(
-                        x + col_idx * tamano_preview,
-                        y + fila_idx * tamano_preview,
+                        col_idx * tamano_preview,
+                        fila_idx * tamano_preview,
                         tamano_preview,
                         tamano_preview
                     )
-                    pygame.draw.rect(pantalla, self.siguiente_pieza.color, rect)
-                    pygame.draw.rect(pantalla, (100, 100, 100), rect, 1)
+                    pygame.draw.rect(imagen, pieza.color, rect)
+                    pygame.draw.rect(imagen, (100, 100, 100), rect, 1)
+        return imagen
 
     def _dibujar_mensaje_central(self, pantalla, titulo, subtitulo):
         """
@@ -294,18 +255,15 @@ class Game:
             titulo: Texto principal del mensaje
             subtitulo: Texto secundario
         """
-        # Crear superficie semitransparente
-        overlay = pygame.Surface((500, 620))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        pantalla.blit(overlay, (0, 0))
+        # Capa semitransparente (creada una sola vez en el HUD)
+        pantalla.blit(self.hud.overlay, (0, 0))
         
         # Dibujar título
-        texto = self.fuente_grande.render(titulo, True, COLOR_GAME_OVER)
+        texto = self.hud.texto("mensaje_titulo", titulo, COLOR_GAME_OVER, grande=True)
         rect = texto.get_rect(center=(250, 280))
         pantalla.blit(texto, rect)
         
         # Dibujar subtítulo
-        texto = self.fuente.render(subtitulo, True, COLOR_TEXTO)
+        texto = self.hud.texto("mensaje_subtitulo", subtitulo, COLOR_TEXTO)
         rect = texto.get_rect(center=(250, 330))
         pantalla.blit(texto, rect)
@@ -0,0 +1,104 @@
+"""
+hud.py - Caché de textos y capas del HUD del Tetris
+
+Font.render() es caro y los textos del panel (puntos, nivel, líneas)
+solo cambian cuando se fija una pieza. Este módulo contiene la clase
+Hud, que guarda cada texto ya renderizado (y la vista previa de la
+siguiente pieza) y solo lo vuelve a crear cuando cambia su contenido.
+También crea una única vez la capa
+semitransparente que se usa para los mensajes de pausa y game over.
+"""
+
+import pygame
+
+# =============================================================================
+# CONSTANTES DEL HUD
+# =============================================================================
+ALFA_OVERLAY = 180           # Transparencia de la capa de mensajes (0-255)
+COLOR_OVERLAY = (0, 0, 0)    # Color de la capa de mensajes
+
+
+class Hud:
+    """
+    Clase que guarda los textos renderizados del HUD y la capa de mensajes.
+
+    Cada texto ocupa un "hueco" con nombre (por ejemplo "puntos"). Si en
+    el siguiente frame el hueco tiene el mismo texto, fuente y color, se
+    reutiliza la superficie anterior. Así la memoria no crece aunque la
+    puntuación cambie muchas veces.
+
+    Atributos:
+        fuente: Fuente para los textos normales
+        fuente_grande: Fuente para los títulos de los mensajes
+        overlay (pygame.Surface): Capa semitransparente reutilizable
+        renderizados (int): Veces que se ha creado una superficie nueva
+    """
+
+    def __init__(self, fuente, fuente_grande, tamano):
+        """
+        Inicializa el HUD y crea la capa de mensajes.
+
+        Args:
+            fuente: Fuente para los textos normales
+            fuente_grande: Fuente para los títulos
+            tamano (tuple): (ancho, alto) de la capa de mensajes
+        """
+        self.fuente = fuente
+        self.fuente_grande = fuente_grande
+        self.renderizados = 0
+        self._huecos = {}
+
+        # La capa de mensajes se crea una sola vez
+        self.overlay = pygame.Surface(tamano)
+        if pygame.display.get_surface() is not None:
+            self.overlay = self.overlay.convert()
+        self.overlay.set_alpha(ALFA_OVERLAY)
+        self.overlay.fill(COLOR_OVERLAY)
+
+    def imagen(self, hueco, clave, crear):
+        """
+        Obtiene la superficie de un hueco, creándola solo si cambió la clave.
+
+        Args:
+            hueco (str): Nombre del hueco del HUD ("puntos", "nivel", ...)
+            clave: Valor que identifica el contenido (texto, color, ...)
+            crear: Función sin argumentos que crea la superficie
+
+        Returns:
+            pygame.Surface: Superficie guardada o recién creada
+        """
+        guardado = self._huecos.get(hueco)
+        if guardado is not None and guardado[0] == clave:
+            return guardado[1]
+
+        superficie = crear()
+        if pygame.display.get_surface() is not None:
+            # Mismo formato de píxel que la pantalla: el blit es más rápido
+            superficie = superficie.convert_alpha()
+        self.renderizados += 1
+        self._huecos[hueco] = (clave, superficie)
+        return superficie
+
+    def texto(self, hueco, texto, color, grande=False):
+        """
+        Obtiene la superficie de un texto, renderizándola solo si cambió.
+
+        Args:
+            hueco (str): Nombre del hueco del HUD ("puntos", "nivel", ...)
+            texto (str): Texto a mostrar
+            color (tuple): Color RGB del texto
+            grande (bool): True para usar la fuente grande
+
+        Returns:
+            pygame.Surface: Superficie con el texto renderizado
+        """
+        fuente = self.fuente_grande if grande else self.fuente
+        return self.imagen(
+            hueco,
+            (texto, color, grande),
+            lambda: fuente.render(texto, True, color)
+        )
+
+    def invalidar(self):
+        """Olvida todos los textos guardados (por ejemplo, al cambiar de fuente)."""
+        self._huecos.clear()
@@ -0,0 +1,270 @@
+"""
+instantanea.py - Guardar y reanudar una partida del Tetris
+
+Este módulo convierte el estado completo de una partida (tablero, piezas,
+contadores y tiempos) en unos pocos cientos de bytes (más el estado
+del generador, ver abajo) y lo vuelve a cargar en microsegundos. Se usa para reanudar la partida al volver a
+abrir el juego y sirve también como checkpoint en simulaciones masivas.
+
+Formato (little endian):
+    Cabecera fija (ver CABECERA) con el tamaño del tablero, el estado,
+    la semilla, los contadores y las dos piezas.
+    Estado del generador (ver ESTADO_RNG), solo si la partida usa un
+        random.Random.
+    Paleta: color RGB de cada índice local distinto de 0 (vacío).
+    Bits: una fila tras otra, ceil(columnas / 8) bytes por fila.
+    Colores: el índice local de cada celda, dos celdas por byte si la
+        paleta tiene 16 colores o menos y uno por byte si no.
+    CRC32 de todo lo anterior.
+
+Los índices de color se guardan referidos a la paleta del propio fichero
+porque la PALETA del tablero se amplía en tiempo de ejecución y puede
+ser distinta en otro proceso.
+
+Para seguir con las mismas piezas que la partida original se guarda el
+estado del generador tal cual: al cargar basta con setstate(), así que
+el tiempo de carga no depende de cuántas piezas se hayan sacado. Son
+unos 2,5 KB que no se comprimen (el estado de un Mersenne Twister parece
+aleatorio), y no se añaden si la partida usa el módulo random global.
+"""
+
+import math
+import os
+import random
+import struct
+import zlib
+
+from board import Board, PALETA, indice_color
+from tetromino import Tetromino, TIPOS
+
+# =============================================================================
+# CONSTANTES DEL FORMATO
+# =============================================================================
+MAGICO = b"TSNP"
+VERSION = 2
+# magico, version, columnas, filas, estado, semilla, piezas generadas,
+# puntuacion, lineas, nivel, velocidad, tiempo, ultimo movimiento,
+# pieza actual (tipo, rotacion, x, y), siguiente pieza (tipo, rotacion, x, y),
+# colores de la paleta
+CABECERA = struct.Struct("<4sBHHBQIIIHHqqBBhhBBhhB")
+# Estado de un random.Random: 624 palabras, la posición y gauss_next (NaN = None)
+ESTADO_RNG = struct.Struct("<625Id")
+CRC = struct.Struct("<I")
+
+# Bits del campo de estado
+GAME_OVER = 1
+PAUSADO = 2
+CON_SEMILLA = 4
+CON_ESTADO_RNG = 8
+
+MAX_COLORES_MEDIO_BYTE = 16   # Con más colores se usa un byte por celda
+
+INDICE_TIPO = {tipo: i for i, tipo in enumerate(TIPOS)}
+
+# Tablas para separar y juntar las dos celdas de un byte con translate()
+_A_NIBBLE_ALTO = bytes((i << 4) & 0xFF for i in range(256))
+_NIBBLE_ALTO = bytes(i >> 4 for i in range(256))
+_NIBBLE_BAJO = bytes(i & 0x0F for i in range(256))
+
+
+def _campos_pieza(pieza):
+    """Valores de una pieza tal como van en la cabecera."""
+    return INDICE_TIPO[pieza.tipo], pieza.rotacion_actual, pieza.x, pieza.y
+
+
+def _crear_pieza(tipo, rotacion, x, y):
+    """
+    Crea una pieza a partir de los valores de la cabecera.
+
+    Raises:
+        ValueError: Si el tipo o la rotación no existen
+    """
+    if tipo >= len(TIPOS):
+        raise ValueError(f"Tipo de pieza no válido: {tipo}")
+    pieza = Tetromino(TIPOS[tipo])
+    if rotacion >= len(pieza.geometrias):
+        raise ValueError(f"Rotación no válida: {rotacion}")
+    pieza.rotacion_actual = rotacion
+    pieza.x = x
+    pieza.y = y
+    return pieza
+
+
+def capturar(motor):
+    """
+    Codifica el estado de una partida.
+
+    Args:
+        motor (Engine): Partida (también sirve un Game)
+
+    Returns:
+        bytes: Instantánea de la partida
+    """
+    tablero = motor.tablero
+    columnas = tablero.columnas
+    plano = b"".join(tablero.colores)
+
+    # Paleta local: los colores que aparecen, con el vacío en el índice 0
+    usados = sorted(set(plano) | {0})
+    local = bytearray(256)
+    for i, indice in enumerate(usados):
+        local[indice] = i
+    plano = plano.translate(local)
+    if len(usados) <= MAX_COLORES_MEDIO_BYTE:
+        if len(plano) % 2:
+            plano += b"\0"
+        altos = plano[0::2].translate(_A_NIBBLE_ALTO)
+        bajos = plano[1::2]
+        juntos = int.from_bytes(altos, "little") | int.from_bytes(bajos, "little")
+        plano = juntos.to_bytes(len(altos), "little")
+
+    estado_rng = b""
+    if isinstance(motor.rng, random.Random):
+        _, palabras, gauss = motor.rng.getstate()
+        estado_rng = ESTADO_RNG.pack(*palabras, math.nan if gauss is None else gauss)
+    estado = ((GAME_OVER if motor.game_over else 0)
+              | (PAUSADO if motor.pausado else 0)
+              | (CON_SEMILLA if motor.semilla is not None else 0)
+              | (CON_ESTADO_RNG if estado_rng else 0))
+    ancho_fila = (columnas + 7) // 8
+    datos = b"".join((
+        CABECERA.pack(
+            MAGICO, VERSION, columnas, tablero.filas, estado,
+            motor.semilla or 0, motor.piezas_generadas,
+            motor.puntuacion, motor.lineas, motor.nivel, motor.velocidad,
+            motor.tiempo, motor.ultimo_movimiento,
+            *_campos_pieza(motor.pieza_actual),
+            *_campos_pieza(motor.siguiente_pieza),
+            len(usados) - 1,
+        ),
+        estado_rng,
+        b"".join(bytes(PALETA[indice]) for indice in usados[1:]),
+        b"".join(bits.to_bytes(ancho_fila, "little") for bits in tablero.filas_bits),
+        plano,
+    ))
+    return datos + CRC.pack(zlib.crc32(datos))
+
+
+def restaurar(motor, datos, rng=None):
+    """
+    Pone una partida en el estado de una instantánea.
+
+    Se reutiliza el motor que se pasa (y su tablero si tiene el mismo
+    tamaño), así que sirve para un Game con su reloj y sus fuentes. La
+    partida deja de grabarse (ver replay.py), porque la grabación ya no
+    empezaría en un tablero vacío.
+
+    Args:
+        motor (Engine): Partida que se sobrescribe
+        datos (bytes): Instantánea creada con capturar()
+        rng (opcional): Generador para las piezas siguientes. Por defecto
+            se recrea el de la partida original con su estado guardado
+            (o se usa el módulo random si no se guardó).
+
+    Returns:
+        Engine: El mismo motor, ya restaurado
+
+    Raises:
+        ValueError: Si los datos no son una instantánea válida
+    """
+    if len(datos) < CABECERA.size + CRC.size:
+        raise ValueError("Instantánea demasiado corta")
+    if datos[:4] != MAGICO or datos[4] != VERSION:
+        raise ValueError("No es una instantánea de Tetris compatible")
+    fin = len(datos) - CRC.size
+    if zlib.crc32(datos[:fin]) != CRC.unpack_from(datos, fin)[0]:
+        raise ValueError("La instantánea está dañada")
+
+    (_, _, columnas, filas, estado, semilla, piezas_generadas,
+     puntuacion, lineas, nivel, velocidad, tiempo, ultimo_movimiento,
+     tipo, rotacion, x, y, tipo_sig, rotacion_sig, x_sig, y_sig,
+     num_colores) = CABECERA.unpack_from(datos)
+
+    celdas = columnas * filas
+    ancho_fila = (columnas + 7) // 8
+    medio_byte = num_colores + 1 <= MAX_COLORES_MEDIO_BYTE
+    tam_plano = (celdas + 1) // 2 if medio_byte else celdas
+    pos = CABECERA.size
+    tam_rng = ESTADO_RNG.size if estado & CON_ESTADO_RNG else 0
+    if fin != pos + tam_rng + 3 * num_colores + ancho_fila * filas + tam_plano:
+        raise ValueError("El tamaño de la instantánea no es correcto")
+
+    palabras = None
+    if tam_rng:
+        *palabras, gauss = ESTADO_RNG.unpack_from(datos, pos)
+        pos += tam_rng
+        if palabras[-1] > 624:
+            raise ValueError("El estado del generador no es válido")
+
+    # Paleta local -> índices de la PALETA de este proceso
+    global_ = bytearray(256)
+    for i in range(1, num_colores + 1):
+        global_[i] = indice_color(tuple(datos[pos:pos + 3]))
+        pos += 3
+
+    filas_bits = [int.from_bytes(datos[i:i + ancho_fila], "little")
+                  for i in range(pos, pos + ancho_fila * filas, ancho_fila)]
+    pos += ancho_fila * filas
+
+    plano = datos[pos:pos + tam_plano]
+    if medio_byte:
+        separado = bytearray(2 * tam_plano)
+        separado[0::2] = plano.translate(_NIBBLE_ALTO)
+        separado[1::2] = plano.translate(_NIBBLE_BAJO)
+        plano = separado
+    plano = bytes(plano.translate(global_))
+
+    pieza_actual = _crear_pieza(tipo, rotacion, x, y)
+    siguiente_pieza = _crear_pieza(tipo_sig, rotacion_sig, x_sig, y_sig)
+
+    tablero = motor.tablero
+    if tablero.columnas != columnas or tablero.filas != filas:
+        tablero = motor.tablero = Board(columnas, filas)
+    tablero.filas_bits = filas_bits
+    tablero.colores = [plano[i:i + columnas] for i in range(0, celdas, columnas)]
+    tablero.alturas = [0] * columnas
+    tablero._recalcular_alturas(tablero.fila_llena, 0)
+    tablero._tocadas = None
+
+    motor.semilla = semilla if estado & CON_SEMILLA else None
+    if rng is None:
+        if palabras is None:
+            rng = random
+        else:
+            # Seguir con las mismas piezas que la partida original
+            rng = random.Random(0)
+            rng.setstate((3, tuple(palabras), None if math.isnan(gauss) else gauss))
+    motor.rng = rng
+    motor.piezas_generadas = piezas_generadas
+    motor.grabacion = None
+    motor.pieza_actual = pieza_actual
+    motor.siguiente_pieza = siguiente_pieza
+    motor.puntuacion = puntuacion
+    motor.lineas = lineas
+    motor.nivel = nivel
+    motor.velocidad = velocidad
+    motor.game_over = bool(estado & GAME_OVER)
+    motor.pausado = bool(estado & PAUSADO)
+    motor.tiempo = tiempo
+    motor.ultimo_movimiento = ultimo_movimiento
+    return motor
+
+
+def guardar(motor, ruta):
+    """
+    Guarda la instantánea de una partida en un fichero.
+
+    Se escribe en un fichero temporal junto al destino y después se
+    reemplaza, así que si el programa se corta a medias sigue estando la
+    instantánea anterior.
+    """
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as fichero:
+        fichero.write(capturar(motor))
+    os.replace(temporal, ruta)
+
+
+def cargar(motor, ruta, rng=None):
+    """Restaura una partida desde un fichero (ver restaurar())."""
+    with open(ruta, "rb") as fichero:
+        return restaurar(motor, fichero.read(), rng)
@@ -4,30 +4,84 @@ main.py - Archivo principal del juego Tetris
 Este módulo inicia el juego Tetris y contiene el bucle principal.
 Utiliza la biblioteca Pygame para los gráficos y la interacción.
 
+La lógica avanza en pasos fijos (ver bucle.py) y el dibujo va aparte:
+se dibuja como máximo FPS veces por segundo y, si el equipo no llega,
+se saltan algunos frames sin que el juego vaya más lento.
+
 Controles:
-- Flecha Izquierda: Mover pieza a la izquierda
-- Flecha Derecha: Mover pieza a la derecha
-- Flecha Abajo: Acelerar caída
+- Flecha Izquierda: Mover pieza a la izquierda (mantener para repetir)
+- Flecha Derecha: Mover pieza a la derecha (mantener para repetir)
+- Flecha Abajo: Acelerar caída (mantener para repetir)
 - Flecha Arriba / Z: Rotar pieza
 - Espacio: Caída instantánea (hard drop)
 - P: Pausar juego
 - R: Reiniciar juego
+- B: Activar/desactivar el modo demostración (juega el bot)
+- M: Activar/desactivar el modo práctica
+- U / Y: Deshacer / rehacer la última pieza (modo práctica)
+- F3: Mostrar/ocultar los tiempos de cada fase del frame (perfilador)
+- F4: Empezar/terminar de guardar los tiempos de cada frame en un CSV
+
+Al cerrar la ventana la partida en curso se guarda (ver instantanea.py) y
+la próxima vez que se abre el juego continúa, en pausa, donde se dejó.
 """
 
+import os
+import random
+
 import pygame
-from game import Game
+from bot import Bot
+from bucle import PasoFijo
+from engine import IZQUIERDA, DERECHA, ABAJO, ROTAR, CAIDA, PAUSA, REINICIAR
+from entrada import AutoRepeticion
+from game import Game, X_PANEL
+import instantanea
+from perfilador import Perfilador
+from renderer import Renderer, MARGEN_PANEL
+from replay import grabar
 
 # =============================================================================
 # CONSTANTES DEL JUEGO
 # =============================================================================
 ANCHO_VENTANA = 500      # Ancho total de la ventana en píxeles
 ALTO_VENTANA = 620       # Alto total de la ventana en píxeles
-FPS = 60                 # Fotogramas por segundo
+FPS = 60                 # Fotogramas por segundo (máximo)
+
+# Salto de frames: si un frame tarda más de FRAME_LENTO ms no se dibuja el
+# siguiente, pero nunca se saltan más de MAX_FRAMES_SALTADOS seguidos
+SALTAR_FRAMES = True
+FRAME_LENTO = 2 * 1000 // FPS
+MAX_FRAMES_SALTADOS = 2
 
 # Colores (RGB)
 COLOR_FONDO = (20, 20, 30)        # Azul oscuro para el fondo
 COLOR_TEXTO = (255, 255, 255)     # Blanco para el texto
 
+# Fichero donde se guarda la grabación de la última sesión (ver replay.py)
+ARCHIVO_REPETICION = "ultima_partida.trpl"
+
+# Fichero con la partida sin terminar para reanudarla (ver instantanea.py)
+ARCHIVO_GUARDADO = "partida_guardada.tsnp"
+
+# Fichero donde se guardan los tiempos de cada frame (tecla F4)
+ARCHIVO_PERFIL = "perfil_frames.csv"
+
+# Fases del frame que mide el perfilador y posición de su recuadro
+FASES = ("espera", "eventos", "logica", "dibujo", "pantalla")
+POSICION_PERFIL = (X_PANEL - MARGEN_PANEL, 400)
+
+# Acción del motor asociada a cada tecla
+TECLAS = {
+    pygame.K_LEFT: IZQUIERDA,
+    pygame.K_RIGHT: DERECHA,
+    pygame.K_DOWN: ABAJO,
+    pygame.K_UP: ROTAR,
+    pygame.K_z: ROTAR,
+    pygame.K_SPACE: CAIDA,
+    pygame.K_p: PAUSA,
+    pygame.K_r: REINICIAR,
+}
+
 
 def main():
     """
@@ -44,8 +98,30 @@ def main():
     pygame.display.set_caption("Tetris - CursoPython")
     reloj = pygame.time.Clock()
     
-    # Crear la instancia del juego
-    juego = Game()
+    # Crear la instancia del juego con una semilla conocida. Si quedó una
+    # partida sin terminar se reanuda en pausa; si no, se graba la sesión
+    # para poder reproducirla después
+    juego = Game(semilla=random.randrange(2 ** 32))
+    grabacion = None
+    try:
+        instantanea.cargar(juego, ARCHIVO_GUARDADO)
+        juego.pausado = True
+    except (OSError, ValueError):
+        grabacion = grabar(juego)
+    renderer = Renderer(COLOR_FONDO)
+    
+    # Lógica a paso fijo y repetición de las teclas mantenidas
+    paso_fijo = PasoFijo()
+    teclado = AutoRepeticion()
+    frames_saltados = 0
+    
+    # Bot para el modo demostración (desactivado al empezar)
+    bot = Bot(anticipar=True)
+    demo = False
+    
+    # Tiempos de cada fase del frame (F3 para verlos, F4 para el CSV)
+    perfilador = Perfilador(FASES)
+    ancho_perfil = ANCHO_VENTANA - POSICION_PERFIL[0]
     
     # Variable para controlar el bucle principal
     ejecutando = True
@@ -54,8 +130,11 @@ def main():
     # BUCLE PRINCIPAL DEL JUEGO
     # ==========================================================================
     while ejecutando:
-        # Limitar los FPS del juego
-        reloj.tick(FPS)
+        perfilador.empezar_frame()
+        
+        # Limitar los FPS del dibujo (devuelve los ms reales del frame)
+        transcurrido = reloj.tick(FPS)
+        perfilador.marcar("espera")
         
         # ---------------------------------------------------------------------
         # MANEJO DE EVENTOS
@@ -65,38 +144,82 @@ def main():
             if evento.type == pygame.QUIT:
                 ejecutando = False
             
-            # Eventos de teclado (solo cuando se presiona la tecla)
+            # Sin foco no llegan las teclas soltadas: se sueltan todas
+            if evento.type == pygame.WINDOWFOCUSLOST:
+                teclado.soltar_todas()
+            
+            # Las teclas del juego se anotan al pulsarlas y al soltarlas;
+            # las acciones se generan en cada paso de lógica
+            if evento.type == pygame.KEYUP and evento.key in TECLAS:
+                teclado.soltar(TECLAS[evento.key])
+            
             if evento.type == pygame.KEYDOWN:
-                if evento.key == pygame.K_LEFT:
-                    juego.mover_izquierda()
-                elif evento.key == pygame.K_RIGHT:
-                    juego.mover_derecha()
-                elif evento.key == pygame.K_DOWN:
-                    juego.mover_abajo()
-                elif evento.key == pygame.K_UP or evento.key == pygame.K_z:
-                    juego.rotar()
-                elif evento.key == pygame.K_SPACE:
-                    juego.caida_instantanea()
-                elif evento.key == pygame.K_p:
-                    juego.pausar()
-                elif evento.key == pygame.K_r:
-                    juego.reiniciar()
+                if evento.key in TECLAS:
+                    teclado.pulsar(TECLAS[evento.key])
+                elif evento.key == pygame.K_b:
+                    demo = not demo
+                elif evento.key == pygame.K_m:
+                    juego.alternar_practica()
+                    # Deshacer no queda en la grabación: se deja de grabar
+                    grabacion = juego.grabacion = None
+                elif evento.key == pygame.K_u:
+                    juego.deshacer()
+                elif evento.key == pygame.K_y:
+                    juego.rehacer()
+                elif evento.key == pygame.K_F3:
+                    perfilador.alternar()
+                    # Al ocultarlo hay que volver a dibujar lo que tapaba
+                    renderer.invalidar()
+                elif evento.key == pygame.K_F4:
+                    perfilador.alternar_csv(ARCHIVO_PERFIL)
+        perfilador.marcar("eventos")
         
         # ---------------------------------------------------------------------
         # ACTUALIZACIÓN DEL ESTADO DEL JUEGO
         # ---------------------------------------------------------------------
-        juego.actualizar()
+        for dt in paso_fijo.pasos(transcurrido):
+            juego.step(teclado.acciones(dt), dt)
+        
+        # En modo demostración el bot coloca una pieza por frame
+        if demo and not juego.pausado:
+            if juego.game_over:
+                juego.step((REINICIAR,))
+            bot.jugar(juego)
+        perfilador.marcar("logica")
         
         # ---------------------------------------------------------------------
         # RENDERIZADO
         # ---------------------------------------------------------------------
-        pantalla.fill(COLOR_FONDO)  # Limpiar pantalla con color de fondo
-        juego.dibujar(pantalla)      # Dibujar todos los elementos del juego
-        pygame.display.flip()        # Actualizar la pantalla
+        # Si el equipo va con retraso se salta el dibujo de este frame
+        if (SALTAR_FRAMES and transcurrido > FRAME_LENTO
+                and frames_saltados < MAX_FRAMES_SALTADOS):
+            frames_saltados += 1
+        else:
+            frames_saltados = 0
+            # Solo se dibujan y se envían a la pantalla las zonas que cambiaron
+            rects = renderer.dibujar(pantalla, juego)
+            rect_perfil = perfilador.dibujar(pantalla, POSICION_PERFIL, ancho_perfil)
+            if rect_perfil:
+                rects.append(rect_perfil)
+            perfilador.marcar("dibujo")
+            if rects:
+                pygame.display.update(rects)
+            perfilador.marcar("pantalla")
+        perfilador.terminar_frame()
     
     # ==========================================================================
     # CIERRE DEL JUEGO
     # ==========================================================================
+    if juego.game_over:
+        if os.path.exists(ARCHIVO_GUARDADO):
+            os.remove(ARCHIVO_GUARDADO)
+    else:
+        instantanea.guardar(juego, ARCHIVO_GUARDADO)
+    # Una partida reanudada no se graba: no empezó en un tablero vacío
+    if grabacion is not None:
+        grabacion.cerrar(juego)
+        grabacion.guardar(ARCHIVO_REPETICION)
+    perfilador.cerrar_csv()
     pygame.quit()
 
 
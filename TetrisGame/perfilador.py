@@ -0,0 +1,223 @@
+"""
+perfilador.py - Medición del tiempo de cada fase del frame
+
+Este módulo contiene la clase Perfilador, que mide con
+time.perf_counter_ns() cuánto tarda cada fase del bucle principal
+(eventos, lógica, dibujo, envío a pantalla...). Sirve para averiguar de
+dónde vienen los tirones en equipos lentos sin usar un profiler externo.
+
+- Guarda las últimas VENTANA muestras de cada fase y calcula sus
+  percentiles p50, p95 y p99.
+- Puede mostrar esos percentiles en un recuadro sobre el panel lateral.
+- Puede escribir una fila por frame en un fichero CSV para analizarlo
+  después (los tiempos van en nanosegundos).
+
+Medir cuesta muy poco (una llamada a perf_counter_ns por fase), así que
+el perfilador puede estar siempre activo. Los percentiles solo se
+calculan al refrescar el recuadro.
+"""
+
+import csv
+from collections import deque
+from time import perf_counter_ns
+
+# =============================================================================
+# CONSTANTES DEL PERFILADOR
+# =============================================================================
+VENTANA = 300              # Frames que se usan para los percentiles (5 s a 60 FPS)
+PERCENTILES = (50, 95, 99)
+REFRESCO = 15              # Frames entre dos actualizaciones del recuadro
+TOTAL = "total"            # Nombre de la "fase" con el frame completo
+
+# Aspecto del recuadro
+COLOR_FONDO_PERFIL = (10, 10, 15)
+COLOR_TEXTO_PERFIL = (180, 220, 180)
+TAMANO_FUENTE_PERFIL = 16
+ALTO_LINEA_PERFIL = 14
+
+
+def percentil(ordenadas, p):
+    """
+    Calcula un percentil por el método del rango más cercano.
+
+    Args:
+        ordenadas (list): Valores ordenados de menor a mayor
+        p (float): Percentil (0-100)
+
+    Returns:
+        El valor del percentil, o 0 si no hay valores
+    """
+    if not ordenadas:
+        return 0
+    indice = min(len(ordenadas) - 1, int(len(ordenadas) * p / 100))
+    return ordenadas[indice]
+
+
+class Perfilador:
+    """
+    Clase que mide la duración de cada fase de los frames.
+
+    Uso en el bucle principal:
+
+        perfilador.empezar_frame()
+        ...                          # eventos
+        perfilador.marcar("eventos")
+        ...                          # lógica
+        perfilador.marcar("logica")
+        perfilador.terminar_frame()
+
+    Cada marca anota el tiempo transcurrido desde la marca anterior (o
+    desde el inicio del frame) en la fase indicada.
+
+    Atributos:
+        fases (tuple): Nombres de las fases, en orden
+        muestras (dict): Últimas duraciones (ns) de cada fase y del total
+        frames (int): Frames medidos desde el inicio
+        visible (bool): Si se muestra el recuadro con los percentiles
+        ruta_csv (str): Fichero CSV en el que se escribe, o None
+    """
+
+    def __init__(self, fases, ventana=VENTANA):
+        """
+        Inicializa el perfilador.
+
+        Args:
+            fases (iterable): Nombres de las fases del frame
+            ventana (int): Número de frames que se guardan por fase
+        """
+        self.fases = tuple(fases)
+        self.muestras = {fase: deque(maxlen=ventana) for fase in self.fases + (TOTAL,)}
+        self.frames = 0
+        self.visible = False
+        self.ruta_csv = None
+        self._fichero_csv = None
+        self._escritor_csv = None
+        self._frame = dict.fromkeys(self.fases, 0)
+        self._inicio = self._marca = perf_counter_ns()
+        self._fuente = None
+        self._recuadro = None
+
+    def empezar_frame(self):
+        """Marca el inicio de un frame."""
+        for fase in self._frame:
+            self._frame[fase] = 0
+        self._inicio = self._marca = perf_counter_ns()
+
+    def marcar(self, fase):
+        """
+        Anota en una fase el tiempo transcurrido desde la marca anterior.
+
+        Args:
+            fase (str): Nombre de la fase que acaba de terminar
+        """
+        ahora = perf_counter_ns()
+        self._frame[fase] += ahora - self._marca
+        self._marca = ahora
+
+    def terminar_frame(self):
+        """Guarda las duraciones del frame y, si se pidió, las escribe al CSV."""
+        total = perf_counter_ns() - self._inicio
+        muestras = self.muestras
+        for fase, duracion in self._frame.items():
+            muestras[fase].append(duracion)
+        muestras[TOTAL].append(total)
+        if self._escritor_csv is not None:
+            self._escritor_csv.writerow(
+                [self.frames, *self._frame.values(), total]
+            )
+        self.frames += 1
+
+    def resumen(self):
+        """
+        Calcula los percentiles de cada fase con las muestras guardadas.
+
+        Returns:
+            dict: {fase: (p50, p95, p99)} en milisegundos
+        """
+        resultado = {}
+        for fase, muestras in self.muestras.items():
+            ordenadas = sorted(muestras)
+            resultado[fase] = tuple(percentil(ordenadas, p) / 1e6 for p in PERCENTILES)
+        return resultado
+
+    # =========================================================================
+    # EXPORTACIÓN A CSV
+    # =========================================================================
+    def abrir_csv(self, ruta):
+        """
+        Empieza a escribir una fila por frame en un fichero CSV.
+
+        Args:
+            ruta (str): Fichero de destino (se sobrescribe)
+        """
+        self.cerrar_csv()
+        self._fichero_csv = open(ruta, "w", newline="")
+        self._escritor_csv = csv.writer(self._fichero_csv)
+        self._escritor_csv.writerow(
+            ["frame", *(f"{fase}_ns" for fase in self.fases), f"{TOTAL}_ns"]
+        )
+        self.ruta_csv = ruta
+
+    def cerrar_csv(self):
+        """Deja de escribir el CSV y cierra el fichero."""
+        if self._fichero_csv is not None:
+            self._fichero_csv.close()
+        self._fichero_csv = None
+        self._escritor_csv = None
+        self.ruta_csv = None
+
+    def alternar_csv(self, ruta):
+        """Empieza o deja de escribir el CSV."""
+        if self.ruta_csv is None:
+            self.abrir_csv(ruta)
+        else:
+            self.cerrar_csv()
+
+    # =========================================================================
+    # RECUADRO EN PANTALLA
+    # =========================================================================
+    def alternar(self):
+        """Muestra u oculta el recuadro de percentiles."""
+        self.visible = not self.visible
+        self._recuadro = None
+
+    def _crear_recuadro(self, ancho):
+        """Renderiza el recuadro con los percentiles actuales."""
+        import pygame
+
+        if self._fuente is None:
+            pygame.font.init()
+            self._fuente = pygame.font.Font(None, TAMANO_FUENTE_PERFIL)
+
+        lineas = ["ms    p50   p95   p99"]
+        for fase, valores in self.resumen().items():
+            lineas.append(f"{fase[:5]:<5} " + " ".join(f"{v:5.2f}" for v in valores))
+        lineas.append("CSV: " + ("grabando" if self.ruta_csv else "no"))
+
+        recuadro = pygame.Surface((ancho, ALTO_LINEA_PERFIL * len(lineas) + 6))
+        recuadro.fill(COLOR_FONDO_PERFIL)
+        for i, linea in enumerate(lineas):
+            texto = self._fuente.render(linea, True, COLOR_TEXTO_PERFIL)
+            recuadro.blit(texto, (3, 3 + i * ALTO_LINEA_PERFIL))
+        return recuadro
+
+    def dibujar(self, pantalla, posicion, ancho):
+        """
+        Dibuja el recuadro de percentiles si está visible.
+
+        El texto solo se vuelve a renderizar cada REFRESCO frames; el
+        resto de frames se copia el recuadro anterior.
+
+        Args:
+            pantalla: Superficie de Pygame donde dibujar
+            posicion (tuple): Esquina superior izquierda (x, y)
+            ancho (int): Ancho del recuadro en píxeles
+
+        Returns:
+            pygame.Rect: Zona modificada, o None si no está visible
+        """
+        if not self.visible:
+            return None
+        if self._recuadro is None or self.frames % REFRESCO == 0:
+            self._recuadro = self._crear_recuadro(ancho)
+        return pantalla.blit(self._recuadro, posicion)
@@ -0,0 +1,213 @@
+"""
+protocolo.py - Mensajes del modo versus en red
+
+Este módulo define el formato de los mensajes que intercambian el
+servidor (servidor.py) y los clientes (cliente_carga.py). Todos los
+mensajes van precedidos de su longitud (4 bytes, little endian) y
+empiezan por un byte que indica su tipo.
+
+Cliente -> servidor:
+    UNIRSE   'H'                       Buscar partida
+    ENTRADA  'E' accion(B)             Acción del motor (IZQUIERDA..CAIDA)
+
+Servidor -> cliente:
+    INICIO   'I' partida(I) jugador(B) semilla(Q) columnas(H) filas(H)
+             num_colores(B) y un RGB(BBB) por color de la paleta
+    DIFF     'D' tick(I) y, por cada jugador con cambios, un bloque:
+             jugador(B) cambios(B) [filas] [pieza] [contadores]
+    FIN      'F' ganador(B)  (255 = empate)
+    ERROR    'X' codigo(B)   Petición rechazada (la conexión sigue abierta)
+
+En los DIFF solo viajan las filas del tablero que han cambiado desde el
+tick anterior (índice + índices de color de la fila), la pieza si se ha
+movido y los contadores si han cambiado. Un tick sin cambios no envía
+nada. Los índices de color de las filas se refieren a la paleta del
+INICIO (el índice 0 es la celda vacía y no va en la paleta), así que el
+cliente no depende de la PALETA del proceso del servidor.
+"""
+
+import struct
+
+from tetromino import TIPOS
+
+# =============================================================================
+# CONSTANTES DEL PROTOCOLO
+# =============================================================================
+LONGITUD = struct.Struct("<I")
+MAX_MENSAJE = 1 << 20          # Un mensaje más largo se considera un error
+
+UNIRSE = b"H"
+ENTRADA = b"E"
+INICIO = b"I"
+DIFF = b"D"
+FIN = b"F"
+ERROR = b"X"
+
+EMPATE = 255
+
+# Códigos de ERROR
+ERROR_EN_PARTIDA = 1           # UNIRSE durante una partida
+
+# Indicadores de lo que incluye el bloque de un jugador en un DIFF
+CAMBIO_FILAS = 1
+CAMBIO_PIEZA = 2
+CAMBIO_CONTADORES = 4
+CAMBIO_GAME_OVER = 8
+
+ESTRUCTURA_INICIO = struct.Struct("<IBQHH")
+ESTRUCTURA_NUM_COLORES = struct.Struct("<B")
+ESTRUCTURA_TICK = struct.Struct("<I")
+ESTRUCTURA_BLOQUE = struct.Struct("<BB")
+ESTRUCTURA_NUM_FILAS = struct.Struct("<H")
+ESTRUCTURA_FILA = struct.Struct("<H")
+# tipo, rotación, x, y de la pieza actual y tipo de la siguiente
+ESTRUCTURA_PIEZA = struct.Struct("<BBhhB")
+# puntuación, líneas, nivel
+ESTRUCTURA_CONTADORES = struct.Struct("<IIH")
+
+INDICE_TIPO = {tipo: i for i, tipo in enumerate(TIPOS)}
+
+
+def empaquetar(cuerpo):
+    """
+    Añade la longitud delante de un mensaje.
+
+    Args:
+        cuerpo (bytes): Mensaje (tipo + datos)
+
+    Returns:
+        bytes: Mensaje listo para enviar
+    """
+    return LONGITUD.pack(len(cuerpo)) + cuerpo
+
+
+def empaquetar_paleta(paleta):
+    """
+    Codifica una paleta para el mensaje INICIO.
+
+    Args:
+        paleta (list): Colores RGB por índice; el 0 (celda vacía) no se envía
+
+    Returns:
+        bytes: Número de colores y sus componentes RGB
+    """
+    colores = paleta[1:]
+    return ESTRUCTURA_NUM_COLORES.pack(len(colores)) + b"".join(bytes(c) for c in colores)
+
+
+def leer_inicio(mensaje):
+    """
+    Decodifica un mensaje INICIO.
+
+    Args:
+        mensaje (bytes): Mensaje completo (empieza por INICIO)
+
+    Returns:
+        tuple: (partida, jugador, semilla, columnas, filas, paleta), con
+        la paleta como lista de RGB por índice (None en el 0)
+    """
+    campos = ESTRUCTURA_INICIO.unpack_from(mensaje, 1)
+    posicion = 1 + ESTRUCTURA_INICIO.size
+    (num,) = ESTRUCTURA_NUM_COLORES.unpack_from(mensaje, posicion)
+    posicion += ESTRUCTURA_NUM_COLORES.size
+    paleta = [None] + [tuple(mensaje[posicion + 3 * i:posicion + 3 * i + 3]) for i in range(num)]
+    return campos + (paleta,)
+
+
+async def leer_mensaje(lector):
+    """
+    Lee un mensaje completo de un stream de asyncio.
+
+    Args:
+        lector (asyncio.StreamReader): Stream de entrada
+
+    Returns:
+        bytes: Mensaje sin la longitud
+
+    Raises:
+        asyncio.IncompleteReadError: Si se cierra la conexión
+        ValueError: Si la longitud no es válida
+    """
+    (longitud,) = LONGITUD.unpack(await lector.readexactly(LONGITUD.size))
+    if longitud == 0 or longitud > MAX_MENSAJE:
+        raise ValueError(f"Longitud de mensaje no válida: {longitud}")
+    return await lector.readexactly(longitud)
+
+
+def estado_pieza(motor):
+    """Valores de la pieza actual y la siguiente tal como van en un DIFF."""
+    pieza = motor.pieza_actual
+    return (INDICE_TIPO[pieza.tipo], pieza.rotacion_actual, pieza.x, pieza.y,
+            INDICE_TIPO[motor.siguiente_pieza.tipo])
+
+
+def estado_contadores(motor):
+    """Valores de los contadores de una partida tal como van en un DIFF."""
+    return (motor.puntuacion, motor.lineas, motor.nivel)
+
+
+class Espejo:
+    """
+    Copia del estado de los jugadores de una partida a partir de los DIFF.
+
+    La usa el cliente para reconstruir lo que ve. Empieza con los tableros
+    vacíos, igual que el servidor.
+
+    Atributos:
+        tick (int): Último tick recibido
+        filas (list): Por jugador, un bytearray de índices de color por fila
+        piezas (list): Por jugador, (tipo, rotación, x, y, siguiente)
+        contadores (list): Por jugador, (puntuación, líneas, nivel)
+        game_over (list): Por jugador, si ha perdido
+        paleta (list): Color RGB de cada índice de las filas (None = vacía)
+    """
+
+    def __init__(self, jugadores, columnas, filas, paleta=None):
+        """
+        Inicializa el espejo con los tableros vacíos.
+
+        Args:
+            jugadores (int): Número de jugadores de la partida
+            columnas (int): Columnas del tablero
+            filas (int): Filas del tablero
+            paleta (list, opcional): Paleta recibida en el INICIO
+        """
+        self.tick = 0
+        self.paleta = paleta or [None]
+        self.filas = [[bytearray(columnas) for _ in range(filas)] for _ in range(jugadores)]
+        self.piezas = [None] * jugadores
+        self.contadores = [(0, 0, 1)] * jugadores
+        self.game_over = [False] * jugadores
+        self._columnas = columnas
+
+    def aplicar(self, mensaje):
+        """
+        Aplica un mensaje DIFF.
+
+        Args:
+            mensaje (bytes): Mensaje completo (empieza por DIFF)
+        """
+        vista = memoryview(mensaje)
+        (self.tick,) = ESTRUCTURA_TICK.unpack_from(vista, 1)
+        posicion = 1 + ESTRUCTURA_TICK.size
+        columnas = self._columnas
+        while posicion < len(vista):
+            jugador, cambios = ESTRUCTURA_BLOQUE.unpack_from(vista, posicion)
+            posicion += ESTRUCTURA_BLOQUE.size
+            if cambios & CAMBIO_FILAS:
+                (num,) = ESTRUCTURA_NUM_FILAS.unpack_from(vista, posicion)
+                posicion += ESTRUCTURA_NUM_FILAS.size
+                filas = self.filas[jugador]
+                for _ in range(num):
+                    (fila,) = ESTRUCTURA_FILA.unpack_from(vista, posicion)
+                    posicion += ESTRUCTURA_FILA.size
+                    filas[fila][:] = vista[posicion:posicion + columnas]
+                    posicion += columnas
+            if cambios & CAMBIO_PIEZA:
+                self.piezas[jugador] = ESTRUCTURA_PIEZA.unpack_from(vista, posicion)
+                posicion += ESTRUCTURA_PIEZA.size
+            if cambios & CAMBIO_CONTADORES:
+                self.contadores[jugador] = ESTRUCTURA_CONTADORES.unpack_from(vista, posicion)
+                posicion += ESTRUCTURA_CONTADORES.size
+            if cambios & CAMBIO_GAME_OVER:
+                self.game_over[jugador] = True
@@ -0,0 +1,246 @@
+"""
+renderer.py - Dibujo incremental del Tetris (rectángulos sucios)
+
+Redibujar las 200 celdas del tablero y enviar la ventana entera a la
+pantalla en cada frame es lo que más CPU consume en equipos lentos.
+Este módulo contiene la clase Renderer, que:
+
+1. Guarda una superficie ya dibujada (sprite) por cada color de celda.
+2. Recuerda qué había en cada celda en el frame anterior.
+3. Solo copia (blit) las celdas y zonas del panel que han cambiado.
+4. Devuelve la lista de rectángulos modificados para pasarla a
+   pygame.display.update(rects) en lugar de pygame.display.flip().
+"""
+
+import pygame
+from board import (
+    PALETA, indice_color, TAMANO_CELDA, MARGEN_X, MARGEN_Y,
+    COLOR_BORDE, COLOR_VACIO, COLOR_LINEA,
+)
+from game import X_PANEL
+
+# =============================================================================
+# CONSTANTES DEL RENDERER
+# =============================================================================
+COLOR_MARCO = (200, 200, 200)     # Color del borde exterior del tablero
+MARGEN_PANEL = 10                 # Espacio libre a la izquierda del panel
+
+# Estilos de sprite de una celda
+CELDA = 0        # Celda del tablero (vacía o con un bloque fijado)
+PIEZA = 1        # Bloque de la pieza que cae
+FANTASMA = 2     # Contorno de la sombra de la pieza que cae
+
+
+class Renderer:
+    """
+    Clase que dibuja el juego actualizando solo lo que ha cambiado.
+
+    El primer frame, y cada vez que aparece o desaparece un mensaje
+    central (pausa, game over), se dibuja la ventana entera. El resto de
+    frames solo se dibujan las celdas cuyo contenido cambió y el panel
+    lateral si cambió alguno de sus valores.
+
+    En tableros más grandes que la ventana solo se tienen en cuenta las
+    celdas de la vista (Board.vista); si la vista se desplaza se vuelven
+    a dibujar todas sus celdas.
+
+    Atributos:
+        color_fondo (tuple): Color RGB del fondo de la ventana
+        sprites (dict): Superficies de celda ya dibujadas por color y estilo
+        celdas_previas (list): Índices de color de cada fila de la vista
+            en el último frame dibujado
+        vista_previa (tuple): Vista del tablero en el último frame
+        pieza_previa (dict): Celdas {(x, y): (índice, estilo)} de la pieza
+            y su sombra en el último frame dibujado
+        clave_panel (tuple): Valores del panel en el último frame
+        clave_mensaje (tuple): Estado de pausa/game over del último frame
+    """
+
+    def __init__(self, color_fondo):
+        """
+        Inicializa el renderer sin nada dibujado.
+
+        Args:
+            color_fondo (tuple): Color RGB del fondo de la ventana
+        """
+        self.color_fondo = color_fondo
+        self.sprites = {}
+        self.invalidar()
+
+    def invalidar(self):
+        """Fuerza a que el siguiente frame se dibuje completo."""
+        self.celdas_previas = None
+        self.vista_previa = None
+        self.pieza_previa = {}
+        self.clave_panel = None
+        self.clave_mensaje = None
+
+    def _sprite(self, indice, estilo):
+        """
+        Obtiene la superficie de una celda, creándola la primera vez.
+
+        Args:
+            indice (int): Índice del color en la PALETA (0 = vacía)
+            estilo (int): CELDA, PIEZA (borde más grueso) o FANTASMA
+                (celda vacía con el contorno del color de la pieza)
+
+        Returns:
+            pygame.Surface: Superficie de TAMANO_CELDA x TAMANO_CELDA
+        """
+        clave = (indice, estilo)
+        sprite = self.sprites.get(clave)
+        if sprite is None:
+            sprite = pygame.Surface((TAMANO_CELDA, TAMANO_CELDA))
+            rect = sprite.get_rect()
+            if estilo == PIEZA:
+                sprite.fill(PALETA[indice])
+                pygame.draw.rect(sprite, COLOR_BORDE, rect, 2)
+            elif estilo == FANTASMA:
+                sprite.fill(COLOR_VACIO)
+                pygame.draw.rect(sprite, COLOR_LINEA, rect, 1)
+                pygame.draw.rect(sprite, PALETA[indice], rect, 2)
+            else:
+                sprite.fill(PALETA[indice] or COLOR_VACIO)
+                pygame.draw.rect(sprite, COLOR_LINEA, rect, 1)
+            sprite = sprite.convert() if pygame.display.get_surface() else sprite
+            self.sprites[clave] = sprite
+        return sprite
+
+    def _celdas_pieza(self, juego, vista):
+        """
+        Calcula las celdas visibles que ocupan la pieza actual y su sombra.
+
+        Donde se solapan, la pieza tapa a la sombra.
+
+        Args:
+            juego (Game): Partida a dibujar
+            vista (tuple): (columna, fila, columnas, filas) visibles
+
+        Returns:
+            dict: {(x, y): (índice de color, estilo)} de cada bloque
+            visible, en coordenadas del tablero
+        """
+        col0, fila0, ancho, alto = vista
+        pieza = juego.pieza_actual
+        indice = indice_color(pieza.color)
+        bloques = pieza.geometria.bloques
+        celdas = {}
+        for fila, estilo in ((juego.tablero.fila_caida(pieza), FANTASMA), (pieza.y, PIEZA)):
+            for dx, dy in bloques:
+                x = pieza.x + dx
+                y = fila + dy
+                if col0 <= x < col0 + ancho and fila0 <= y < fila0 + alto:
+                    celdas[(x, y)] = (indice, estilo)
+        return celdas
+
+    @staticmethod
+    def _filas_vista(tablero, vista):
+        """Copia los índices de color de las filas visibles."""
+        col0, fila0, ancho, alto = vista
+        colores = tablero.colores
+        return [bytes(colores[y][col0:col0 + ancho]) for y in range(fila0, fila0 + alto)]
+
+    def _rect_panel(self, pantalla):
+        """Rectángulo de la ventana que ocupa el panel lateral."""
+        x = X_PANEL - MARGEN_PANEL
+        return pygame.Rect(x, 0, pantalla.get_width() - x, pantalla.get_height())
+
+    def _rect_marco(self, vista):
+        """Rectángulo del borde exterior de la vista del tablero."""
+        return pygame.Rect(
+            MARGEN_X - 2,
+            MARGEN_Y - 2,
+            vista[2] * TAMANO_CELDA + 4,
+            vista[3] * TAMANO_CELDA + 4
+        )
+
+    def dibujar(self, pantalla, juego):
+        """
+        Dibuja el frame actual y devuelve las zonas modificadas.
+
+        Args:
+            pantalla: Superficie de Pygame donde dibujar
+            juego (Game): Partida a dibujar
+
+        Returns:
+            list: Rectángulos modificados, para pygame.display.update()
+        """
+        tablero = juego.tablero
+        vista = tablero.vista(juego.pieza_actual)
+        clave_mensaje = (juego.pausado, juego.game_over)
+        clave_panel = (juego.siguiente_pieza.tipo, juego.puntuacion,
+                       juego.nivel, juego.lineas, juego.practica)
+
+        # Frame completo: primera vez o cambio del mensaje central
+        if self.celdas_previas is None or clave_mensaje != self.clave_mensaje:
+            pantalla.fill(self.color_fondo)
+            juego.dibujar(pantalla)
+            self.celdas_previas = self._filas_vista(tablero, vista)
+            self.vista_previa = vista
+            self.pieza_previa = self._celdas_pieza(juego, vista)
+            self.clave_panel = clave_panel
+            self.clave_mensaje = clave_mensaje
+            return [pantalla.get_rect()]
+
+        # Con un mensaje en pantalla no cambia nada debajo de él
+        if juego.pausado or juego.game_over:
+            return []
+
+        rects = []
+        col0, fila0, ancho, alto = vista
+        colores = tablero.colores
+
+        # Celdas sucias: las que cambiaron en el tablero y las que ocupaban
+        # la pieza o su sombra antes o las ocupan ahora (si no siguen igual).
+        # Si la vista se ha desplazado, todas las celdas visibles.
+        pieza = self._celdas_pieza(juego, vista)
+        if vista != self.vista_previa:
+            sucias = {
+                (x, y)
+                for y in range(fila0, fila0 + alto)
+                for x in range(col0, col0 + ancho)
+            }
+            self.celdas_previas = self._filas_vista(tablero, vista)
+            self.vista_previa = vista
+        else:
+            previa = self.pieza_previa
+            sucias = {
+                celda for celda in previa.keys() | pieza.keys()
+                if previa.get(celda) != pieza.get(celda)
+            }
+            previas = self.celdas_previas
+            for i in range(alto):
+                fila = colores[fila0 + i][col0:col0 + ancho]
+                if fila != previas[i]:
+                    anterior = previas[i]
+                    for x in range(ancho):
+                        if fila[x] != anterior[x]:
+                            sucias.add((col0 + x, fila0 + i))
+                    previas[i] = bytes(fila)
+
+        if sucias:
+            sprite = self._sprite
+            for x, y in sucias:
+                celda = pieza.get((x, y))
+                if celda is None:
+                    imagen = sprite(colores[y][x], CELDA)
+                else:
+                    imagen = sprite(*celda)
+                rects.append(pantalla.blit(
+                    imagen,
+                    (MARGEN_X + (x - col0) * TAMANO_CELDA,
+                     MARGEN_Y + (y - fila0) * TAMANO_CELDA)
+                ))
+            # Las celdas del borde pisan un píxel del marco exterior
+            pygame.draw.rect(pantalla, COLOR_MARCO, self._rect_marco(vista), 3)
+        self.pieza_previa = pieza
+
+        # Panel lateral: solo si cambió alguno de sus valores
+        if clave_panel != self.clave_panel:
+            rect = self._rect_panel(pantalla)
+            pantalla.fill(self.color_fondo, rect)
+            juego.dibujar_panel(pantalla)
+            rects.append(rect)
+            self.clave_panel = clave_panel
+
+        return rects
@@ -0,0 +1,361 @@
+"""
+replay.py - Grabación y reproducción determinista de partidas del Tetris
+
+Como el motor (engine.py) no lee ningún reloj y elige las piezas con un
+generador con semilla, una partida queda determinada por:
+1. La semilla del generador.
+2. La lista de acciones con el instante (en ms) en que se aplicaron.
+
+Este módulo guarda exactamente eso en un formato binario compacto y
+permite volver a jugar la grabación sin ventana a la máxima velocidad
+(para reproducir errores y como prueba de regresión) o verla en
+pantalla a cualquier múltiplo del tiempo real.
+
+Formato del fichero (.trpl):
+    Cabecera fija (little endian, ver CABECERA) con la semilla, el
+    tamaño del tablero, la duración, el número de eventos y el estado
+    final esperado. Después,
+    los eventos comprimidos con zlib: cada evento es un entero varint
+    igual a (ms desde el evento anterior << 3) | acción.
+
+Uso desde la carpeta TetrisGame:
+
+    python replay.py ultima_partida.trpl --verificar
+    python replay.py ultima_partida.trpl --velocidad 4
+"""
+
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+from board import COLUMNAS, FILAS
+from engine import Engine
+
+# =============================================================================
+# CONSTANTES DEL FORMATO
+# =============================================================================
+MAGICO = b"TRPL"
+VERSION = 2
+# magico, version, semilla, columnas, filas, duracion, eventos, puntuacion,
+# lineas, huella
+CABECERA = struct.Struct("<4sBQHHIIIII")
+# La versión 1 no guardaba el tamaño del tablero (siempre era el de defecto)
+CABECERA_V1 = struct.Struct("<4sBQIIIII")
+BITS_ACCION = 3            # Las acciones (0-6) caben en 3 bits
+
+
+def huella(motor):
+    """
+    Calcula una huella (CRC32) del estado de una partida.
+
+    Incluye el tablero, las piezas y los contadores, así que dos partidas
+    con la misma huella están, en la práctica, en el mismo estado.
+
+    Args:
+        motor (Engine): Partida
+
+    Returns:
+        int: Huella de 32 bits
+    """
+    datos = [b"".join(motor.tablero.colores)]
+    for pieza in (motor.pieza_actual, motor.siguiente_pieza):
+        datos.append(f"{pieza.tipo}{pieza.rotacion_actual},{pieza.x},{pieza.y};".encode())
+    datos.append(f"{motor.puntuacion},{motor.lineas},{motor.nivel},{motor.game_over}".encode())
+    return zlib.crc32(b"".join(datos))
+
+
+def _escribir_varint(salida, valor):
+    """Añade un entero no negativo en formato varint (7 bits por byte)."""
+    while valor >= 0x80:
+        salida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    salida.append(valor)
+
+
+def _leer_varints(datos):
+    """Genera los enteros varint de una secuencia de bytes."""
+    valor = 0
+    desplazamiento = 0
+    for byte in datos:
+        valor |= (byte & 0x7F) << desplazamiento
+        if byte & 0x80:
+            desplazamiento += 7
+        else:
+            yield valor
+            valor = 0
+            desplazamiento = 0
+
+
+class Grabacion:
+    """
+    Clase que guarda la semilla y las acciones de una partida.
+
+    Atributos:
+        semilla (int): Semilla del generador de piezas
+        columnas (int): Columnas del tablero
+        filas (int): Filas del tablero
+        eventos (list): Tuplas (tiempo_ms, accion) en orden
+        duracion (int): Tiempo final de la partida en ms
+        puntuacion (int): Puntuación final esperada
+        lineas (int): Líneas finales esperadas
+        huella (int): Huella del estado final esperado
+    """
+
+    def __init__(self, semilla, columnas=COLUMNAS, filas=FILAS):
+        """
+        Inicializa una grabación vacía.
+
+        Args:
+            semilla (int): Semilla del generador de piezas
+            columnas (int): Columnas del tablero
+            filas (int): Filas del tablero
+        """
+        self.semilla = semilla
+        self.columnas = columnas
+        self.filas = filas
+        self.eventos = []
+        self.duracion = 0
+        self.puntuacion = 0
+        self.lineas = 0
+        self.huella = 0
+
+    def registrar(self, tiempo, entradas):
+        """
+        Añade acciones aplicadas en un instante (lo llama Engine.step).
+
+        Args:
+            tiempo (int): Tiempo del motor en ms
+            entradas (iterable): Códigos de acción
+        """
+        for accion in entradas:
+            self.eventos.append((tiempo, accion))
+
+    def cerrar(self, motor):
+        """
+        Anota el estado final de la partida para poder verificarla.
+
+        Args:
+            motor (Engine): Partida grabada
+        """
+        self.duracion = motor.tiempo
+        self.puntuacion = motor.puntuacion
+        self.lineas = motor.lineas
+        self.huella = huella(motor)
+
+    def a_bytes(self):
+        """
+        Codifica la grabación en el formato binario.
+
+        Returns:
+            bytes: Contenido del fichero .trpl
+        """
+        cuerpo = bytearray()
+        anterior = 0
+        for tiempo, accion in self.eventos:
+            _escribir_varint(cuerpo, ((tiempo - anterior) << BITS_ACCION) | accion)
+            anterior = tiempo
+        cabecera = CABECERA.pack(
+            MAGICO, VERSION, self.semilla, self.columnas, self.filas,
+            self.duracion, len(self.eventos),
+            self.puntuacion, self.lineas, self.huella
+        )
+        return cabecera + zlib.compress(bytes(cuerpo), 9)
+
+    @classmethod
+    def desde_bytes(cls, datos):
+        """
+        Decodifica una grabación del formato binario.
+
+        Args:
+            datos (bytes): Contenido de un fichero .trpl
+
+        Returns:
+            Grabacion: La grabación leída
+
+        Raises:
+            ValueError: Si los datos no son una grabación válida
+        """
+        if len(datos) < CABECERA_V1.size:
+            raise ValueError("Grabación demasiado corta")
+        if datos[:4] != MAGICO or datos[4] not in (1, VERSION):
+            raise ValueError("No es una grabación de Tetris compatible")
+
+        if datos[4] == 1:
+            cabecera = CABECERA_V1
+            (_, _, semilla, duracion, num_eventos,
+             puntuacion, lineas, valor_huella) = cabecera.unpack_from(datos)
+            columnas, filas = COLUMNAS, FILAS
+        else:
+            cabecera = CABECERA
+            if len(datos) < cabecera.size:
+                raise ValueError("Grabación demasiado corta")
+            (_, _, semilla, columnas, filas, duracion, num_eventos,
+             puntuacion, lineas, valor_huella) = cabecera.unpack_from(datos)
+
+        grabacion = cls(semilla, columnas, filas)
+        grabacion.duracion = duracion
+        grabacion.puntuacion = puntuacion
+        grabacion.lineas = lineas
+        grabacion.huella = valor_huella
+
+        mascara = (1 << BITS_ACCION) - 1
+        tiempo = 0
+        for valor in _leer_varints(zlib.decompress(datos[cabecera.size:])):
+            tiempo += valor >> BITS_ACCION
+            grabacion.eventos.append((tiempo, valor & mascara))
+        if len(grabacion.eventos) != num_eventos:
+            raise ValueError("La grabación está incompleta")
+        return grabacion
+
+    def guardar(self, ruta):
+        """Guarda la grabación en un fichero."""
+        with open(ruta, "wb") as fichero:
+            fichero.write(self.a_bytes())
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga una grabación de un fichero."""
+        with open(ruta, "rb") as fichero:
+            return cls.desde_bytes(fichero.read())
+
+
+def grabar(motor):
+    """
+    Empieza a grabar las acciones que se apliquen con motor.step().
+
+    Args:
+        motor (Engine): Partida recién creada con una semilla conocida
+
+    Returns:
+        Grabacion: La grabación, que se va llenando durante la partida
+
+    Raises:
+        ValueError: Si la partida no tiene semilla
+    """
+    if motor.semilla is None:
+        raise ValueError("Solo se pueden grabar partidas creadas con una semilla")
+    tablero = motor.tablero
+    motor.grabacion = Grabacion(motor.semilla, tablero.columnas, tablero.filas)
+    return motor.grabacion
+
+
+def avanzar(motor, grabacion, indice, hasta):
+    """
+    Aplica los eventos de una grabación hasta un instante.
+
+    Args:
+        motor (Engine): Partida que se está reproduciendo
+        grabacion (Grabacion): Grabación a reproducir
+        indice (int): Primer evento aún no aplicado
+        hasta (int): Instante (ms) hasta el que avanzar
+
+    Returns:
+        int: Índice del primer evento que queda por aplicar
+    """
+    eventos = grabacion.eventos
+    step = motor.step
+    while indice < len(eventos) and eventos[indice][0] <= hasta:
+        tiempo, accion = eventos[indice]
+        step((), tiempo - motor.tiempo)
+        step((accion,))
+        indice += 1
+    step((), hasta - motor.tiempo)
+    return indice
+
+
+def reproducir(grabacion):
+    """
+    Vuelve a jugar una grabación sin ventana, lo más rápido posible.
+
+    Args:
+        grabacion (Grabacion): Grabación a reproducir
+
+    Returns:
+        Engine: La partida en su estado final
+    """
+    motor = Engine(semilla=grabacion.semilla, columnas=grabacion.columnas,
+                   filas=grabacion.filas)
+    avanzar(motor, grabacion, 0, grabacion.duracion)
+    return motor
+
+
+def verificar(grabacion):
+    """
+    Comprueba que una grabación llega al mismo estado final.
+
+    Args:
+        grabacion (Grabacion): Grabación a comprobar
+
+    Returns:
+        bool: True si la huella final coincide con la grabada
+    """
+    return huella(reproducir(grabacion)) == grabacion.huella
+
+
+def ver(grabacion, velocidad=1.0):
+    """
+    Muestra una grabación en una ventana a un múltiplo del tiempo real.
+
+    Args:
+        grabacion (Grabacion): Grabación a mostrar
+        velocidad (float): Multiplicador del tiempo real (2 = el doble)
+    """
+    import pygame
+    from game import Game
+    from main import ANCHO_VENTANA, ALTO_VENTANA, COLOR_FONDO, FPS
+    from renderer import Renderer
+
+    pygame.init()
+    pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
+    pygame.display.set_caption(f"Tetris - Repetición x{velocidad:g}")
+    reloj = pygame.time.Clock()
+
+    juego = Game(semilla=grabacion.semilla,
+                 columnas=grabacion.columnas, filas=grabacion.filas)
+    renderer = Renderer(COLOR_FONDO)
+    indice = 0
+    inicio = pygame.time.get_ticks()
+    ejecutando = True
+    while ejecutando:
+        reloj.tick(FPS)
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT:
+                ejecutando = False
+
+        objetivo = int((pygame.time.get_ticks() - inicio) * velocidad)
+        objetivo = min(objetivo, grabacion.duracion)
+        indice = avanzar(juego, grabacion, indice, objetivo)
+
+        rects = renderer.dibujar(pantalla, juego)
+        if rects:
+            pygame.display.update(rects)
+
+    pygame.quit()
+
+
+def main():
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Repeticiones del Tetris")
+    parser.add_argument("fichero", help="Grabación .trpl")
+    parser.add_argument("--verificar", action="store_true",
+                        help="Reproducir sin ventana y comprobar el estado final")
+    parser.add_argument("--velocidad", type=float, default=1.0,
+                        help="Multiplicador del tiempo real al mostrarla")
+    args = parser.parse_args()
+
+    grabacion = Grabacion.cargar(args.fichero)
+    if args.verificar:
+        inicio = time.perf_counter()
+        correcta = verificar(grabacion)
+        segundos = time.perf_counter() - inicio
+        print(f"{len(grabacion.eventos)} eventos, {grabacion.duracion / 1000:.0f} s de "
+              f"partida, verificada en {segundos * 1000:.1f} ms: "
+              f"{'OK' if correcta else 'DIFERENTE'}")
+        sys.exit(0 if correcta else 1)
+    ver(grabacion, args.velocidad)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+selfplay.py - Partidas automáticas en paralelo y ajuste de pesos del bot
+
+Este módulo juega muchas partidas del bot sin ventana repartidas entre
+varios procesos (una partida por tarea, así que escala con el número de
+núcleos) y resume los resultados. También incluye una búsqueda evolutiva
+(método de entropía cruzada) para ajustar los pesos de la heurística.
+
+Los resultados se guardan en un fichero de checkpoint después de cada
+partida (modo partidas) o de cada generación (modo evolución). Si la
+ejecución se interrumpe, al relanzar el mismo comando se continúa
+donde se quedó.
+
+Uso desde la carpeta TetrisGame:
+
+    python selfplay.py --procesos 8 --checkpoint partidas.jsonl partidas --partidas 200
+    python selfplay.py --checkpoint evolucion.json evolucion --generaciones 30
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from bot import Bot, PESOS_DEFECTO
+from engine import Engine
+
+# =============================================================================
+# CONSTANTES DEL ARNÉS
+# =============================================================================
+MAX_PIEZAS = 2000          # Límite de piezas por partida (un buen bot no pierde)
+POBLACION = 24             # Candidatos por generación en la evolución
+FRACCION_ELITE = 0.25      # Parte de la población que se usa para actualizar
+DESVIACION_INICIAL = 0.5   # Desviación inicial de cada peso
+DESVIACION_MINIMA = 0.02   # Evita que la búsqueda se congele demasiado pronto
+
+CARACTERISTICAS = tuple(PESOS_DEFECTO)
+
+
+def jugar_partida(tarea):
+    """
+    Juega una partida completa del bot sin ventana.
+
+    Args:
+        tarea (tuple): (semilla, pesos, anticipar, max_piezas)
+
+    Returns:
+        dict: Semilla, puntuación, líneas, nivel, piezas y segundos
+    """
+    semilla, pesos, anticipar, max_piezas = tarea
+    motor = Engine(semilla=semilla)
+    bot = Bot(pesos=pesos, anticipar=anticipar)
+
+    inicio = time.perf_counter()
+    piezas = 0
+    while not motor.game_over and piezas < max_piezas:
+        bot.jugar(motor)
+        piezas += 1
+
+    return {
+        'semilla': semilla,
+        'puntuacion': motor.puntuacion,
+        'lineas': motor.lineas,
+        'nivel': motor.nivel,
+        'piezas': piezas,
+        'segundos': time.perf_counter() - inicio,
+    }
+
+
+def resumir(resultados, segundos_reales=None):
+    """
+    Agrega los resultados de varias partidas.
+
+    Args:
+        resultados (list): Diccionarios devueltos por jugar_partida
+        segundos_reales (float, opcional): Tiempo real de la ejecución
+
+    Returns:
+        dict: Medias, máximos y velocidad en piezas por segundo
+    """
+    n = len(resultados)
+    if n == 0:
+        return {'partidas': 0}
+
+    piezas = sum(r['piezas'] for r in resultados)
+    segundos = sum(r['segundos'] for r in resultados)
+    resumen = {
+        'partidas': n,
+        'puntuacion_media': sum(r['puntuacion'] for r in resultados) / n,
+        'puntuacion_maxima': max(r['puntuacion'] for r in resultados),
+        'lineas_media': sum(r['lineas'] for r in resultados) / n,
+        'nivel_medio': sum(r['nivel'] for r in resultados) / n,
+        'nivel_maximo': max(r['nivel'] for r in resultados),
+        'piezas_por_segundo_proceso': piezas / segundos if segundos else 0.0,
+    }
+    if segundos_reales:
+        resumen['piezas_por_segundo_total'] = piezas / segundos_reales
+    return resumen
+
+
+def _leer_checkpoint_partidas(ruta):
+    """Lee las partidas ya jugadas de un checkpoint JSON Lines."""
+    if not ruta or not os.path.exists(ruta):
+        return []
+    resultados = []
+    with open(ruta) as fichero:
+        for linea in fichero:
+            linea = linea.strip()
+            if linea:
+                try:
+                    resultados.append(json.loads(linea))
+                except json.JSONDecodeError:
+                    continue  # Línea a medio escribir por una interrupción
+    return resultados
+
+
+def _quitar_linea_incompleta(ruta):
+    """
+    Recorta un checkpoint JSON Lines hasta su último salto de línea.
+
+    Si la ejecución se interrumpió a mitad de una escritura, el fichero
+    termina en una línea incompleta; sin recortarla, el siguiente resultado
+    se añadiría pegado a ella y también se perdería.
+    """
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, 'rb+') as fichero:
+        datos = fichero.read()
+        if datos and not datos.endswith(b"\n"):
+            fichero.truncate(datos.rfind(b"\n") + 1)
+
+
+def jugar_lote(semillas, pesos=None, anticipar=False, procesos=None,
+               max_piezas=MAX_PIEZAS, checkpoint=None):
+    """
+    Juega una partida por semilla repartiendo el trabajo entre procesos.
+
+    Las semillas que ya aparecen en el checkpoint con la misma configuración
+    (pesos, anticipar y max_piezas) no se vuelven a jugar. Cada resultado
+    guarda su configuración, así que un mismo checkpoint puede contener
+    varias sin que se mezclen.
+
+    Args:
+        semillas (iterable): Semillas de las partidas
+        pesos (dict, opcional): Pesos del bot
+        anticipar (bool): Si el bot prueba también la siguiente pieza
+        procesos (int, opcional): Número de procesos (por defecto, núcleos)
+        max_piezas (int): Límite de piezas por partida
+        checkpoint (str, opcional): Fichero JSON Lines de resultados
+
+    Returns:
+        list: Resultados de todas las partidas, ordenados por semilla
+    """
+    semillas = list(semillas)
+    pesos = dict(PESOS_DEFECTO if pesos is None else pesos)
+    configuracion = {'pesos': pesos, 'anticipar': anticipar, 'max_piezas': max_piezas}
+    hechas = {r['semilla']: r for r in _leer_checkpoint_partidas(checkpoint)
+              if r.get('configuracion') == configuracion}
+    tareas = [(s, pesos, anticipar, max_piezas) for s in semillas if s not in hechas]
+
+    if tareas:
+        if checkpoint:
+            _quitar_linea_incompleta(checkpoint)
+        fichero = open(checkpoint, 'a') if checkpoint else None
+        try:
+            with Pool(procesos) as pool:
+                for resultado in pool.imap_unordered(jugar_partida, tareas):
+                    resultado['configuracion'] = configuracion
+                    hechas[resultado['semilla']] = resultado
+                    if fichero:
+                        fichero.write(json.dumps(resultado) + "\n")
+                        fichero.flush()
+        finally:
+            if fichero:
+                fichero.close()
+
+    return [hechas[s] for s in sorted(semillas)]
+
+
+def _guardar_json(ruta, datos):
+    """Escribe un JSON de forma atómica (fichero temporal + reemplazo)."""
+    temporal = ruta + ".tmp"
+    with open(temporal, 'w') as fichero:
+        json.dump(datos, fichero, indent=2)
+    os.replace(temporal, ruta)
+
+
+def evolucionar(generaciones, partidas=8, poblacion=POBLACION, anticipar=False,
+                procesos=None, max_piezas=MAX_PIEZAS, semilla=0,
+                checkpoint=None, informar=print):
+    """
+    Ajusta los pesos del bot con el método de entropía cruzada.
+
+    En cada generación se sortean candidatos alrededor de la media actual,
+    cada uno juega las mismas partidas (mismas semillas) y la media y la
+    desviación se recalculan con los mejores. La aptitud es la media de
+    líneas eliminadas.
+
+    Args:
+        generaciones (int): Número total de generaciones
+        partidas (int): Partidas por candidato
+        poblacion (int): Candidatos por generación
+        anticipar (bool): Si el bot prueba también la siguiente pieza
+        procesos (int, opcional): Número de procesos
+        max_piezas (int): Límite de piezas por partida
+        semilla (int): Semilla de la búsqueda
+        checkpoint (str, opcional): Fichero JSON con el estado de la búsqueda.
+            Solo se reanuda si se creó con la misma semilla, población,
+            partidas, anticipar y max_piezas; generaciones sí puede cambiar.
+        informar: Función que recibe un texto por generación
+
+    Returns:
+        dict: Estado final (media, desviación, mejor candidato, historial)
+
+    Raises:
+        ValueError: Si el checkpoint es de una búsqueda con otra configuración
+    """
+    configuracion = {'semilla': semilla, 'poblacion': poblacion, 'partidas': partidas,
+                     'anticipar': anticipar, 'max_piezas': max_piezas}
+    if checkpoint and os.path.exists(checkpoint):
+        with open(checkpoint) as fichero:
+            estado = json.load(fichero)
+        if estado.get('configuracion') != configuracion:
+            raise ValueError(
+                f"El checkpoint {checkpoint} es de una búsqueda con otra configuración "
+                f"({estado.get('configuracion')}); usa otro fichero o los mismos parámetros"
+            )
+    else:
+        estado = {
+            'configuracion': configuracion,
+            'generacion': 0,
+            'media': [PESOS_DEFECTO[c] for c in CARACTERISTICAS],
+            'desviacion': [DESVIACION_INICIAL] * len(CARACTERISTICAS),
+            'mejor': None,
+            'historial': [],
+        }
+
+    elite = max(1, int(poblacion * FRACCION_ELITE))
+    with Pool(procesos) as pool:
+        while estado['generacion'] < generaciones:
+            g = estado['generacion']
+            # El sorteo depende solo de la semilla y la generación, así que
+            # una generación repetida tras reanudar produce los mismos candidatos
+            rng = random.Random(semilla * 1000003 + g)
+            candidatos = [
+                [rng.gauss(m, s) for m, s in zip(estado['media'], estado['desviacion'])]
+                for _ in range(poblacion)
+            ]
+            semillas = [semilla * 1000003 + g * partidas + i for i in range(partidas)]
+
+            tareas = [
+                (s, dict(zip(CARACTERISTICAS, c)), anticipar, max_piezas)
+                for c in candidatos for s in semillas
+            ]
+            resultados = pool.map(jugar_partida, tareas, chunksize=1)
+
+            aptitudes = [
+                sum(r['lineas'] for r in resultados[i * partidas:(i + 1) * partidas]) / partidas
+                for i in range(poblacion)
+            ]
+            orden = sorted(range(poblacion), key=lambda i: aptitudes[i], reverse=True)
+            mejores = [candidatos[i] for i in orden[:elite]]
+
+            estado['media'] = [
+                sum(c[k] for c in mejores) / elite for k in range(len(CARACTERISTICAS))
+            ]
+            estado['desviacion'] = [
+                max(DESVIACION_MINIMA,
+                    (sum((c[k] - estado['media'][k]) ** 2 for c in mejores) / elite) ** 0.5)
+                for k in range(len(CARACTERISTICAS))
+            ]
+            mejor = orden[0]
+            if estado['mejor'] is None or aptitudes[mejor] > estado['mejor']['aptitud']:
+                estado['mejor'] = {
+                    'pesos': dict(zip(CARACTERISTICAS, candidatos[mejor])),
+                    'aptitud': aptitudes[mejor],
+                    'generacion': g,
+                }
+            estado['historial'].append({
+                'generacion': g,
+                'aptitud_maxima': aptitudes[mejor],
+                'aptitud_media': sum(aptitudes) / poblacion,
+            })
+            estado['generacion'] = g + 1
+            if checkpoint:
+                _guardar_json(checkpoint, estado)
+
+            informar(f"Generación {g}: mejor {aptitudes[mejor]:.1f} líneas, "
+                     f"media {sum(aptitudes) / poblacion:.1f}")
+
+    return estado
+
+
+def main():
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Partidas automáticas del Tetris")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument('--max-piezas', type=int, default=MAX_PIEZAS)
+    parser.add_argument('--anticipar', action='store_true',
+                        help="El bot prueba también la siguiente pieza")
+    parser.add_argument('--checkpoint', default=None,
+                        help="Fichero donde guardar el progreso para poder reanudar")
+    modos = parser.add_subparsers(dest='modo', required=True)
+
+    lote = modos.add_parser('partidas', help="Jugar N partidas y resumir")
+    lote.add_argument('--partidas', type=int, default=100)
+    lote.add_argument('--semilla', type=int, default=0, help="Primera semilla")
+
+    evolucion = modos.add_parser('evolucion', help="Ajustar los pesos del bot")
+    evolucion.add_argument('--generaciones', type=int, default=20)
+    evolucion.add_argument('--partidas', type=int, default=8, help="Partidas por candidato")
+    evolucion.add_argument('--poblacion', type=int, default=POBLACION)
+    evolucion.add_argument('--semilla', type=int, default=0)
+
+    args = parser.parse_args()
+
+    if args.modo == 'partidas':
+        inicio = time.perf_counter()
+        resultados = jugar_lote(
+            range(args.semilla, args.semilla + args.partidas),
+            anticipar=args.anticipar, procesos=args.procesos,
+            max_piezas=args.max_piezas, checkpoint=args.checkpoint,
+        )
+        resumen = resumir(resultados, time.perf_counter() - inicio)
+        print(json.dumps(resumen, indent=2))
+    else:
+        try:
+            estado = evolucionar(
+                args.generaciones, partidas=args.partidas, poblacion=args.poblacion,
+                anticipar=args.anticipar, procesos=args.procesos,
+                max_piezas=args.max_piezas, semilla=args.semilla,
+                checkpoint=args.checkpoint,
+            )
+        except ValueError as error:
+            parser.error(str(error))
+        print(json.dumps(estado['mejor'], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+"""
+servidor.py - Servidor del modo versus del Tetris (asyncio)
+
+Este módulo contiene un servidor TCP que empareja a los clientes de dos
+en dos y juega cada partida en el propio servidor con el motor sin
+ventana (engine.py): los clientes solo envían acciones y reciben el
+estado. Las líneas que elimina un jugador se convierten en líneas de
+basura en el tablero del rival.
+
+Todas las partidas avanzan en un único bucle de ticks, así que cientos
+de partidas caben en un solo núcleo. En cada tick solo se envía lo que
+ha cambiado (ver protocolo.py) y la memoria de cada partida está
+acotada: la cola de entradas tiene un tamaño máximo y un cliente que no
+lee lo que se le envía se desconecta.
+
+Uso desde la carpeta TetrisGame:
+
+    python servidor.py --puerto 8765
+    python cliente_carga.py --puerto 8765 --partidas 300
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+
+from board import COLUMNAS, FILAS, COLOR_BASURA, PALETA, indice_color
+from engine import Engine, CAIDA
+from protocolo import (
+    empaquetar, empaquetar_paleta, leer_mensaje, estado_pieza, estado_contadores,
+    UNIRSE, ENTRADA, INICIO, DIFF, FIN, ERROR, EMPATE, ERROR_EN_PARTIDA,
+    CAMBIO_FILAS, CAMBIO_PIEZA, CAMBIO_CONTADORES, CAMBIO_GAME_OVER,
+    ESTRUCTURA_INICIO, ESTRUCTURA_TICK, ESTRUCTURA_BLOQUE,
+    ESTRUCTURA_NUM_FILAS, ESTRUCTURA_FILA, ESTRUCTURA_PIEZA,
+    ESTRUCTURA_CONTADORES,
+)
+
+# =============================================================================
+# CONSTANTES DEL SERVIDOR
+# =============================================================================
+TICK_MS = 50                 # Duración de un tick (20 ticks por segundo)
+MAX_ENTRADAS = 16            # Acciones guardadas por jugador entre ticks
+MAX_BUFFER = 64 * 1024       # Bytes pendientes de enviar antes de desconectar
+INTERVALO_ESTADISTICAS = 5   # Segundos entre dos líneas de estadísticas
+
+# Líneas de basura que se envían al rival según las líneas eliminadas
+BASURA_POR_LINEAS = {1: 0, 2: 1, 3: 2, 4: 4}
+
+# El color de la basura se registra ya, para que esté en la paleta que se
+# envía en el INICIO aunque la primera basura llegue a mitad de partida
+indice_color(COLOR_BASURA)
+
+
+class MotorVersus(Engine):
+    """
+    Motor del Tetris con lo necesario para el modo versus.
+
+    Atributos (además de los de Engine):
+        ataque (int): Líneas de basura pendientes de enviar al rival
+        tablero_cambiado (bool): Si el tablero ha cambiado desde el último DIFF
+    """
+
+    def __init__(self, semilla, columnas=COLUMNAS, filas=FILAS):
+        """
+        Inicializa la partida de un jugador.
+
+        Args:
+            semilla (int): Semilla de las piezas (la misma para los dos)
+            columnas (int): Columnas del tablero
+            filas (int): Filas del tablero
+        """
+        super().__init__(semilla=semilla, columnas=columnas, filas=filas)
+        self.ataque = 0
+        self.tablero_cambiado = False
+
+    def _fijar_pieza(self):
+        """Fija la pieza y marca el tablero para el siguiente DIFF."""
+        super()._fijar_pieza()
+        self.tablero_cambiado = True
+
+    def _sumar_puntos(self, lineas):
+        """Suma los puntos y acumula la basura que hay que enviar."""
+        super()._sumar_puntos(lineas)
+        self.ataque += BASURA_POR_LINEAS.get(lineas, lineas)
+
+    def recibir_basura(self, lineas, hueco):
+        """
+        Añade líneas de basura al tablero.
+
+        La pieza que cae sube lo necesario para no solaparse con la
+        basura. Si no puede, o si algún bloque se sale por arriba, la
+        partida termina.
+
+        Args:
+            lineas (int): Número de líneas de basura
+            hueco (int): Columna vacía de las líneas de basura
+        """
+        if self.game_over or lineas <= 0:
+            return
+        self.tablero_cambiado = True
+        if self.tablero.agregar_basura(lineas, hueco):
+            self.game_over = True
+            return
+        pieza = self.pieza_actual
+        for _ in range(lineas):
+            if self.tablero.es_posicion_valida(pieza):
+                break
+            pieza.y -= 1
+        if not self.tablero.es_posicion_valida(pieza):
+            self.game_over = True
+
+
+class Jugador:
+    """
+    Clase con la conexión y el estado de un jugador en el servidor.
+
+    Atributos:
+        escritor (asyncio.StreamWriter): Conexión con el cliente
+        entradas (deque): Acciones recibidas desde el último tick
+        partida (Partida): Partida en la que juega, o None
+        indice (int): Posición del jugador en la partida
+    """
+
+    __slots__ = ('escritor', 'entradas', 'partida', 'indice')
+
+    def __init__(self, escritor):
+        """Inicializa un jugador sin partida."""
+        self.escritor = escritor
+        self.entradas = deque(maxlen=MAX_ENTRADAS)
+        self.partida = None
+        self.indice = 0
+
+    def enviar(self, mensaje):
+        """
+        Envía un mensaje sin esperar.
+
+        Si el cliente acumula demasiados datos sin leer se cierra su
+        conexión, así la memoria por jugador queda acotada.
+
+        Returns:
+            bool: False si la conexión está cerrada o se ha cerrado ahora
+        """
+        transporte = self.escritor.transport
+        if transporte.is_closing():
+            return False
+        if transporte.get_write_buffer_size() > MAX_BUFFER:
+            self.escritor.close()
+            return False
+        self.escritor.write(mensaje)
+        return True
+
+
+class Partida:
+    """
+    Clase que juega una partida versus en el servidor.
+
+    Atributos:
+        id (int): Identificador de la partida
+        jugadores (list): Los Jugador de la partida
+        motores (list): Un MotorVersus por jugador
+        rng (random.Random): Generador para los huecos de la basura
+        tick (int): Ticks jugados
+        terminada (bool): Si la partida ya ha terminado
+    """
+
+    def __init__(self, id, jugadores, semilla, columnas=COLUMNAS, filas=FILAS):
+        """
+        Crea la partida y avisa a los jugadores.
+
+        Args:
+            id (int): Identificador de la partida
+            jugadores (list): Jugadores emparejados
+            semilla (int): Semilla de las piezas
+            columnas (int): Columnas del tablero
+            filas (int): Filas del tablero
+        """
+        self.id = id
+        self.jugadores = jugadores
+        self.motores = [MotorVersus(semilla, columnas, filas) for _ in jugadores]
+        self.rng = random.Random(semilla)
+        self.tick = 0
+        self.terminada = False
+        # Último estado enviado de cada jugador (tableros empiezan vacíos)
+        self._filas = [[bytes(columnas)] * filas for _ in jugadores]
+        self._piezas = [None] * len(jugadores)
+        self._contadores = [estado_contadores(m) for m in self.motores]
+        self._game_over = [False] * len(jugadores)
+
+        paleta = empaquetar_paleta(PALETA)
+        for indice, jugador in enumerate(jugadores):
+            jugador.partida = self
+            jugador.indice = indice
+            jugador.enviar(empaquetar(INICIO + ESTRUCTURA_INICIO.pack(
+                id, indice, semilla, columnas, filas) + paleta))
+
+    def avanzar(self, dt):
+        """
+        Juega un tick: aplica las entradas, avanza el tiempo, reparte la
+        basura y envía los cambios.
+
+        Args:
+            dt (int): Milisegundos del tick
+        """
+        self.tick += 1
+        motores = self.motores
+        for jugador, motor in zip(self.jugadores, motores):
+            entradas = tuple(jugador.entradas)
+            jugador.entradas.clear()
+            motor.step(entradas, dt)
+
+        # La basura de cada jugador va a los rivales que siguen vivos
+        for i, motor in enumerate(motores):
+            if motor.ataque:
+                hueco = self.rng.randrange(motor.tablero.columnas)
+                for j, rival in enumerate(motores):
+                    if j != i:
+                        rival.recibir_basura(motor.ataque, hueco)
+                motor.ataque = 0
+
+        diff = self._diff()
+        if diff is not None:
+            self.difundir(diff)
+
+        vivos = [i for i, motor in enumerate(motores) if not motor.game_over]
+        if len(vivos) <= 1:
+            self.terminar(vivos[0] if vivos else EMPATE)
+
+    def _diff(self):
+        """
+        Codifica los cambios de todos los jugadores desde el tick anterior.
+
+        Returns:
+            bytes: Mensaje DIFF empaquetado, o None si no hay cambios
+        """
+        partes = [DIFF, ESTRUCTURA_TICK.pack(self.tick)]
+        hay_cambios = False
+        for i, motor in enumerate(self.motores):
+            cambios = 0
+            bloque = []
+
+            # Solo se comparan las filas si se ha fijado una pieza o ha
+            # llegado basura; en el resto de ticks el tablero no cambia
+            cambiadas = None
+            if motor.tablero_cambiado:
+                motor.tablero_cambiado = False
+                previas = self._filas[i]
+                colores = motor.tablero.colores
+                cambiadas = [f for f, fila in enumerate(colores) if fila != previas[f]]
+            if cambiadas:
+                cambios |= CAMBIO_FILAS
+                bloque.append(ESTRUCTURA_NUM_FILAS.pack(len(cambiadas)))
+                for f in cambiadas:
+                    previas[f] = colores[f]
+                    bloque.append(ESTRUCTURA_FILA.pack(f))
+                    bloque.append(previas[f])
+
+            pieza = estado_pieza(motor)
+            if pieza != self._piezas[i]:
+                cambios |= CAMBIO_PIEZA
+                bloque.append(ESTRUCTURA_PIEZA.pack(*pieza))
+                self._piezas[i] = pieza
+
+            contadores = estado_contadores(motor)
+            if contadores != self._contadores[i]:
+                cambios |= CAMBIO_CONTADORES
+                bloque.append(ESTRUCTURA_CONTADORES.pack(*contadores))
+                self._contadores[i] = contadores
+
+            if motor.game_over and not self._game_over[i]:
+                cambios |= CAMBIO_GAME_OVER
+                self._game_over[i] = True
+
+            if cambios:
+                hay_cambios = True
+                partes.append(ESTRUCTURA_BLOQUE.pack(i, cambios))
+                partes.extend(bloque)
+        return empaquetar(b"".join(partes)) if hay_cambios else None
+
+    def difundir(self, mensaje):
+        """Envía un mensaje a todos los jugadores de la partida."""
+        for jugador in self.jugadores:
+            jugador.enviar(mensaje)
+
+    def terminar(self, ganador):
+        """
+        Termina la partida y avisa a los jugadores.
+
+        Args:
+            ganador (int): Índice del ganador o EMPATE
+        """
+        if self.terminada:
+            return
+        self.terminada = True
+        self.difundir(empaquetar(FIN + bytes((ganador,))))
+        for jugador in self.jugadores:
+            jugador.partida = None
+            jugador.entradas.clear()
+
+    def abandonar(self, jugador):
+        """Un jugador se desconecta: gana el otro (o empate si hay más)."""
+        rivales = [j.indice for j in self.jugadores if j is not jugador]
+        self.terminar(rivales[0] if len(rivales) == 1 else EMPATE)
+
+
+class Servidor:
+    """
+    Clase que acepta conexiones, empareja jugadores y juega las partidas.
+
+    Atributos:
+        tick_ms (int): Duración de un tick en milisegundos
+        columnas (int): Columnas de los tableros
+        filas (int): Filas de los tableros
+        partidas (dict): Partidas en curso por id
+        esperando (list): Jugadores que esperan rival
+        rng (random.Random): Generador de las semillas de las partidas
+        estadisticas (dict): Contadores para las estadísticas
+    """
+
+    def __init__(self, tick_ms=TICK_MS, columnas=COLUMNAS, filas=FILAS, semilla=None):
+        """
+        Inicializa el servidor sin partidas.
+
+        Args:
+            tick_ms (int): Duración de un tick en milisegundos
+            columnas (int): Columnas de los tableros
+            filas (int): Filas de los tableros
+            semilla (int, opcional): Semilla para sortear las de las partidas
+        """
+        self.tick_ms = tick_ms
+        self.columnas = columnas
+        self.filas = filas
+        self.partidas = {}
+        self.esperando = []
+        self.rng = random.Random(semilla)
+        self._siguiente_id = 0
+        self.estadisticas = {'partidas': 0, 'ticks': 0, 'segundos_tick': 0.0,
+                             'tick_maximo': 0.0}
+
+    async def atender(self, lector, escritor):
+        """
+        Atiende la conexión de un cliente hasta que se cierra.
+
+        Args:
+            lector (asyncio.StreamReader): Datos del cliente
+            escritor (asyncio.StreamWriter): Datos hacia el cliente
+        """
+        jugador = Jugador(escritor)
+        try:
+            while True:
+                mensaje = await leer_mensaje(lector)
+                tipo = mensaje[:1]
+                if tipo == ENTRADA and len(mensaje) == 2:
+                    # Solo acciones de juego: la pausa y el reinicio no
+                    # tienen sentido en una partida contra otro
+                    if jugador.partida is not None and mensaje[1] <= CAIDA:
+                        jugador.entradas.append(mensaje[1])
+                elif tipo == UNIRSE:
+                    if jugador.partida is not None:
+                        # Se rechaza sin cortar la partida en curso
+                        jugador.enviar(empaquetar(ERROR + bytes((ERROR_EN_PARTIDA,))))
+                    elif jugador not in self.esperando:
+                        self._emparejar(jugador)
+                else:
+                    break  # Mensaje no válido: se cierra la conexión
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            if jugador in self.esperando:
+                self.esperando.remove(jugador)
+            if jugador.partida is not None:
+                jugador.partida.abandonar(jugador)
+            escritor.close()
+
+    def _emparejar(self, jugador):
+        """Pone a un jugador en espera o empieza una partida si hay rival."""
+        self.esperando.append(jugador)
+        if len(self.esperando) >= 2:
+            jugadores = self.esperando[:2]
+            del self.esperando[:2]
+            self._siguiente_id += 1
+            partida = Partida(self._siguiente_id, jugadores, self.rng.randrange(2 ** 32),
+                              self.columnas, self.filas)
+            self.partidas[partida.id] = partida
+            self.estadisticas['partidas'] += 1
+
+    def avanzar(self, dt):
+        """
+        Juega un tick de todas las partidas en curso.
+
+        Args:
+            dt (int): Milisegundos del tick
+        """
+        for partida in list(self.partidas.values()):
+            if not partida.terminada:
+                partida.avanzar(dt)
+            if partida.terminada:
+                del self.partidas[partida.id]
+
+    async def bucle_ticks(self):
+        """
+        Avanza todas las partidas cada tick_ms milisegundos.
+
+        Si un tick se retrasa, el siguiente avanza el tiempo que haya
+        pasado de verdad (el motor aplica todas las caídas pendientes).
+        """
+        reloj = asyncio.get_running_loop().time
+        anterior = reloj()
+        sobrante = 0.0
+        while True:
+            await asyncio.sleep(max(0.0, anterior + self.tick_ms / 1000 - reloj()))
+            ahora = reloj()
+            sobrante += (ahora - anterior) * 1000
+            anterior = ahora
+            dt = int(sobrante)
+            sobrante -= dt
+
+            inicio = time.perf_counter()
+            self.avanzar(dt)
+            duracion = time.perf_counter() - inicio
+
+            estadisticas = self.estadisticas
+            estadisticas['ticks'] += 1
+            estadisticas['segundos_tick'] += duracion
+            estadisticas['tick_maximo'] = max(estadisticas['tick_maximo'], duracion)
+
+    async def informar(self, intervalo=INTERVALO_ESTADISTICAS):
+        """Escribe periódicamente cuántas partidas hay y cuánto tarda un tick."""
+        while True:
+            await asyncio.sleep(intervalo)
+            e = self.estadisticas
+            medio = e['segundos_tick'] / e['ticks'] * 1000 if e['ticks'] else 0.0
+            print(f"{len(self.partidas)} partidas en curso, {len(self.esperando)} "
+                  f"esperando, {e['partidas']} empezadas | tick medio {medio:.2f} ms, "
+                  f"máximo {e['tick_maximo'] * 1000:.2f} ms", flush=True)
+            e['ticks'] = 0
+            e['segundos_tick'] = 0.0
+            e['tick_maximo'] = 0.0
+
+
+async def servir(host, puerto, **opciones):
+    """
+    Arranca el servidor y lo mantiene en marcha.
+
+    Args:
+        host (str): Dirección en la que escuchar
+        puerto (int): Puerto TCP
+        **opciones: Argumentos de Servidor
+    """
+    servidor = Servidor(**opciones)
+    tcp = await asyncio.start_server(servidor.atender, host, puerto)
+    print(f"Servidor versus escuchando en {host}:{puerto}", flush=True)
+    async with tcp:
+        await asyncio.gather(tcp.serve_forever(), servidor.bucle_ticks(),
+                             servidor.informar())
+
+
+def main():
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Servidor del modo versus del Tetris")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--tick', type=int, default=TICK_MS, help="Milisegundos por tick")
+    parser.add_argument('--columnas', type=int, default=COLUMNAS)
+    parser.add_argument('--filas', type=int, default=FILAS)
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.host, args.puerto, tick_ms=args.tick,
+                           columnas=args.columnas, filas=args.filas))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -72,6 +72,80 @@ COLORES = {
 }
 
 
+# =============================================================================
+# GEOMETRÍA PRECALCULADA DE LOS TETROMINÓS
+# =============================================================================
+# Toda la información geométrica de cada (tipo, rotación) se calcula una
+# sola vez al importar el módulo. Así las operaciones frecuentes (colisión,
+# fijar, dibujar, caída instantánea) no recorren la matriz de FORMAS ni
+# crean listas nuevas en cada llamada.
+
+TIPOS = tuple(FORMAS)
+
+
+class Geometria:
+    """
+    Geometría precalculada de una rotación de un tetrominó.
+    
+    Todas las coordenadas son relativas a la posición (x, y) de la pieza.
+    
+    Atributos:
+        bloques (tuple): Tuplas (dx, dy) de cada bloque
+        col_min (int): Primera columna ocupada
+        fila_min (int): Primera fila ocupada
+        ancho (int): Número de columnas de la caja que envuelve la pieza
+        alto (int): Número de filas de la caja que envuelve la pieza
+        perfil_inferior (tuple): Para cada columna de la caja, el dy del
+            bloque más bajo (el que toca el suelo al caer)
+        mascara (tuple): (col_min, ancho, fila_min, mascaras_fila) para
+            el bitboard del tablero. El bit c de cada entero de
+            mascaras_fila indica un bloque en la columna col_min + c
+        filas_bloques (tuple): Para cada fila con bloques, (dy, columnas dx)
+    """
+
+    __slots__ = ('bloques', 'col_min', 'fila_min', 'ancho', 'alto',
+                 'perfil_inferior', 'mascara', 'filas_bloques')
+
+    def __init__(self, forma):
+        """
+        Calcula la geometría a partir de la matriz 0/1 de una rotación.
+        
+        Args:
+            forma (list): Matriz 0/1 de la rotación
+        """
+        self.bloques = tuple(
+            (col_idx, fila_idx)
+            for fila_idx, fila in enumerate(forma)
+            for col_idx, celda in enumerate(fila)
+            if celda == 1
+        )
+        self.col_min = min(c for c, _ in self.bloques)
+        self.fila_min = min(f for _, f in self.bloques)
+        self.ancho = max(c for c, _ in self.bloques) - self.col_min + 1
+        self.alto = max(f for _, f in self.bloques) - self.fila_min + 1
+
+        self.perfil_inferior = tuple(
+            max(f for c, f in self.bloques if c == self.col_min + i)
+            for i in range(self.ancho)
+        )
+
+        mascaras = [0] * self.alto
+        for c, f in self.bloques:
+            mascaras[f - self.fila_min] |= 1 << (c - self.col_min)
+        self.mascara = (self.col_min, self.ancho, self.fila_min, tuple(mascaras))
+
+        self.filas_bloques = tuple(
+            (f, tuple(c for c, fb in self.bloques if fb == f))
+            for f in range(self.fila_min, self.fila_min + self.alto)
+        )
+
+
+GEOMETRIAS = {
+    tipo: tuple(Geometria(forma) for forma in rotaciones)
+    for tipo, rotaciones in FORMAS.items()
+}
+
+
 class Tetromino:
     """
     Clase que representa una pieza del Tetris (Tetrominó).
@@ -80,15 +154,23 @@ class Tetromino:
     La posición (x, y) indica la esquina superior izquierda de la
     matriz que contiene la pieza.
     
+    Usa ``__slots__`` y guarda una referencia a la geometría precalculada
+    de su rotación actual, de modo que consultar sus bloques no crea
+    objetos nuevos.
+    
     Atributos:
         tipo (str): Tipo de pieza ('I', 'O', 'T', 'S', 'Z', 'J', 'L')
         color (tuple): Color RGB de la pieza
         rotaciones (list): Lista de todas las rotaciones posibles
         rotacion_actual (int): Índice de la rotación actual
+        geometria (Geometria): Geometría de la rotación actual
         x (int): Posición horizontal en el tablero (columna)
         y (int): Posición vertical en el tablero (fila)
     """
 
+    __slots__ = ('tipo', 'color', 'rotaciones', 'geometrias', 'geometria',
+                 '_rotacion', 'x', 'y')
+
     def __init__(self, tipo=None):
         """
         Inicializa un nuevo tetrominó.
@@ -98,17 +180,33 @@ class Tetromino:
         """
         # Si no se especifica tipo, elegir uno aleatorio
         if tipo is None:
-            tipo = random.choice(list(FORMAS.keys()))
+            tipo = random.choice(TIPOS)
         
         self.tipo = tipo
         self.color = COLORES[tipo]
         self.rotaciones = FORMAS[tipo]
-        self.rotacion_actual = 0
+        self.geometrias = GEOMETRIAS[tipo]
+        self.geometria = self.geometrias[0]
+        self._rotacion = 0
         
         # Posición inicial: centrado horizontalmente, arriba del tablero
         self.x = 3  # Columna inicial (centrado en tablero de 10 columnas)
         self.y = 0  # Fila inicial (arriba del todo)
 
+    @property
+    def rotacion_actual(self):
+        """
+        Índice de la rotación actual.
+        
+        Al asignarlo se actualiza también la geometría de la pieza.
+        """
+        return self._rotacion
+
+    @rotacion_actual.setter
+    def rotacion_actual(self, rotacion):
+        self._rotacion = rotacion
+        self.geometria = self.geometrias[rotacion]
+
     @property
     def forma(self):
         """
@@ -117,7 +215,7 @@ class Tetromino:
         Returns:
             list: Matriz 2D representando la forma actual de la pieza.
         """
-        return self.rotaciones[self.rotacion_actual]
+        return self.rotaciones[self._rotacion]
 
     def rotar(self):
         """
@@ -126,7 +224,8 @@ class Tetromino:
         Cambia al siguiente estado de rotación, volviendo al primero
         si se supera el último.
         """
-        self.rotacion_actual = (self.rotacion_actual + 1) % len(self.rotaciones)
+        self._rotacion = (self._rotacion + 1) % len(self.geometrias)
+        self.geometria = self.geometrias[self._rotacion]
 
     def rotar_inverso(self):
         """
@@ -134,33 +233,41 @@ class Tetromino:
         
         Útil para deshacer una rotación si resulta inválida.
         """
-        self.rotacion_actual = (self.rotacion_actual - 1) % len(self.rotaciones)
+        self._rotacion = (self._rotacion - 1) % len(self.geometrias)
+        self.geometria = self.geometrias[self._rotacion]
 
     def obtener_bloques(self):
         """
         Obtiene las coordenadas absolutas de todos los bloques de la pieza.
         
+        Crea una lista nueva en cada llamada. En el código que se ejecuta
+        a menudo es mejor recorrer ``geometria.bloques`` y sumar x e y.
+        
         Returns:
             list: Lista de tuplas (x, y) con las coordenadas de cada bloque.
         """
-        bloques = []
-        for fila_idx, fila in enumerate(self.forma):
-            for col_idx, celda in enumerate(fila):
-                if celda == 1:  # Si hay un bloque en esta posición
-                    bloques.append((self.x + col_idx, self.y + fila_idx))
-        return bloques
+        x = self.x
+        y = self.y
+        return [(x + dx, y + dy) for dx, dy in self.geometria.bloques]
 
     def clonar(self):
         """
         Crea una copia de este tetrominó.
         
         Útil para probar movimientos sin modificar la pieza original.
+        Copia los atributos directamente, sin volver a buscar la forma
+        ni el color.
         
         Returns:
             Tetromino: Nueva instancia con los mismos valores.
         """
-        clon = Tetromino(self.tipo)
-        clon.rotacion_actual = self.rotacion_actual
+        clon = Tetromino.__new__(Tetromino)
+        clon.tipo = self.tipo
+        clon.color = self.color
+        clon.rotaciones = self.rotaciones
+        clon.geometrias = self.geometrias
+        clon.geometria = self.geometria
+        clon._rotacion = self._rotacion
         clon.x = self.x
         clon.y = self.y
         return clon